@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import copy
+import json
+import sys
+import os
+import time
+
+# 添加父目录到路径，以便导入trycode
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from components.pybug_batmkey.trycode import XiaohongshuScraper
+from langflow.schema.dataframe import DataFrame
+
+DOC_DIR = os.path.join(os.path.dirname(__file__), "文档")
+
+
+def _synthetic_video_item(i: int) -> dict:
+    """构造带 video_info_v2 多编码流、实况图与旧版 video 结构的视频笔记"""
+    def streams(prefix, n=3):
+        return [{"master_url": f"https://v.example.com/{prefix}/{i}/{j}.mp4",
+                 "backup_urls": [f"https://bak.example.com/{prefix}/{i}/{j}-{b}.mp4" for b in range(2)]}
+                for j in range(n)]
+    return {
+        "model_type": "note",
+        "note": {
+            "id": f"bench{i:06d}",
+            "type": "video",
+            "title": f"合成视频 {i}",
+            "desc": "#项链[话题]# 测试",
+            "user": {"nickname": "用户", "userid": "u1", "red_id": "r1"},
+            "timestamp": 1730000000 + i,
+            "images_list": [
+                {"url": f"https://img.example.com/{i}/{k}.jpg",
+                 "live_photo": {"media": {"video_id": k, "stream": {"h264": streams(f"live{k}", 1)}}}}
+                for k in range(4)
+            ],
+            "video_info_v2": {"media": {"stream": {c: streams(c) for c in ("h265", "h264", "av1")},
+                                        "streams": streams("s")}},
+            "video": {"streams": streams("legacy"), "url": f"https://v.example.com/direct/{i}.mp4"},
+        },
+    }
+
+
+def _fixture_items() -> list:
+    with open(os.path.join(DOC_DIR, "page_request_test_result.json"), encoding="utf-8") as f:
+        pages = json.load(f)
+    return [it for p in pages for it in (p.get("data") or {}).get("items") or [] if isinstance(it, dict) and "note" in it]
+
+
+def bench(label: str, items: list, total: int = 1000, rounds: int = 5) -> None:
+    """extract_note_data 每千条耗时（取多轮最优）"""
+    scraper = XiaohongshuScraper()
+    batch = [copy.deepcopy(items[i % len(items)]) for i in range(total)]
+    for search_note_type in (0, 1, 2):
+        best = float("inf")
+        for _ in range(rounds):
+            t0 = time.perf_counter()
+            for item in batch:
+                scraper.extract_note_data(item, search_note_type)
+            best = min(best, time.perf_counter() - t0)
+        print(f"[{label}] 搜索类型={search_note_type}: {best * 1000:.1f} ms / {total} 条")
+
+
+def bench_decode_page(items: list, pages: int = 200) -> None:
+    """整页文本解码：逐条 decode_unicode_text 与整页预解码后查表的每页耗时"""
+    scraper = XiaohongshuScraper()
+    texts = []
+    for it in items:
+        note = it["note"]
+        texts.extend([note.get("title", ""), note.get("desc", ""), (note.get("user") or {}).get("nickname", "")])
+
+    t0 = time.perf_counter()
+    for _ in range(pages):
+        for text in texts:
+            scraper.decode_unicode_text(text)
+    per_item = (time.perf_counter() - t0) / pages
+
+    t0 = time.perf_counter()
+    for _ in range(pages):
+        scraper._prime_decoded_texts(items)
+        for text in texts:
+            scraper.decode_unicode_text(text)
+    per_page = (time.perf_counter() - t0) / pages
+    escaped = sum(1 for t in texts if "\\" in t)
+    print(f"[文本解码] 每页 {len(items)} 条笔记 / {len(texts)} 段文本（含转义 {escaped} 段）")
+    print(f"  逐条解码: {per_item * 1e6:.1f} µs/页  整页预解码: {per_page * 1e6:.1f} µs/页")
+
+
+def _escaped_items(items: list) -> list:
+    """把样本文本改写为 \\uXXXX 转义形式，模拟接口返回未解码文本"""
+    out = copy.deepcopy(items)
+    for it in out:
+        note = it["note"]
+        for key in ("title", "desc"):
+            if note.get(key):
+                note[key] = note[key].encode("unicode_escape").decode("ascii")
+    return out
+
+
+def bench_dataframe(total: int = 20_000) -> None:
+    """表格输出：先提取行字典再构建 DataFrame，与提取时直接写入列数组后一次构建的耗时、峰值内存对比"""
+    import tracemalloc
+    scraper = XiaohongshuScraper()
+    items = _fixture_items()
+    page = {"code": 200, "data": {"items": [items[i % len(items)] for i in range(total)]}}
+
+    def by_rows():
+        notes = [scraper.extract_note_data(item, 0) for item in page["data"]["items"]]
+        return DataFrame([n for n in notes if n])
+
+    def by_columns():
+        columns = scraper.new_columns()
+        scraper.extract_page_data(1, page, columns, 0)
+        return scraper.columns_to_dataframe(scraper.fill_defaults(columns))
+
+    for label, fn in (("行字典", by_rows), ("列数组", by_columns)):
+        # 耗时不开 tracemalloc 测量（逐次分配追踪会放大提取本身的开销），峰值内存另跑一次
+        elapsed = float("inf")
+        for _ in range(3):
+            t0 = time.perf_counter()
+            fn()
+            elapsed = min(elapsed, time.perf_counter() - t0)
+        tracemalloc.start()
+        df = fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        size = df.memory_usage(deep=True).sum()
+        print(f"[表格构建/{label}] {len(df)} 行: {elapsed * 1000:.1f} ms  峰值内存: {peak / 1024 / 1024:.1f} MiB  结果占用: {size / 1024 / 1024:.1f} MiB")
+
+
+def main():
+    bench("抓取样本", _fixture_items())
+    bench("合成视频流", [_synthetic_video_item(i) for i in range(50)])
+    page = _fixture_items()[:20]
+    bench_decode_page(page)
+    bench_decode_page(_escaped_items(page))
+    bench_dataframe()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# 仓库根目录，子进程以包路径导入组件模块
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+MODULES = ["components.pybug_batmkey.trycode", "components.pybug_batmkey.firstcode"]
+# 单独列出的重型依赖
+WATCHED = ("pandas", "numpy", "requests", "langflow")
+
+
+def import_profile(module: str) -> Tuple[Dict[str, int], int]:
+    """在全新解释器中以 -X importtime 导入模块，返回 {模块名: 累计微秒} 与总耗时"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, env={**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")]))},
+    )
+    cumulative: Dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = [p.strip() for p in line[len("import time:"):].split("|")]
+        if len(parts) != 3 or not parts[1].isdigit():
+            continue
+        cumulative[parts[2].strip()] = int(parts[1])
+    if proc.returncode != 0:
+        print(f"❌ 导入 {module} 失败: {proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else proc.returncode}")
+    return cumulative, cumulative.get(module, 0)
+
+
+def main(rounds: int = 3):
+    for module in MODULES:
+        best_total = None
+        best_profile: Dict[str, int] = {}
+        for _ in range(rounds):
+            profile, total = import_profile(module)
+            if total and (best_total is None or total < best_total):
+                best_total, best_profile = total, profile
+        if best_total is None:
+            continue
+        print(f"[{module}] 冷启动导入: {best_total / 1000:.1f} ms")
+        heavy: List[Tuple[str, int]] = [(m, best_profile[m]) for m in WATCHED if m in best_profile]
+        for name, us in heavy:
+            print(f"  {name}: {us / 1000:.1f} ms")
+        missing = [m for m in WATCHED if m not in best_profile]
+        if missing:
+            print(f"  未在导入链中: {', '.join(missing)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import sys
+import os
+
+# 添加父目录到路径，以便导入trycode
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from components.pybug_batmkey.trycode import XiaohongshuScraper
+
+DOC_DIR = os.path.join(os.path.dirname(__file__), "文档")
+CODECS = ["h265", "h264", "av1", "h266"]
+
+
+def _legacy_stream_urls(streams_or_stream, out, url_fallback=True, combined=False):
+    """逐段复刻旧版嵌套循环的取链顺序，作为对照"""
+    def take(s):
+        mu = s.get("master_url") or (s.get("url") if url_fallback else None)
+        if mu:
+            out.append(mu)
+        for bu in s.get("backup_urls") or []:
+            if isinstance(bu, str):
+                out.append(bu)
+
+    streams = streams_or_stream.get("streams")
+    stream = streams_or_stream.get("stream")
+    if combined:
+        if isinstance(stream, dict):
+            for k in CODECS:
+                for s in stream.get(k) or []:
+                    take(s)
+        for s in streams if isinstance(streams, list) else []:
+            take(s)
+    elif isinstance(streams, list):
+        for s in streams:
+            take(s)
+    elif isinstance(stream, dict):
+        for k in CODECS:
+            for s in stream.get(k) or []:
+                take(s)
+
+
+def legacy_media_urls(note, search_note_type):
+    """旧版 extract_note_data 的图片/视频链接提取结果（已去重）"""
+    image_urls, video_urls = [], []
+    for img in note.get("images_list") or []:
+        if isinstance(img, dict):
+            url = img.get("url") or img.get("url_size_large") or img.get("url_size_medium") or img.get("url_size_small") or img.get("original")
+            if url:
+                image_urls.append(url)
+            live_photo = img.get("live_photo")
+            if isinstance(live_photo, dict):
+                _legacy_stream_urls(live_photo.get("media", {}), video_urls, url_fallback=False)
+        elif isinstance(img, str):
+            image_urls.append(img)
+    if search_note_type in (0, 2):
+        key = None
+        if note.get("widgets_context"):
+            try:
+                key = json.loads(note["widgets_context"]).get("origin_video_key")
+            except Exception:
+                key = None
+        if key:
+            video_urls.append(f"https://sns-video-hs.xhscdn.com/{key}")
+        if search_note_type == 0:
+            vobj2 = note.get("video_info_v2")
+            if not video_urls and isinstance(vobj2, dict) and isinstance(vobj2.get("media"), dict):
+                _legacy_stream_urls(vobj2["media"], video_urls, combined=True)
+            vobj = note.get("video") or note.get("video_info")
+            if isinstance(vobj, dict):
+                _legacy_stream_urls(vobj, video_urls)
+                for dk in ["url", "play_url", "main_url", "video_url", "hls_video_url", "hls_url"]:
+                    if isinstance(vobj.get(dk), str) and vobj.get(dk):
+                        video_urls.append(vobj[dk])
+    return list(dict.fromkeys(u for u in image_urls if u)), list(dict.fromkeys(u for u in video_urls if u))
+
+
+def fixture_notes():
+    """从抓取的搜索结果中取出全部笔记对象"""
+    with open(os.path.join(DOC_DIR, "page_request_test_result.json"), encoding="utf-8") as f:
+        pages = json.load(f)
+    with open(os.path.join(DOC_DIR, "笔记搜索 v2.json"), encoding="utf-8") as f:
+        pages.append(json.load(f))
+    notes = []
+    for page in pages:
+        for item in (page.get("data") or {}).get("items") or []:
+            if isinstance(item, dict) and isinstance(item.get("note"), dict):
+                notes.append(item)
+    return notes
+
+
+def test_media_urls():
+    """单次遍历的链接提取结果应与旧版逐段扫描一致"""
+    print("🚀 开始测试媒体链接提取...")
+    scraper = XiaohongshuScraper()
+    items = fixture_notes()
+    mismatches = 0
+    for search_note_type in (0, 1, 2):
+        for item in items:
+            extracted = scraper.extract_note_data(item, search_note_type)
+            expected_images, expected_videos = legacy_media_urls(item["note"], search_note_type)
+            got_images = extracted["所有图片链接"] if extracted["笔记类型"] == "图文笔记" else expected_images
+            if extracted["视频链接"] != expected_videos or got_images != expected_images or extracted["封面图链接"] != expected_images[:1]:
+                mismatches += 1
+                print(f"❌ 不一致: 类型={search_note_type} 笔记ID={extracted['笔记ID']}")
+    print(f"📊 共校验 {len(items) * 3} 条（{len(items)} 条笔记 × 3 种搜索类型）")
+    assert items, "未找到笔记样本"
+    assert mismatches == 0, f"{mismatches} 条结果与旧版提取顺序不一致"
+    print("✅ 测试通过：图片与视频链接与旧版提取顺序一致")
+
+
+if __name__ == "__main__":
+    try:
+        test_media_urls()
+    except AssertionError as e:
+        print(f"❌ 测试失败：{e}")
+        sys.exit(1)
@@ -1,20 +1,264 @@
 # -*- coding: utf-8 -*-
 
+import functools
 import json
-import sys
+import os
+import sqlite3
 import time
 import re
-import io
-import contextlib
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple
-from urllib import request, error
-import pandas as pd
+from typing import TYPE_CHECKING, List, Dict, Any, Callable, Iterator, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 
 from langflow.custom import Component
 from langflow.io import MessageTextInput, IntInput, DropdownInput, BoolInput, Output
 from langflow.schema import Data
 
+if TYPE_CHECKING:
+    # DataFrame 依赖 pandas：仅在构建表格输出时导入，保持模块冷启动轻量
+    from langflow.schema.dataframe import DataFrame
+
+
+class _RateLimiter:
+    """线程安全的最小间隔限速器：所有共享该实例的请求按统一节奏发出"""
+
+    def __init__(self, rate_per_sec: float):
+        self._interval = 1.0 / rate_per_sec if rate_per_sec and rate_per_sec > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def acquire(self) -> None:
+        if self._interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_at - now
+            self._next_at = max(now, self._next_at) + self._interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+# 组件实例上共享限速器的惰性创建锁：同一实例的多个工作线程只能得到同一个限速器
+_RATE_LIMITER_INIT_LOCK = threading.Lock()
+
+
+class _HttpStats:
+    """单次运行的 HTTP 计数（请求数 / 新建连接数），多个工作线程并发累加"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+
+    def add(self, requests_: int = 0, connections: int = 0) -> None:
+        with self._lock:
+            self.requests += requests_
+            self.connections += connections
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            reqs, conns = self.requests, self.connections
+        return {
+            "请求数": reqs,
+            "新建连接数": conns,
+            "连接复用率": round(1 - conns / reqs, 4) if reqs > 0 else 0.0,
+        }
+
+
+# 当前线程正在发送的请求所属运行的计数器：连接池是全进程共享的，新建连接时据此记到发起请求的那次运行上
+_REQUEST_CONTEXT = threading.local()
+
+
+class _CountingPoolMixin:
+    def _new_conn(self):
+        stats = getattr(_REQUEST_CONTEXT, "stats", None)
+        if stats is not None:
+            stats.add(connections=1)
+        return super()._new_conn()
+
+
+class _CountingHTTPConnectionPool(_CountingPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class _CountingHTTPSConnectionPool(_CountingPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class _CountingHTTPAdapter(HTTPAdapter):
+    """连接池适配器：新建连接计入当前请求所属运行的 _HttpStats"""
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _CountingHTTPConnectionPool, "https": _CountingHTTPSConnectionPool}
+
+
+# 视频流编码优先级与视频对象上的直链字段
+_VIDEO_CODECS = ("h265", "h264", "av1", "h266")
+_VIDEO_DIRECT_KEYS = ("url", "play_url", "main_url", "video_url", "hls_video_url", "hls_url")
+_IMAGE_URL_KEYS = ("url", "url_size_large", "url_size_medium", "url_size_small", "original")
+_SIMPLIFIED_VIDEO_PREFIX = "https://sns-video-hs.xhscdn.com/"
+
+
+def _iter_stream_objects(media: Dict[str, Any], combined: bool = False) -> Iterator[Any]:
+    """按优先级逐个产出流对象，每个对象只访问一次
+    combined=False: 有 streams 列表时只用它，否则遍历 stream 下各编码数组（live_photo / video 旧结构）
+    combined=True: 先遍历 stream 下各编码数组，再遍历 streams 列表（video_info_v2 结构）
+    """
+    streams = media.get("streams")
+    if not combined and isinstance(streams, list):
+        yield from streams
+        return
+    stream = media.get("stream")
+    if isinstance(stream, dict):
+        for codec in _VIDEO_CODECS:
+            arr = stream.get(codec)
+            if isinstance(arr, list):
+                yield from arr
+    if combined and isinstance(streams, list):
+        yield from streams
+
+
+def _append_stream_urls(media: Any, out: List[str], combined: bool = False, url_fallback: bool = True) -> None:
+    """把流对象中的 master_url（可回退到 url）与 backup_urls 依次追加到 out"""
+    if not isinstance(media, dict):
+        return
+    append = out.append
+    for s in _iter_stream_objects(media, combined):
+        if not isinstance(s, dict):
+            continue
+        mu = s.get("master_url") or (s.get("url") if url_fallback else None)
+        if mu:
+            append(mu)
+        burls = s.get("backup_urls")
+        if isinstance(burls, list):
+            for bu in burls:
+                if isinstance(bu, str) and bu:
+                    append(bu)
+
+
+# -----------------------------
+# 时间戳归一化与格式化：与 pybug_oneapi 组件共用代码块的约定一致（大于 _MS_TS_THRESHOLD 视为毫秒，0 或负数视为缺失）
+# 共用代码块依赖 NumPy 做整列运算，本文件冷启动不导入 NumPy（见 bench_import_time.py），因此只取逐值部分；
+# 时间文本按秒级时间戳 LRU 缓存，同一时刻只格式化一次
+# -----------------------------
+_MS_TS_THRESHOLD = 10**11
+
+
+def _ts_seconds(ts: int) -> int:
+    return ts // 1000 if ts > _MS_TS_THRESHOLD else ts
+
+
+@functools.lru_cache(maxsize=8192)
+def _format_ts_seconds(ts: int) -> str:
+    """秒级时间戳 -> “YYYY-MM-DD HH:MM:SS”（本地时区）；0、负数或超出范围返回空字符串"""
+    if ts <= 0:
+        return ""
+    try:
+        return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+    except (OverflowError, OSError, ValueError):
+        return ""
+
+
+# 文本中的转义序列（与 unicode_escape 支持的写法一致），用于含原生非 ASCII 字符的文本
+_ESCAPE_RE = re.compile(r"\\(u[0-9a-fA-F]{4}|U[0-9a-fA-F]{8}|x[0-9a-fA-F]{2}|[0-7]{1,3}|N\{[^}]+\}|[\\'\"abfnrtv\n])")
+
+# 参数格式错误的特征：错误信息提到 param / 参数
+_PARAM_ERROR_RE = re.compile(r"param|参数", re.IGNORECASE)
+
+_SIMPLE_ESCAPES = {"\\": "\\", "'": "'", '"': '"', "a": "\a", "b": "\b", "f": "\f",
+                   "n": "\n", "r": "\r", "t": "\t", "v": "\v", "\n": ""}
+_BATCH_SEP = "\x00"
+
+
+def _unescape_match(m: "re.Match[str]") -> str:
+    esc = m.group(1)
+    head = esc[0]
+    try:
+        if head in "uUx":
+            return chr(int(esc[1:], 16))
+        if head == "N":
+            import unicodedata
+            return unicodedata.lookup(esc[2:-1])
+        if head in "01234567":
+            return chr(int(esc, 8))
+    except (ValueError, KeyError):
+        return m.group(0)
+    return _SIMPLE_ESCAPES[esc]
+
+
+def _fix_latin1_utf8(text: str) -> str:
+    """转义得到的 \\xNN 字节序列若组成 UTF-8，则按 UTF-8 还原"""
+    if text.isascii():
+        return text
+    try:
+        return text.encode("latin-1").decode("utf-8")
+    except (UnicodeEncodeError, UnicodeDecodeError):
+        return text
+
+
+def _decode_escapes_one(text: str) -> str:
+    if text.isascii():
+        try:
+            return _fix_latin1_utf8(text.encode("ascii").decode("unicode_escape"))
+        except UnicodeDecodeError:
+            pass
+    # 含原生非 ASCII 字符或转义不完整时，逐个替换可识别的转义序列
+    return _fix_latin1_utf8(_ESCAPE_RE.sub(_unescape_match, text))
+
+
+def _decode_escapes_batch(texts: List[Any]) -> List[Any]:
+    """批量解码一组文本：不含反斜杠的原样返回；纯 ASCII 的拼接后只调用一次 unicode_escape 解码"""
+    out = list(texts)
+    idx = [i for i, t in enumerate(texts) if isinstance(t, str) and "\\" in t]
+    if not idx:
+        return out
+    ascii_idx = [i for i in idx if texts[i].isascii() and _BATCH_SEP not in texts[i]]
+    if len(ascii_idx) > 1:
+        try:
+            joined = _BATCH_SEP.join([texts[i] for i in ascii_idx]).encode("ascii").decode("unicode_escape")
+            parts = joined.split(_BATCH_SEP)
+        except UnicodeDecodeError:
+            parts = []
+        # 转义结果本身含 \\x00 时分段数对不上，交由逐条解码
+        if len(parts) == len(ascii_idx):
+            for i, text in zip(ascii_idx, parts):
+                out[i] = _fix_latin1_utf8(text)
+            done = set(ascii_idx)
+            idx = [i for i in idx if i not in done]
+    for i in idx:
+        out[i] = _decode_escapes_one(texts[i])
+    return out
+
+
+# -----------------------------
+# 话题标签提取（XHS 采集、结构化输出与爬虫组件共用同一份实现，修改时请逐字同步）
+# 各组件输出的标签格式保持原样，这里只把各自的正则预编译为模块级常量，按格式名选用：
+# - "正文"（结构化输出的正文兜底）：# 之后到下一个 # 或换行为止，"#名称[话题]#" 得到 "名称[话题]"
+# - "成对"（XHS 采集）：成对 # 之间的内容，同样保留 "[话题]" 后缀
+# - "名称"（爬虫组件）：文本开头或空白之后的 #名称（全角＃视同半角），只取名称并去重
+# -----------------------------
+_HASHTAG_PATTERNS: Dict[str, "re.Pattern[str]"] = {
+    "正文": re.compile(r"#([^#\n\r]+)"),
+    "成对": re.compile(r"#([^#]+)#"),
+    "名称": re.compile(r"(?:^|\s)#([\w\-\u4e00-\u9fa5]+)"),
+}
+
+
+def _extract_hashtags(text: Any, style: str) -> List[str]:
+    """单段文本 -> 标签列表（格式见上）；非字符串或不含 # 的文本不进入正则"""
+    if not isinstance(text, str) or ("#" not in text and "＃" not in text):
+        return []
+    if style == "名称":
+        text = text.replace("＃", "#")
+    tags = [t for t in map(str.strip, _HASHTAG_PATTERNS[style].findall(text)) if t]
+    return list(dict.fromkeys(tags)) if style == "名称" else tags
+
 
 class XiaohongshuScraper(Component):
     display_name = "小红书爬虫"
@@ -64,16 +308,185 @@ class XiaohongshuScraper(Component):
             options=["全部", "视频", "图文"],
             value="全部",
             info="选择要搜索的笔记类型"
-        )
+        ),
+        BoolInput(
+            name="use_detail_cache",
+            display_name="使用本地详情缓存",
+            info="跨运行缓存用户详情与笔记详情，未过期的ID不再请求",
+            value=False
+        ),
+        MessageTextInput(
+            name="detail_cache_path",
+            display_name="详情缓存路径",
+            info="详情缓存使用的 SQLite 文件路径；为空则使用组件常量 DETAIL_CACHE_PATH",
+            value="",
+            advanced=True
+        ),
+        DropdownInput(
+            name="log_level",
+            display_name="日志级别",
+            options=["DEBUG", "INFO", "WARNING", "ERROR"],
+            value="INFO",
+            info="低于该级别的日志不输出；排查接口问题时选 DEBUG",
+            advanced=True
+        ),
     ]
 
     outputs = [
-        Output(display_name="爬取结果", name="result", method="build_output")
+        Output(display_name="爬取结果", name="result", method="build_output"),
+        Output(display_name="爬取结果表格", name="dataframe", method="build_dataframe"),
     ]
 
-    def _emit_log(self, message: Any) -> None:
-        if not hasattr(self, "_debug_logs"):
-            self._debug_logs = []
+    # 连接池配置（不影响前台选项）：所有实例共享同一个连接池适配器（keep-alive），会话按线程各建一个
+    # - HTTP_POOL_SIZE：每个主机保持的最大连接数
+    # - HTTP_CONNECT_TIMEOUT：建立连接超时（秒）；读超时沿用 send_request 的 timeout 参数
+    API_URL: str = "http://api.batmkey.cn:8000/api/v3"
+    HTTP_POOL_SIZE: int = 8
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+
+    # 详情补全并发配置：有界并发 + 单次运行内共享限速 + 按ID重试
+    ENRICH_CONCURRENCY: int = 4
+    ENRICH_RATE_PER_SEC: float = 5.0
+    ENRICH_RETRY_ATTEMPTS: int = 3
+    ENRICH_RETRY_BACKOFF_SECONDS: float = 0.5
+
+    # 搜索翻页并发配置：按页预先生成 payload（bydev 按页递增），限速并发发送后按页序产出
+    PAGE_CONCURRENCY: int = 3
+    PAGE_RATE_PER_SEC: float = 1.0
+
+    # 详情缓存配置（不影响前台选项）：按类别（用户详情/笔记详情）分别设置有效期，超出 DETAIL_CACHE_MAX_ENTRIES 时淘汰最久未使用的条目
+    DETAIL_CACHE_PATH: str = "~/.xhs_batmkey_detail_cache.sqlite3"
+    DETAIL_CACHE_TTL_SECONDS: Dict[str, int] = {"用户详情": 7 * 86400, "笔记详情": 86400}
+    DETAIL_CACHE_MAX_ENTRIES: int = 50000
+
+    # 输出列：FIELD_ORDER 为结果字段顺序；CATEGORICAL_FIELDS 为表格输出中以分类类型存储的低基数字段
+    FIELD_ORDER: Tuple[str, ...] = (
+        # 搜索结果字段
+        "笔记id", "标题", "笔记类型", "发布时间", "笔记链接",
+        "封面图链接", "视频链接", "所有图片链接", "图片数量", "笔记正文", "笔记tag",
+        "点赞数", "评论数", "收藏数", "好看数", "分享数",
+        # 用户详情字段
+        "作者ID", "作者昵称", "小红书号", "是否官方认证",
+        "作者粉丝数", "作者获赞与收藏数", "作者简介", "作者主页链接",
+        # 笔记详情字段
+        "笔记完整正文", "笔记关联话题", "作者IP",
+    )
+    FIELD_DEFAULTS: Dict[str, Any] = {
+        "作者粉丝数": 0,
+        "作者获赞与收藏数": 0,
+        "作者简介": "",
+        "作者主页链接": "",
+        "所有图片链接": [],
+        "图片数量": 0,
+    }
+    CATEGORICAL_FIELDS: Tuple[str, ...] = ("笔记类型", "作者IP")
+
+    # 参数编码记忆：接口只接受字符串 param 时记录下来，后续直接发字符串形式；每 PARAM_REPROBE_EVERY 次重新试探字典形式
+    PARAM_REPROBE_EVERY: int = 50
+
+    _shared_adapter: Optional[HTTPAdapter] = None
+    _adapter_lock = threading.Lock()
+    _thread_sessions = threading.local()
+    _string_param_routers: Dict[str, int] = {}
+    _param_lock = threading.Lock()
+
+    @classmethod
+    def _http_adapter(cls) -> HTTPAdapter:
+        """进程内共享的连接池适配器（urllib3 连接池线程安全，keep-alive 连接跨线程、跨运行复用），首次使用时创建"""
+        if cls._shared_adapter is None:
+            with cls._adapter_lock:
+                if cls._shared_adapter is None:
+                    XiaohongshuScraper._shared_adapter = _CountingHTTPAdapter(
+                        pool_connections=4, pool_maxsize=max(1, int(cls.HTTP_POOL_SIZE)), max_retries=0
+                    )
+        return cls._shared_adapter
+
+    @classmethod
+    def _http_session(cls) -> requests.Session:
+        """当前线程的 HTTP 会话：requests.Session 不保证线程安全，每个线程各用一个，都挂载同一个共享适配器"""
+        session = getattr(cls._thread_sessions, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = cls._http_adapter()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({"Content-Type": "application/json", "Connection": "keep-alive"})
+            cls._thread_sessions.session = session
+        return session
+
+    def _run_http_stats(self) -> _HttpStats:
+        """本次运行的 HTTP 计数器；build_output 会在调用线程中预先创建，这里只为单独调用 send_request 的情况兜底"""
+        stats = getattr(self, "_http_stats", None)
+        if stats is None:
+            with self._adapter_lock:
+                stats = getattr(self, "_http_stats", None)
+                if stats is None:
+                    stats = self._http_stats = _HttpStats()
+        return stats
+
+    @staticmethod
+    def _encode_param_string(pdict: Dict[str, Any]) -> str:
+        from urllib.parse import quote_plus
+        return '&'.join([f"{k}={quote_plus(str(v))}" for k, v in pdict.items() if v is not None])
+
+    def _prefer_string_param(self, router: str) -> bool:
+        """该接口是否已记录为只接受字符串 param；到达重探周期时返回 False 以重新试探字典形式"""
+        cls = XiaohongshuScraper
+        with cls._param_lock:
+            if router not in cls._string_param_routers:
+                return False
+            cls._string_param_routers[router] += 1
+            return cls._string_param_routers[router] % max(1, int(self.PARAM_REPROBE_EVERY)) != 0
+
+    def _remember_param_encoding(self, router: str, string_only: bool) -> None:
+        cls = XiaohongshuScraper
+        with cls._param_lock:
+            if string_only:
+                cls._string_param_routers.setdefault(router, 0)
+            else:
+                cls._string_param_routers.pop(router, None)
+
+    @staticmethod
+    def _is_param_format_error(response_data: Any) -> bool:
+        """无 data 的响应是否为参数格式错误（错误信息提到 param/参数），以区别于用户不存在等业务错误"""
+        if not isinstance(response_data, dict) or 'data' in response_data:
+            return False
+        text = " ".join(str(response_data.get(k) or "") for k in ("msg", "message", "error", "detail", "errmsg"))
+        return bool(_PARAM_ERROR_RE.search(text))
+
+    def _count_param_stat(self, key: str) -> None:
+        if not hasattr(self, "_param_stats"):
+            self._param_stats = {"已避免回退请求": 0, "回退请求": 0}
+        self._param_stats[key] = self._param_stats.get(key, 0) + 1
+
+    def connection_reuse_stats(self) -> Dict[str, Any]:
+        """本次运行的请求数、新建连接数与连接复用率（只计本实例发出的请求，不含并发运行的其他实例）"""
+        return self._run_http_stats().as_dict()
+
+    # 调试日志：按级别过滤，低于前台“日志级别”的消息不做任何格式化；仅保留最近 DEBUG_LOG_MAX_LINES 条
+    # - LOG_LEVEL：未设置 log_level 输入（如脚本中直接实例化）时使用的默认级别
+    LOG_LEVELS: Dict[str, int] = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+    LOG_LEVEL: str = "INFO"
+    DEBUG_LOG_MAX_LINES: int = 2000
+
+    def _log_enabled(self, level: str) -> bool:
+        threshold = self.LOG_LEVELS.get(str(getattr(self, "log_level", None) or self.LOG_LEVEL).upper(), 20)
+        return self.LOG_LEVELS.get(level, 10) >= threshold
+
+    def _emit_log(self, message: Any, *args: Any, level: str = "DEBUG") -> None:
+        """
+        记录日志。message 为 %-格式模板，args 中的可调用对象在确认需要输出时才求值，
+        因此被级别过滤掉的消息不会触发 json.dumps / keys() 等序列化开销。
+        """
+        if not self._log_enabled(level):
+            return
+        if args:
+            try:
+                message = message % tuple(a() if callable(a) else a for a in args)
+            except Exception as e:
+                message = f"{message} <日志格式化失败: {e}>"
+        if not isinstance(getattr(self, "_debug_logs", None), deque):
+            self._debug_logs = deque(maxlen=max(1, int(self.DEBUG_LOG_MAX_LINES)))
         try:
             self.log(message)
         except Exception:
@@ -106,7 +519,7 @@ class XiaohongshuScraper(Component):
             "note_type": note_type,
             "page": page,
         }
-        self._emit_log(f"🔧 创建Payload参数: note_type={note_type} (0=全部, 1=图文, 2=视频)")
+        self._emit_log("🔧 创建Payload参数: note_type=%s (0=全部, 1=图文, 2=视频)", note_type)
         try:
             from urllib.parse import quote_plus
             param_str = '&'.join([f"{k}={quote_plus(str(v))}" for k, v in pdict.items() if v is not None])
@@ -117,118 +530,215 @@ class XiaohongshuScraper(Component):
             "param": param_str,
             "router": "/xhs/search",
         }
-        self._emit_log(f"🔧 创建Payload: {payload}")
+        self._emit_log("🔧 创建Payload: %s", payload)
         return payload
 
     def send_request(self, payload: dict, url: str = "http://api.batmkey.cn:8000/api/v3", timeout: int = 15) -> Tuple[int, str, Dict]:
         """发送API请求"""
-        self._emit_log(f"📡 发送请求到: {url}")
-        self._emit_log(f"📡 请求Payload: {json.dumps(payload, ensure_ascii=False)}")
-        
+        self._emit_log("📡 发送请求到: %s", url)
+        self._emit_log("📡 请求Payload: %s", lambda: json.dumps(payload, ensure_ascii=False))
         try:
             headers = {"Content-Type": "application/json"}
+            session = self._http_session()
             
-            # 创建请求
+            # 该接口已知只接受字符串 param 时，直接发送字符串形式，省去一次注定回退的请求
+            router = str(payload.get("router") or url)
+            dict_param = isinstance(payload.get('param'), dict)
+            sent_as_string = dict_param and self._prefer_string_param(router)
+            original_payload = payload
+            if sent_as_string:
+                payload = {**payload, "param": self._encode_param_string(payload['param'])}
+            
+            # 创建请求（通过共享会话发送，复用 keep-alive 连接）
+            stats = self._run_http_stats()
+
             def _do_req(body: dict):
                 data_bytes = json.dumps(body).encode('utf-8')
-                req = request.Request(url, data=data_bytes, headers=headers)
-                return req, data_bytes
-            req, req_data = _do_req(payload)
+                stats.add(requests_=1)
+                _REQUEST_CONTEXT.stats = stats
+                try:
+                    resp = session.post(url, data=data_bytes, headers=headers, timeout=(self.HTTP_CONNECT_TIMEOUT, timeout))
+                finally:
+                    _REQUEST_CONTEXT.stats = None
+                return resp, data_bytes
             
-            self._emit_log(f"📡 请求头: {headers}")
-            self._emit_log(f"📡 请求数据大小: {len(req_data)} bytes")
+            def _retry(body: dict, form: str, string_only: bool, first: Tuple[int, str, Dict]) -> Tuple[int, str, Dict]:
+                """以另一种 param 形式重发一次；成功（含 data）时记录该接口的编码形式，重发本身出错时返回首次结果"""
+                try:
+                    self._count_param_stat("回退请求")
+                    self._emit_log("🔄 回退为%sparam: %s", form, lambda: body['param'])
+                    resp2, req_fb_data = _do_req(body)
+                    self._emit_log("📡 回退请求数据大小: %s bytes", lambda: len(req_fb_data))
+                    st2 = resp2.status_code
+                    bd2 = resp2.content
+                    self._emit_log("📡 回退响应状态码: %s", st2)
+                    try:
+                        rd2 = json.loads(bd2.decode('utf-8'))
+                        self._emit_log("📡 回退解析成功，键: %s", lambda: list(rd2.keys()) if isinstance(rd2, dict) else 'Not dict')
+                        if isinstance(rd2, dict) and 'data' in rd2 and string_only:
+                            self._remember_param_encoding(router, string_only=True)
+                        return st2, "OK", rd2 if isinstance(rd2, dict) else {}
+                    except Exception as e:
+                        self._emit_log("❌ 回退解析错误: %s", e, level="ERROR")
+                        return st2, f"回退解析错误: {e}", {}
+                except Exception as e:
+                    self._emit_log("❌ 回退构造错误: %s", e, level="ERROR")
+                    return first
             
             # 发送请求
-            with request.urlopen(req, timeout=timeout) as response:
-                status = response.getcode()
-                body = response.read()
-                
-                self._emit_log(f"📡 响应状态码: {status}")
-                self._emit_log(f"📡 响应数据大小: {len(body)} bytes")
-                self._emit_log(f"📡 响应前100字符: {body[:100].decode('utf-8', errors='ignore')}")
-                
-                try:
-                    response_data = json.loads(body.decode('utf-8'))
-                    self._emit_log(f"📡 JSON解析成功，数据类型: {type(response_data)}")
-                    if isinstance(response_data, dict):
-                        self._emit_log(f"📡 响应数据键: {list(response_data.keys())}")
-                        if 'data' in response_data:
-                            self._emit_log(f"📡 data字段类型: {type(response_data['data'])}")
-                            if isinstance(response_data['data'], dict):
-                                self._emit_log(f"📡 data字典键: {list(response_data['data'].keys())}")
-                                if 'items' in response_data['data']:
-                                    items = response_data['data']['items']
-                                    self._emit_log(f"📡 items字段类型: {type(items)}")
-                                    if isinstance(items, list):
-                                        self._emit_log(f"📡 items数组长度: {len(items)}")
-                        else:
-                            if isinstance(payload.get('param'), dict):
-                                try:
-                                    from urllib.parse import quote_plus
-                                    pdict = payload['param']
-                                    pstr = '&'.join([f"{k}={quote_plus(str(v))}" for k, v in pdict.items() if v is not None])
-                                    fallback = dict(payload)
-                                    fallback['param'] = pstr
-                                    self._emit_log(f"🔄 回退为字符串param: {fallback['param']}")
-                                    req_fb, req_fb_data = _do_req(fallback)
-                                    self._emit_log(f"📡 回退请求数据大小: {len(req_fb_data)} bytes")
-                                    with request.urlopen(req_fb, timeout=timeout) as resp2:
-                                        st2 = resp2.getcode()
-                                        bd2 = resp2.read()
-                                        self._emit_log(f"📡 回退响应状态码: {st2}")
-                                        try:
-                                            rd2 = json.loads(bd2.decode('utf-8'))
-                                            self._emit_log(f"📡 回退解析成功，键: {list(rd2.keys()) if isinstance(rd2, dict) else 'Not dict'}")
-                                            return st2, "OK", rd2 if isinstance(rd2, dict) else {}
-                                        except Exception as e:
-                                            self._emit_log(f"❌ 回退解析错误: {e}")
-                                            return st2, f"回退解析错误: {e}", {}
-                                except Exception as e:
-                                    self._emit_log(f"❌ 回退构造错误: {e}")
-                                    return status, "OK", response_data
-                    return status, "OK", response_data
-                except json.JSONDecodeError as e:
-                    self._emit_log(f"❌ JSON解析错误: {e}")
-                    self._emit_log(f"❌ 原始响应: {body.decode('utf-8', errors='ignore')}")
-                    return status, f"JSON解析错误: {e}", {}
+            response, req_data = _do_req(payload)
+            self._emit_log("📡 请求头: %s", headers)
+            self._emit_log("📡 请求数据大小: %s bytes", lambda: len(req_data))
+            status = response.status_code
+            if status >= 400:
+                self._emit_log("❌ HTTP错误: %s - %s", status, response.reason, level="ERROR")
+                return status, f"HTTP Error {status}: {response.reason}", {}
+            body = response.content
+            
+            self._emit_log("📡 响应状态码: %s", status)
+            self._emit_log("📡 响应数据大小: %s bytes", lambda: len(body))
+            self._emit_log("📡 响应前100字符: %s", lambda: body[:100].decode('utf-8', errors='ignore'))
+            try:
+                response_data = json.loads(body.decode('utf-8'))
+                self._emit_log("📡 JSON解析成功，数据类型: %s", lambda: type(response_data))
+                if isinstance(response_data, dict):
+                    self._emit_log("📡 响应数据键: %s", lambda: list(response_data.keys()))
+                    if 'data' in response_data:
+                        if sent_as_string:
+                            self._count_param_stat("已避免回退请求")
+                        elif dict_param:
+                            self._remember_param_encoding(router, string_only=False)
+                        self._emit_log("📡 data字段类型: %s", lambda: type(response_data['data']))
+                        if isinstance(response_data['data'], dict):
+                            self._emit_log("📡 data字典键: %s", lambda: list(response_data['data'].keys()))
+                            if 'items' in response_data['data']:
+                                items = response_data['data']['items']
+                                self._emit_log("📡 items字段类型: %s", lambda: type(items))
+                                if isinstance(items, list):
+                                    self._emit_log("📡 items数组长度: %s", lambda: len(items))
+                    else:
+                        if sent_as_string:
+                            if not self._is_param_format_error(response_data):
+                                # 业务错误（如用户不存在）与编码形式无关：保留记忆，原样返回
+                                return status, "OK", response_data
+                            # 记忆的字符串形式被判为参数格式错误：清除记忆，改用字典形式重试一次
+                            self._remember_param_encoding(router, string_only=False)
+                            return _retry(original_payload, "字典", False, (status, "OK", response_data))
+                        if dict_param:
+                            fallback = dict(payload)
+                            fallback['param'] = self._encode_param_string(payload['param'])
+                            return _retry(fallback, "字符串", True, (status, "OK", response_data))
+                return status, "OK", response_data
+            except json.JSONDecodeError as e:
+                self._emit_log("❌ JSON解析错误: %s", e, level="ERROR")
+                self._emit_log("❌ 原始响应: %s", lambda: body.decode('utf-8', errors='ignore'), level="ERROR")
+                return status, f"JSON解析错误: {e}", {}
                     
-        except error.HTTPError as e:
-            self._emit_log(f"❌ HTTP错误: {e.code} - {e}")
-            return e.code, str(e), {}
-        except error.URLError as e:
-            self._emit_log(f"❌ URL错误: {e}")
+        except requests.RequestException as e:
+            self._emit_log("❌ URL错误: %s", e, level="ERROR")
             return 0, f"网络错误: {e}", {}
         except Exception as e:
-            self._emit_log(f"❌ 请求异常: {e}")
+            self._emit_log("❌ 请求异常: %s", e, level="ERROR")
             return 0, f"请求异常: {e}", {}
 
     def decode_unicode_text(self, text: str) -> str:
-        """解码Unicode转义字符和UTF-8编码"""
+        """解码Unicode转义字符和UTF-8编码；不含反斜杠的文本原样返回，整页预解码的文本直接查表"""
         if not text:
             return ""
-        try:
-            # 首先尝试处理 \uXXXX 格式的Unicode转义
-            try:
-                decoded = text.encode().decode('unicode_escape')
-                # 如果解码后仍然是乱码，尝试UTF-8解码
-                if any(ord(c) > 127 for c in decoded):
-                    try:
-                        # 将字符串编码为latin-1，然后解码为UTF-8
-                        utf8_decoded = decoded.encode('latin-1').decode('utf-8')
-                        return utf8_decoded
-                    except:
-                        pass
-                return decoded
-            except:
-                # 如果Unicode转义失败，直接尝试UTF-8解码
-                try:
-                    # 将字符串编码为latin-1，然后解码为UTF-8
-                    utf8_decoded = text.encode('latin-1').decode('utf-8')
-                    return utf8_decoded
-                except:
-                    return text
-        except:
+        if not isinstance(text, str) or "\\" not in text:
             return text
+        cached = getattr(self, "_decoded_page_texts", None)
+        if cached and text in cached:
+            return cached[text]
+        return _decode_escapes_batch([text])[0]
+
+    def _prime_decoded_texts(self, items_list: List[Any]) -> None:
+        """整页批量解码标题、正文与作者昵称，后续 decode_unicode_text 直接查表"""
+        raw: List[str] = []
+        for item in items_list:
+            note = item.get("note") if isinstance(item, dict) else None
+            if not isinstance(note, dict):
+                continue
+            user = note.get("user")
+            for text in (note.get("title"), note.get("desc"), user.get("nickname") if isinstance(user, dict) else None):
+                if isinstance(text, str) and "\\" in text:
+                    raw.append(text)
+        self._decoded_page_texts = dict(zip(raw, _decode_escapes_batch(raw)))
+
+    def _origin_video_key(self, note: Dict[str, Any]) -> Optional[str]:
+        """从 widgets_context 中取 origin_video_key；不含该字段时跳过 JSON 解析"""
+        widgets_context = note.get("widgets_context", "")
+        if not widgets_context or not isinstance(widgets_context, str) or "origin_video_key" not in widgets_context:
+            return None
+        try:
+            widgets_data = json.loads(widgets_context)
+        except Exception as e:
+            self._emit_log("⚠️ 解析widgets_context失败: %s", e, level="WARNING")
+            return None
+        return widgets_data.get("origin_video_key") if isinstance(widgets_data, dict) else None
+
+    def _collect_media_urls(self, note: Dict[str, Any], search_note_type: int = 0) -> Tuple[str, List[str], List[str]]:
+        """单次遍历笔记的图片与视频结构，按优先级收集封面、图片链接和视频链接（未去重）
+        Args:
+            note: 笔记对象
+            search_note_type: 搜索的笔记类型 (0=全部, 1=图文, 2=视频)
+        """
+        cover_url = ""
+        image_urls: List[str] = []
+        video_urls: List[str] = []
+
+        images_list = note.get("images_list")
+        if isinstance(images_list, list):
+            for img in images_list:
+                if isinstance(img, dict):
+                    url = None
+                    for key in _IMAGE_URL_KEYS:
+                        url = img.get(key)
+                        if url:
+                            break
+                    if url:
+                        image_urls.append(url)
+                        if not cover_url:
+                            cover_url = url
+                    live_photo = img.get("live_photo")
+                    if isinstance(live_photo, dict):
+                        _append_stream_urls(live_photo.get("media"), video_urls, url_fallback=False)
+                elif isinstance(img, str):
+                    image_urls.append(img)
+                    if not cover_url:
+                        cover_url = img
+        self._emit_log("🔍 图片遍历完成，图片%s张，实况视频链接%s条", lambda: len(image_urls), lambda: len(video_urls))
+
+        # search_note_type == 1 (图文笔记) 不需要提取视频URL
+        if search_note_type not in (0, 2):
+            return cover_url, image_urls, video_urls
+
+        # 视频笔记优先使用 widgets_context 中 origin_video_key 拼出的简化URL
+        video_key = self._origin_video_key(note)
+        if video_key:
+            video_urls.append(_SIMPLIFIED_VIDEO_PREFIX + video_key)
+            self._emit_log("🔍 使用简化视频URL: %s%s", _SIMPLIFIED_VIDEO_PREFIX, video_key)
+        elif search_note_type == 2:
+            self._emit_log("⚠️ 未找到origin_video_key，笔记ID: %s", lambda: note.get('id', ''), level="WARNING")
+        if search_note_type == 2:
+            return cover_url, image_urls, video_urls
+
+        # 混合搜索：尚无视频链接时再从 video_info_v2.media 提取详细链接
+        if not video_urls:
+            vobj2 = note.get("video_info_v2")
+            if isinstance(vobj2, dict):
+                _append_stream_urls(vobj2.get("media"), video_urls, combined=True)
+
+        # video 或 video_info（旧版结构）
+        vobj = note.get("video") or note.get("video_info")
+        if isinstance(vobj, dict):
+            _append_stream_urls(vobj, video_urls)
+            for dk in _VIDEO_DIRECT_KEYS:
+                dv = vobj.get(dk)
+                if isinstance(dv, str) and dv:
+                    video_urls.append(dv)
+        self._emit_log("🔍 视频遍历完成，共%s条链接", lambda: len(video_urls))
+        return cover_url, image_urls, video_urls
 
     def extract_note_data(self, item: Dict[str, Any], search_note_type: int = 0) -> Optional[Dict[str, Any]]:
         """从单个item中提取笔记数据
@@ -236,36 +746,29 @@ class XiaohongshuScraper(Component):
             item: 笔记数据项
             search_note_type: 搜索的笔记类型 (0=全部, 1=图文, 2=视频)
         """
-        self._emit_log(f"🔍 开始提取数据，item类型: {type(item)}, 搜索类型: {search_note_type}")
-        self._emit_log(f"🔍 item键: {list(item.keys()) if isinstance(item, dict) else 'Not a dict'}")
-        
+        self._emit_log("🔍 开始提取数据，item类型: %s, 搜索类型: %s", lambda: type(item), search_note_type)
+        self._emit_log("🔍 item键: %s", lambda: list(item.keys()) if isinstance(item, dict) else 'Not a dict')
         if not isinstance(item, dict):
-            self._emit_log(f"❌ item不是字典类型: {type(item)}")
+            self._emit_log("❌ item不是字典类型: %s", lambda: type(item), level="ERROR")
             return None
             
         model_type = item.get("model_type")
-        self._emit_log(f"🔍 model_type: {model_type}")
-        
-        
+        self._emit_log("🔍 model_type: %s", model_type)
         note = item["note"]
-        self._emit_log(f"🔍 note类型: {type(note)}")
-        self._emit_log(f"🔍 note键: {list(note.keys()) if isinstance(note, dict) else 'Not a dict'}")
-        
+        self._emit_log("🔍 note类型: %s", lambda: type(note))
+        self._emit_log("🔍 note键: %s", lambda: list(note.keys()) if isinstance(note, dict) else 'Not a dict')
         note_type = note.get("type")
-        self._emit_log(f"🔍 笔记类型: {note_type}")
-        
+        self._emit_log("🔍 笔记类型: %s", note_type)
         # 允许所有类型，后续统一映射为中文类别
         
         user = note.get("user", {})
-        self._emit_log(f"🔍 用户信息类型: {type(user)}")
-        self._emit_log(f"🔍 用户信息键: {list(user.keys()) if isinstance(user, dict) else 'Not a dict'}")
-        
+        self._emit_log("🔍 用户信息类型: %s", lambda: type(user))
+        self._emit_log("🔍 用户信息键: %s", lambda: list(user.keys()) if isinstance(user, dict) else 'Not a dict')
         # 获取原始文本并进行调试
         raw_title = note.get("title", "")
         raw_desc = note.get("desc", "")
-        self._emit_log(f"🔍 原始标题: {repr(raw_title)}")
-        self._emit_log(f"🔍 原始描述: {repr(raw_desc)}")
-        
+        self._emit_log("🔍 原始标题: %s", lambda: repr(raw_title))
+        self._emit_log("🔍 原始描述: %s", lambda: repr(raw_desc))
         # 提取基本信息
         nt = note.get("type", "")
         vobj_tmp = note.get("video") or note.get("video_info") or note.get("video_info_v2")
@@ -287,21 +790,14 @@ class XiaohongshuScraper(Component):
             "是否官方认证": bool(user.get("red_official_verified", False)),
         }
         
-        self._emit_log(f"🔍 解码后标题: {extracted['标题']}")
-        self._emit_log(f"🔍 解码后描述: {extracted['笔记正文']}")
-        self._emit_log(f"✅ 基本信息提取完成: {extracted['笔记ID']} - {extracted['标题']}")
-        
+        self._emit_log("🔍 解码后标题: %s", lambda: extracted['标题'])
+        self._emit_log("🔍 解码后描述: %s", lambda: extracted['笔记正文'])
+        self._emit_log("✅ 基本信息提取完成: %s - %s", lambda: extracted['笔记ID'], lambda: extracted['标题'])
         ts = note.get("timestamp") or note.get("update_time")
         pub_text = ""
         try:
             if isinstance(ts, int) and ts > 0:
-                if ts > 10**12:
-                    dt = datetime.fromtimestamp(ts / 1000)
-                elif ts > 10**9:
-                    dt = datetime.fromtimestamp(ts)
-                else:
-                    dt = None
-                extracted["发布时间"] = dt.strftime("%Y-%m-%d %H:%M:%S") if dt else ""
+                extracted["发布时间"] = _format_ts_seconds(_ts_seconds(ts))
             else:
                 cti = note.get("corner_tag_info")
                 if isinstance(cti, list):
@@ -313,202 +809,10 @@ class XiaohongshuScraper(Component):
         except Exception:
             extracted["发布时间"] = ""
         
-        # 处理图片列表
-        images_list = note.get("images_list", [])
-        self._emit_log(f"🔍 图片列表类型: {type(images_list)}, 长度: {len(images_list) if isinstance(images_list, list) else 'Not a list'}")
-        
-        cover_url = ""
-        image_urls = []
-        video_urls = []
-        video_ids = []
-        
-        # 处理图片列表（如果有）
-        if isinstance(images_list, list) and len(images_list) > 0:
-            for i, img in enumerate(images_list):
-                self._emit_log(f"🔍 图片{i+1}类型: {type(img)}")
-                if isinstance(img, dict):
-                    self._emit_log(f"🔍 图片{i+1}键: {list(img.keys())}")
-                    url = (
-                        img.get("url")
-                        or img.get("url_size_large")
-                        or img.get("url_size_medium")
-                        or img.get("url_size_small")
-                        or img.get("original")
-                    )
-                    if url:
-                        image_urls.append(url)
-                        if not cover_url:
-                            cover_url = url
-                    live_photo = img.get("live_photo")
-                    if isinstance(live_photo, dict):
-                        media = live_photo.get("media", {})
-                        vid = media.get("video_id")
-                        if vid is not None:
-                            video_ids.append(vid)
-                        streams = media.get("streams")
-                        if isinstance(streams, list):
-                            for s in streams:
-                                mu = s.get("master_url")
-                                if mu:
-                                    video_urls.append(mu)
-                                burls = s.get("backup_urls")
-                                if isinstance(burls, list):
-                                    for bu in burls:
-                                        if isinstance(bu, str):
-                                            video_urls.append(bu)
-                        else:
-                            stream = media.get("stream", {})
-                            if isinstance(stream, dict):
-                                for k in ["h265", "h264", "av1", "h266"]:
-                                    arr = stream.get(k)
-                                    if isinstance(arr, list):
-                                        for s in arr:
-                                            mu = s.get("master_url")
-                                            if mu:
-                                                video_urls.append(mu)
-                                            burls = s.get("backup_urls")
-                                            if isinstance(burls, list):
-                                                for bu in burls:
-                                                    if isinstance(bu, str):
-                                                        video_urls.append(bu)
-                elif isinstance(img, str):
-                    image_urls.append(img)
-                    if not cover_url:
-                        cover_url = img
-        
-        # 处理视频信息（无论images_list是否为空，都要检查视频字段）
-        # 这对于视频笔记特别重要，因为视频笔记的images_list可能为空
-        self._emit_log(f"🔍 开始提取视频信息，笔记类型: {note.get('type')}, 搜索类型: {search_note_type}")
-        
-        # 根据搜索类型决定视频URL提取方式
-        if search_note_type == 2:
-            # 视频笔记搜索：使用简化URL格式，从 widgets_context 中提取 origin_video_key
-            video_key = None
-            widgets_context = note.get("widgets_context", "")
-            if widgets_context:
-                try:
-                    import json
-                    widgets_data = json.loads(widgets_context)
-                    if isinstance(widgets_data, dict):
-                        video_key = widgets_data.get("origin_video_key")
-                        self._emit_log(f"🔍 从widgets_context提取到origin_video_key: {video_key}")
-                except Exception as e:
-                    self._emit_log(f"⚠️ 解析widgets_context失败: {e}")
-            
-            if video_key:
-                simplified_url = f"https://sns-video-hs.xhscdn.com/{video_key}"
-                video_urls.append(simplified_url)
-                self._emit_log(f"🔍 视频笔记搜索模式：使用简化URL: {simplified_url}")
-            else:
-                self._emit_log(f"⚠️ 未找到origin_video_key，笔记ID: {note.get('id', '')}")
-        elif search_note_type == 0:
-            # 混合搜索：优先从 video_info_v2 中提取详细视频链接，如果失败则尝试从 widgets_context 提取
-            # 先尝试从 widgets_context 提取（作为备用方案）
-            video_key = None
-            widgets_context = note.get("widgets_context", "")
-            if widgets_context:
-                try:
-                    import json
-                    widgets_data = json.loads(widgets_context)
-                    if isinstance(widgets_data, dict):
-                        video_key = widgets_data.get("origin_video_key")
-                        if video_key:
-                            self._emit_log(f"🔍 混合搜索模式：从widgets_context提取到origin_video_key: {video_key}")
-                except Exception as e:
-                    self._emit_log(f"⚠️ 解析widgets_context失败: {e}")
-            
-            if video_key:
-                simplified_url = f"https://sns-video-hs.xhscdn.com/{video_key}"
-                video_urls.append(simplified_url)
-                self._emit_log(f"🔍 混合搜索模式：使用简化URL: {simplified_url}")
-            
-            # 继续从 video_info_v2 中提取详细视频链接（如果还没有提取到）
-            if not video_urls:
-                # 混合搜索：从 video_info_v2 中提取详细视频链接
-                # 优先处理 video_info_v2（这是视频笔记的主要结构）
-                vobj2 = note.get("video_info_v2")
-            if isinstance(vobj2, dict):
-                self._emit_log(f"🔍 找到video_info_v2对象，键: {list(vobj2.keys())}")
-                media = vobj2.get("media")
-                if isinstance(media, dict):
-                    self._emit_log(f"🔍 找到media对象，键: {list(media.keys())}")
-                    # 处理 media.stream 结构（h264, h265等）
-                    stream2 = media.get("stream")
-                    if isinstance(stream2, dict):
-                        self._emit_log(f"🔍 找到stream对象，键: {list(stream2.keys())}")
-                        for k in ["h265", "h264", "av1", "h266"]:
-                            arr = stream2.get(k)
-                            if isinstance(arr, list) and len(arr) > 0:
-                                self._emit_log(f"🔍 找到{k}数组，长度: {len(arr)}")
-                                for idx, s in enumerate(arr):
-                                    if isinstance(s, dict):
-                                        mu = s.get("master_url") or s.get("url")
-                                        if mu:
-                                            video_urls.append(mu)
-                                            self._emit_log(f"🔍 从{k}[{idx}]提取到视频链接: {mu[:80]}...")
-                                        burls = s.get("backup_urls")
-                                        if isinstance(burls, list):
-                                            for bu in burls:
-                                                if isinstance(bu, str) and bu:
-                                                    video_urls.append(bu)
-                                                    self._emit_log(f"🔍 从{k}[{idx}]提取到备用链接: {bu[:80]}...")
-                    # 也检查 media.streams（如果存在）
-                    streams2 = media.get("streams")
-                    if isinstance(streams2, list) and len(streams2) > 0:
-                        self._emit_log(f"🔍 找到streams数组，长度: {len(streams2)}")
-                        for idx, s in enumerate(streams2):
-                            if isinstance(s, dict):
-                                mu = s.get("master_url") or s.get("url")
-                                if mu:
-                                    video_urls.append(mu)
-                                    self._emit_log(f"🔍 从streams[{idx}]提取到视频链接: {mu[:80]}...")
-                                burls = s.get("backup_urls")
-                                if isinstance(burls, list):
-                                    for bu in burls:
-                                        if isinstance(bu, str) and bu:
-                                            video_urls.append(bu)
-            
-            # 处理 video 或 video_info（旧版结构）
-            vobj = note.get("video") or note.get("video_info")
-            if isinstance(vobj, dict):
-                self._emit_log(f"🔍 找到video/video_info对象，键: {list(vobj.keys())}")
-                streams = vobj.get("streams")
-                if isinstance(streams, list):
-                    for s in streams:
-                        mu = s.get("master_url") or s.get("url")
-                        if mu:
-                            video_urls.append(mu)
-                        burls = s.get("backup_urls")
-                        if isinstance(burls, list):
-                            for bu in burls:
-                                if isinstance(bu, str):
-                                    video_urls.append(bu)
-                else:
-                    stream = vobj.get("stream")
-                    if isinstance(stream, dict):
-                        for k in ["h265", "h264", "av1", "h266"]:
-                            arr = stream.get(k)
-                            if isinstance(arr, list):
-                                for s in arr:
-                                    mu = s.get("master_url") or s.get("url")
-                                    if mu:
-                                        video_urls.append(mu)
-                                    burls = s.get("backup_urls")
-                                    if isinstance(burls, list):
-                                        for bu in burls:
-                                            if isinstance(bu, str):
-                                                video_urls.append(bu)
-                direct_keys = ["url", "play_url", "main_url", "video_url", "hls_video_url", "hls_url"]
-                for dk in direct_keys:
-                    dv = vobj.get(dk)
-                    if isinstance(dv, str) and dv:
-                        video_urls.append(dv)
-        # search_note_type == 1 (图文笔记) 不需要提取视频URL
-        
-        # 去重并设置结果
+        # 单次遍历提取图片与视频链接
+        cover_url, image_urls, video_urls = self._collect_media_urls(note, search_note_type)
         image_urls = list(dict.fromkeys([u for u in image_urls if u]))
         video_urls = list(dict.fromkeys([u for u in video_urls if u]))
-        video_ids = list(dict.fromkeys(video_ids))
         extracted["封面图链接"] = ([cover_url] if cover_url else [])
         extracted["视频链接"] = video_urls
         
@@ -519,161 +823,180 @@ class XiaohongshuScraper(Component):
         if is_image_note:
             extracted["所有图片链接"] = image_urls
             extracted["图片数量"] = len(image_urls)
-            self._emit_log(f"✅ 图文笔记：共{len(image_urls)}张图片")
+            self._emit_log("✅ 图文笔记：共%s张图片", lambda: len(image_urls))
         else:
             # 对于非图文笔记（视频笔记等），不输出所有图片链接
             extracted["所有图片链接"] = []
             extracted["图片数量"] = 0
         
-        self._emit_log(f"✅ 图片处理完成，共{len(image_urls)}张")
-        self._emit_log(f"✅ 视频处理完成，共{len(video_urls)}条")
+        self._emit_log("✅ 图片处理完成，共%s张", lambda: len(image_urls))
+        self._emit_log("✅ 视频处理完成，共%s条", lambda: len(video_urls))
         extracted["好看数"] = note.get("nice_count", 0)
         nid = extracted.get("笔记ID") or ""
         extracted["笔记链接"] = f"https://www.xiaohongshu.com/explore/{nid}" if nid else ""
         try:
             txt = (extracted.get("笔记正文") or "") + " " + (extracted.get("标题") or "")
-            txt = txt.replace("＃", "#")
-            tags = re.findall(r"(?:^|\s)#([\w\-\u4e00-\u9fa5]+)", txt)
-            tags = [t.strip() for t in tags if t]
-            tags = list(dict.fromkeys(tags))
+            tags = _extract_hashtags(txt, "名称")
             extracted["笔记tag"] = "; ".join(tags) if tags else ""
         except Exception:
             extracted["笔记tag"] = ""
         return extracted
 
+    def _check_page_response(self, page: int, status: int, reason: str, response_data: Dict[str, Any]) -> Dict[str, Any]:
+        """业务状态检查 - 即使HTTP成功也要检查API业务状态；返回写入结果列表的页数据"""
+        if 200 <= status < 300 and response_data:
+            # 检查API业务状态码 - 兼容两种字段名
+            api_code = response_data.get("code") or response_data.get("status_code")
+            
+            # 检查响应结构是否包含data字段
+            has_data_field = "data" in response_data and isinstance(response_data["data"], dict)
+            
+            # 成功条件：状态码为200且有data字段
+            if api_code == 200 and has_data_field:
+                self._emit_log("✅ 第 %s 页数据获取成功 (业务码: %s)", page, api_code, level="INFO")
+            else:
+                # API业务错误，记录详细信息但仍然添加到结果列表，以便在build_output中检测和处理
+                error_msg = response_data.get("message") or response_data.get("msg", "未知错误")
+                self._emit_log("⚠️ 第 %s 页API业务错误: %s (业务码: %s)", page, error_msg, api_code, level="WARNING")
+                self._emit_log("⚠️ 响应结构: %s", lambda: list(response_data.keys()) if isinstance(response_data, dict) else 'Not a dict', level="WARNING")
+                # 在日志中记录完整响应以便调试
+                self._emit_log("⚠️ 完整响应: %s", lambda: json.dumps(response_data, ensure_ascii=False), level="WARNING")
+            return response_data
+        # HTTP错误：保存错误信息，便于后续批量处理
+        self._emit_log("❌ 第 %s 页请求失败: %s %s", page, status, reason, level="ERROR")
+        return {
+            "error": {
+                "http_status": status,
+                "reason": reason,
+                "page": page
+            }
+        }
+
+    def iter_pages(self, keyword: str, start_page: int, end_page: int, sort_type: int, note_type: int) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        流水线翻页：先按页生成全部 payload（bydev 从 1 起按页递增），
+        再经限速的有界线程池并发发送，按页码顺序逐页产出 (页码, 页数据)。
+        调用方处理当前页时，后续页的请求仍在进行。
+        """
+        self._emit_log("🚀 开始获取数据", level="INFO")
+        self._emit_log("🚀 参数 - 关键词: %s, 页数: %s-%s, 排序: %s, 笔记类型: %s", keyword, start_page, end_page, sort_type, note_type, level="INFO")
+        payloads = [
+            (page, self.create_payload_for_page(page, keyword, sort_type, note_type, bydev))
+            for bydev, page in enumerate(range(start_page, end_page + 1), 1)
+        ]
+        if not payloads:
+            return
+        limiter = _RateLimiter(self.PAGE_RATE_PER_SEC)
+
+        def fetch(page: int, payload: Dict[str, Any]) -> Tuple[int, str, Dict]:
+            limiter.acquire()
+            self._emit_log("\n📄 请求第 %s 页", page)
+            return self.send_request(payload)
+
+        workers = max(1, min(int(self.PAGE_CONCURRENCY), len(payloads)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [(page, pool.submit(fetch, page, payload)) for page, payload in payloads]
+            try:
+                for page, fut in futures:
+                    try:
+                        status, reason, response_data = fut.result()
+                    except Exception as e:
+                        status, reason, response_data = 0, f"请求异常: {e}", {}
+                    yield page, self._check_page_response(page, status, reason, response_data)
+            finally:
+                # 调用方提前结束时取消尚未开始的请求
+                for _, fut in futures:
+                    fut.cancel()
+
     def fetch_data(self, keyword: str, start_page: int, end_page: int, sort_type: int, note_type: int) -> List[Dict[str, Any]]:
-        """获取数据"""
-        self._emit_log(f"🚀 开始获取数据")
-        self._emit_log(f"🚀 参数 - 关键词: {keyword}, 页数: {start_page}-{end_page}, 排序: {sort_type}, 笔记类型: {note_type}")
+        """获取数据（按页码顺序返回各页响应）"""
+        all_data = [resp for _, resp in self.iter_pages(keyword, start_page, end_page, sort_type, note_type)]
+        self._emit_log("🚀 数据获取完成，共处理 %s 页数据", lambda: len(all_data), level="INFO")
+        return all_data
+
+    def new_columns(self) -> Dict[str, List[Any]]:
+        """按 FIELD_ORDER 排列的空列数组"""
+        return {k: [] for k in self.FIELD_ORDER}
+
+    def extract_page_data(self, page_idx: int, response_data: Dict[str, Any], columns: Dict[str, List[Any]], note_type: int = 0) -> int:
+        """从单页响应中提取笔记数据，直接写入列数组（按本页条数预分配，提取失败的条目不占行）；返回写入条数"""
+        page_data = 0
+        self._emit_log("\n📄 处理第 %s 页数据...", page_idx)
+        self._emit_log("📄 响应数据类型: %s", lambda: type(response_data))
+        # 检查是否为错误响应
+        if "error" in response_data:
+            error_info = response_data["error"]
+            self._emit_log("⚠️ 第 %s 页包含错误信息: HTTP %s - %s", page_idx, lambda: error_info.get('http_status', '未知'), lambda: error_info.get('reason', '未知原因'), level="WARNING")
+            # 跳过错误页面的数据处理
+            return page_data
         
-        all_data = []
-        bydev = 1
+        # 检查响应数据结构
+        if not isinstance(response_data, dict):
+            self._emit_log("❌ 第 %s 页数据格式错误，不是字典类型", page_idx, level="ERROR")
+            return page_data
         
-        for page in range(start_page, end_page + 1):
-            self._emit_log(f"\n📄 处理第 {page} 页，bydev: {bydev}")
-            
-            # 创建payload
-            payload = self.create_payload_for_page(page, keyword, sort_type, note_type, bydev)
-            
-            # 发送请求
-            status, reason, response_data = self.send_request(payload)
+        self._emit_log("📄 响应数据键: %s", lambda: list(response_data.keys()))
+        # 获取data字段
+        data_field = response_data.get("data", {})
+        self._emit_log("📄 data字段类型: %s", lambda: type(data_field))
+        if not isinstance(data_field, dict):
+            self._emit_log("❌ 第 %s 页data字段不是字典类型: %s", page_idx, lambda: type(data_field), level="ERROR")
+            return page_data
+        
+        self._emit_log("📄 data字典键: %s", lambda: list(data_field.keys()))
+        # 获取items列表 - 这是关键修正！
+        items_list = data_field.get("items", [])
+        self._emit_log("📄 items字段类型: %s", lambda: type(items_list))
+        if not items_list:
+            self._emit_log("❌ 第 %s 页没有items字段或items为空", page_idx, level="ERROR")
+            # 打印完整的data字段以便调试
+            self._emit_log("📄 完整data字段: %s", lambda: json.dumps(data_field, ensure_ascii=False, indent=2))
+            return page_data
+        
+        if not isinstance(items_list, list):
+            self._emit_log("❌ 第 %s 页items字段不是列表类型: %s", page_idx, lambda: type(items_list), level="ERROR")
+            return page_data
             
-            # 业务状态检查 - 即使HTTP成功也要检查API业务状态
-            if 200 <= status < 300 and response_data:
-                # 检查API业务状态码 - 兼容两种字段名
-                api_code = response_data.get("code") or response_data.get("status_code")
-                
-                # 检查响应结构是否包含data字段
-                has_data_field = "data" in response_data and isinstance(response_data["data"], dict)
-                
-                # 成功条件：状态码为200且有data字段
-                if api_code == 200 and has_data_field:
-                    all_data.append(response_data)
-                    self._emit_log(f"✅ 第 {page} 页数据获取成功 (业务码: {api_code})")
+        self._emit_log("📄 items列表长度: %s", lambda: len(items_list))
+        self._prime_decoded_texts(items_list)
+        row = len(columns["笔记id"])
+        for col in columns.values():
+            col.extend([None] * len(items_list))
+        # 提取结果的键 -> 列数组（提取结果用“笔记ID”，输出列为“笔记id”）
+        sinks = {**columns, "笔记ID": columns["笔记id"]}
+        # 提取每个笔记的数据
+        for item_idx, item in enumerate(items_list):
+            self._emit_log("\n🔍 处理第 %s 页第 %s 条数据", page_idx, lambda: item_idx + 1)
+            try:
+                extracted_data = self.extract_note_data(item, note_type)
+                if extracted_data:
+                    i = row + page_data
+                    for k, v in extracted_data.items():
+                        sinks[k][i] = v
+                    page_data += 1
+                    self._emit_log("✅ 第 %s 页第 %s 条数据提取成功", page_idx, lambda: item_idx + 1)
                 else:
-                    # API业务错误，记录详细信息但仍然添加到结果列表
-                    error_msg = response_data.get("message") or response_data.get("msg", "未知错误")
-                    self._emit_log(f"⚠️ 第 {page} 页API业务错误: {error_msg} (业务码: {api_code})")
-                    self._emit_log(f"⚠️ 响应结构: {list(response_data.keys()) if isinstance(response_data, dict) else 'Not a dict'}")
-                    
-                    # 保存错误响应到结果列表，以便在build_output中检测和处理
-                    all_data.append(response_data)
-                    
-                    # 在日志中记录完整响应以便调试
-                    self._emit_log(f"⚠️ 完整响应: {json.dumps(response_data, ensure_ascii=False)}")
-            else:
-                # HTTP错误
-                self._emit_log(f"❌ 第 {page} 页请求失败: {status} {reason}")
-                # 保存错误信息，便于后续批量处理
-                all_data.append({
-                    "error": {
-                        "http_status": status,
-                        "reason": reason,
-                        "page": page
-                    }
-                })
-            
-            # 页面间延迟
-            if page < end_page:
-                self._emit_log(f"⏱️ 等待1秒...")
-                time.sleep(1)
-            
-            bydev += 1
-        
-        self._emit_log(f"🚀 数据获取完成，共处理 {len(all_data)} 页数据")
-        return all_data
+                    self._emit_log("⚠️ 第 %s 页第 %s 条数据跳过", page_idx, lambda: item_idx + 1, level="WARNING")
+            except Exception as e:
+                self._emit_log("❌ 第 %s 页第 %s 条数据提取失败: %s", page_idx, lambda: item_idx + 1, e, level="ERROR")
+                import traceback
+                self._emit_log("❌ 错误详情: %s", lambda: traceback.format_exc(), level="ERROR")
+        for col in columns.values():
+            del col[row + page_data:]
+        return page_data
 
-    def extract_all_data(self, response_data_list: List[Dict[str, Any]], note_type: int = 0) -> List[Dict[str, Any]]:
-        """从所有响应数据中提取笔记数据
+    def extract_all_data(self, response_data_list: List[Dict[str, Any]], note_type: int = 0) -> Dict[str, List[Any]]:
+        """从所有响应数据中提取笔记数据（列数组）
         Args:
             response_data_list: 响应数据列表
             note_type: 搜索的笔记类型 (0=全部, 1=图文, 2=视频)
         """
-        self._emit_log(f"🔄 开始提取所有数据，共 {len(response_data_list)} 页，搜索类型: {note_type}")
-        
-        all_extracted_data = []
-        
+        self._emit_log("🔄 开始提取所有数据，共 %s 页，搜索类型: %s", lambda: len(response_data_list), note_type)
+        columns = self.new_columns()
         for page_idx, response_data in enumerate(response_data_list, 1):
-            self._emit_log(f"\n📄 处理第 {page_idx} 页数据...")
-            self._emit_log(f"📄 响应数据类型: {type(response_data)}")
-            
-            # 检查是否为错误响应
-            if "error" in response_data:
-                error_info = response_data["error"]
-                self._emit_log(f"⚠️ 第 {page_idx} 页包含错误信息: HTTP {error_info.get('http_status', '未知')} - {error_info.get('reason', '未知原因')}")
-                # 跳过错误页面的数据处理
-                continue
-            
-            # 检查响应数据结构
-            if not isinstance(response_data, dict):
-                self._emit_log(f"❌ 第 {page_idx} 页数据格式错误，不是字典类型")
-                continue
-            
-            self._emit_log(f"📄 响应数据键: {list(response_data.keys())}")
-            
-            # 获取data字段
-            data_field = response_data.get("data", {})
-            self._emit_log(f"📄 data字段类型: {type(data_field)}")
-            
-            if not isinstance(data_field, dict):
-                self._emit_log(f"❌ 第 {page_idx} 页data字段不是字典类型: {type(data_field)}")
-                continue
-            
-            self._emit_log(f"📄 data字典键: {list(data_field.keys())}")
-            
-            # 获取items列表 - 这是关键修正！
-            items_list = data_field.get("items", [])
-            self._emit_log(f"📄 items字段类型: {type(items_list)}")
-            
-            if not items_list:
-                self._emit_log(f"❌ 第 {page_idx} 页没有items字段或items为空")
-                # 打印完整的data字段以便调试
-                self._emit_log(f"📄 完整data字段: {json.dumps(data_field, ensure_ascii=False, indent=2)}")
-                continue
-            
-            if not isinstance(items_list, list):
-                self._emit_log(f"❌ 第 {page_idx} 页items字段不是列表类型: {type(items_list)}")
-                continue
-                
-            self._emit_log(f"📄 items列表长度: {len(items_list)}")
-            
-            # 提取每个笔记的数据
-            for item_idx, item in enumerate(items_list):
-                self._emit_log(f"\n🔍 处理第 {page_idx} 页第 {item_idx + 1} 条数据")
-                try:
-                    extracted_data = self.extract_note_data(item, note_type)
-                    if extracted_data:
-                        all_extracted_data.append(extracted_data)
-                        self._emit_log(f"✅ 第 {page_idx} 页第 {item_idx + 1} 条数据提取成功")
-                    else:
-                        self._emit_log(f"⚠️ 第 {page_idx} 页第 {item_idx + 1} 条数据跳过")
-                except Exception as e:
-                    self._emit_log(f"❌ 第 {page_idx} 页第 {item_idx + 1} 条数据提取失败: {e}")
-                    import traceback
-                    self._emit_log(f"❌ 错误详情: {traceback.format_exc()}")
-        
-        self._emit_log(f"🔄 数据提取完成，共提取 {len(all_extracted_data)} 条有效数据")
-        return all_extracted_data
+            self.extract_page_data(page_idx, response_data, columns, note_type)
+        self._emit_log("🔄 数据提取完成，共提取 %s 条有效数据", lambda: len(columns["笔记id"]))
+        return columns
 
     def create_user_profile_payload(self, userid: str) -> Dict[str, Any]:
         payload = {
@@ -734,37 +1057,188 @@ class XiaohongshuScraper(Component):
             result["作者IP"] = ip
         return result
 
-    def fetch_note_details_for_ids(self, note_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    def _rate_limiter(self) -> _RateLimiter:
+        """本次运行共享的补全请求限速器；build_output 在提交任务前已创建，此处加锁兜底，避免并发首调各建一个"""
+        limiter = getattr(self, "_shared_rate_limiter", None)
+        if limiter is None:
+            with _RATE_LIMITER_INIT_LOCK:
+                limiter = getattr(self, "_shared_rate_limiter", None)
+                if limiter is None:
+                    limiter = self._shared_rate_limiter = _RateLimiter(self.ENRICH_RATE_PER_SEC)
+        return limiter
+
+    def _request_with_retries(self, payload: Dict[str, Any]) -> Tuple[int, str, Dict]:
+        """限速后发送请求，非 2xx（含网络错误）按指数退避重试"""
+        attempts = max(1, int(self.ENRICH_RETRY_ATTEMPTS))
+        status, reason, resp = 0, "未请求", {}
+        for attempt in range(1, attempts + 1):
+            self._rate_limiter().acquire()
+            status, reason, resp = self.send_request(payload)
+            if 200 <= status < 300:
+                break
+            if attempt < attempts:
+                time.sleep(self.ENRICH_RETRY_BACKOFF_SECONDS * (2 ** (attempt - 1)))
+        return status, reason, resp
+
+    def _open_detail_cache(self) -> sqlite3.Connection:
+        path = os.path.expanduser((getattr(self, "detail_cache_path", "") or "").strip() or self.DETAIL_CACHE_PATH)
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        conn = sqlite3.connect(path)
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS detail_cache (
+                kind TEXT NOT NULL,
+                item_id TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                fetched_at INTEGER NOT NULL,
+                last_used INTEGER NOT NULL,
+                PRIMARY KEY (kind, item_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_detail_cache_lru ON detail_cache (kind, last_used);
+            """
+        )
+        return conn
+
+    def _load_cached_details(self, conn: sqlite3.Connection, kind: str, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """读取未过期的缓存条目；过期条目顺带删除"""
+        now = int(time.time())
+        ttl = int(self.DETAIL_CACHE_TTL_SECONDS.get(kind, 0))
+        conn.execute("DELETE FROM detail_cache WHERE kind = ? AND fetched_at < ?", (kind, now - ttl))
+        hits: Dict[str, Dict[str, Any]] = {}
+        # SQLite 单条语句的参数个数有限，分批查询
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT item_id, payload FROM detail_cache WHERE kind = ? AND item_id IN ({marks})",
+                [kind, *chunk],
+            ).fetchall()
+            for item_id, payload in rows:
+                try:
+                    hits[item_id] = json.loads(payload)
+                except ValueError:
+                    continue
+        if hits:
+            conn.executemany(
+                "UPDATE detail_cache SET last_used = ? WHERE kind = ? AND item_id = ?",
+                [(now, kind, item_id) for item_id in hits],
+            )
+        conn.commit()
+        return hits
+
+    def _save_cached_details(self, conn: sqlite3.Connection, kind: str, fetched: Dict[str, Dict[str, Any]]) -> None:
+        """写入本次新拉取的详情，并按最近使用时间淘汰超出上限的条目"""
+        now = int(time.time())
+        conn.executemany(
+            "INSERT OR REPLACE INTO detail_cache (kind, item_id, payload, fetched_at, last_used) VALUES (?, ?, ?, ?, ?)",
+            [(kind, item_id, json.dumps(parsed, ensure_ascii=False), now, now) for item_id, parsed in fetched.items()],
+        )
+        conn.execute(
+            "DELETE FROM detail_cache WHERE kind = ? AND item_id IN ("
+            " SELECT item_id FROM detail_cache WHERE kind = ? ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (kind, kind, max(0, int(self.DETAIL_CACHE_MAX_ENTRIES))),
+        )
+        conn.commit()
+
+    def _enrich_concurrently(
+        self,
+        label: str,
+        ids: List[str],
+        make_payload: Callable[[str], Dict[str, Any]],
+        parse: Callable[[Dict[str, Any], str], Optional[Dict[str, Any]]],
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        按ID去重后有界并发拉取详情，结果随完成顺序写入映射。
+        失败（重试后仍非 2xx 或异常）与空结果分别计数，记录到 self._enrich_stats[label]。
+        开启 use_detail_cache 时先查本地缓存（按 label 区分类别），只请求未命中的ID。
+        """
         details_map: Dict[str, Dict[str, Any]] = {}
-        unique_ids = []
-        seen = set()
-        for nid in note_ids:
-            if nid and nid not in seen:
-                seen.add(nid)
-                unique_ids.append(nid)
-        for nid in unique_ids:
+        unique_ids = list(dict.fromkeys(i for i in ids if i))
+        stat: Dict[str, Any] = {"总数": len(unique_ids), "成功": 0, "无数据": 0, "失败": 0, "失败ID": []}
+        if not hasattr(self, "_enrich_stats"):
+            self._enrich_stats = {}
+        self._enrich_stats[label] = stat
+        if not unique_ids:
+            return details_map
+
+        cache = None
+        if bool(getattr(self, "use_detail_cache", False)):
             try:
-                payload = self.create_note_detail_payload(nid)
-                status, reason, resp = self.send_request(payload)
-                if 200 <= status < 300 and isinstance(resp, dict):
-                    parsed = self.parse_note_detail_data(resp, nid)
-                    if parsed:
-                        details_map[nid] = parsed
+                cache = self._open_detail_cache()
+                details_map.update(self._load_cached_details(cache, label, unique_ids))
+            except sqlite3.Error as e:
+                self._emit_log("⚠️ %s缓存不可用: %s", label, e, level="WARNING")
+                cache = None
+            stat["缓存命中"] = len(details_map)
+            stat["缓存命中率"] = round(len(details_map) / len(unique_ids), 4)
+            unique_ids = [i for i in unique_ids if i not in details_map]
+        fetched: Dict[str, Dict[str, Any]] = {}
+        try:
+            fetched = self._fetch_details(label, unique_ids, make_payload, parse, stat)
+        finally:
+            if cache is not None:
+                try:
+                    self._save_cached_details(cache, label, fetched)
+                except sqlite3.Error as e:
+                    self._emit_log("⚠️ %s缓存写入失败: %s", label, e, level="WARNING")
+                cache.close()
+        details_map.update(fetched)
+        return details_map
+
+    def _fetch_details(
+        self,
+        label: str,
+        unique_ids: List[str],
+        make_payload: Callable[[str], Dict[str, Any]],
+        parse: Callable[[Dict[str, Any], str], Optional[Dict[str, Any]]],
+        stat: Dict[str, Any],
+    ) -> Dict[str, Dict[str, Any]]:
+        details_map: Dict[str, Dict[str, Any]] = {}
+        if not unique_ids:
+            return details_map
+
+        def fetch_one(item_id: str) -> Tuple[int, str, Optional[Dict[str, Any]]]:
+            status, reason, resp = self._request_with_retries(make_payload(item_id))
+            if not (200 <= status < 300 and isinstance(resp, dict)):
+                return status, reason, None
+            return status, reason, parse(resp, item_id) or {}
+
+        workers = max(1, min(int(self.ENRICH_CONCURRENCY), len(unique_ids)))
+        # 提交任务前在当前线程取得共享限速器，工作线程不再触发创建
+        self._rate_limiter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(fetch_one, item_id): item_id for item_id in unique_ids}
+            for fut in as_completed(futures):
+                item_id = futures[fut]
+                try:
+                    status, reason, parsed = fut.result()
+                except Exception as e:
+                    status, reason, parsed = 0, f"异常: {e}", None
+                if parsed is None:
+                    stat["失败"] += 1
+                    stat["失败ID"].append(item_id)
+                    self._emit_log("⚠️ %s失败: %s %s %s", label, item_id, status, reason, level="WARNING")
+                elif parsed:
+                    details_map[item_id] = parsed
+                    stat["成功"] += 1
                 else:
-                    pass
-            except Exception:
-                pass
+                    stat["无数据"] += 1
+                    self._emit_log("⚠️ %s解析为空: %s", label, item_id, level="WARNING")
         return details_map
 
-    def augment_notes_with_note_details(self, notes: List[Dict[str, Any]], details_map: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
-        for item in notes:
-            nid = item.get("笔记id") or item.get("笔记ID")
+    def fetch_note_details_for_ids(self, note_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        return self._enrich_concurrently("笔记详情", note_ids, self.create_note_detail_payload, self.parse_note_detail_data)
+
+    def augment_notes_with_note_details(self, columns: Dict[str, List[Any]], details_map: Dict[str, Dict[str, Any]]) -> Dict[str, List[Any]]:
+        for i, nid in enumerate(columns["笔记id"]):
             if nid and nid in details_map:
-                item.update(details_map[nid])
+                self._write_detail(columns, i, details_map[nid])
                 dt_tags = details_map[nid].get("笔记关联话题")
                 if isinstance(dt_tags, str) and dt_tags:
-                    item["笔记tag"] = dt_tags
-        return notes
+                    columns["笔记tag"][i] = dt_tags
+        return columns
 
     def parse_user_profile_data(self, user_data: Dict[str, Any], userid: str) -> Dict[str, Any]:
         data = user_data or {}
@@ -819,49 +1293,102 @@ class XiaohongshuScraper(Component):
         }
         return result
 
+    def _parse_user_profile_response(self, resp: Dict[str, Any], userid: str) -> Optional[Dict[str, Any]]:
+        data_field = resp.get("data")
+        target = data_field if isinstance(data_field, dict) else resp
+        if not isinstance(target, dict):
+            return None
+        return self.parse_user_profile_data(target, userid)
+
     def fetch_user_details_for_ids(self, user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
-        details_map: Dict[str, Dict[str, Any]] = {}
-        unique_ids = []
-        seen = set()
-        for uid in user_ids:
-            if uid and uid not in seen:
-                seen.add(uid)
-                unique_ids.append(uid)
-        for uid in unique_ids:
-            try:
-                payload = self.create_user_profile_payload(uid)
-                status, reason, resp = self.send_request(payload)
-                if 200 <= status < 300 and isinstance(resp, dict):
-                    data_field = resp.get("data")
-                    target = data_field if isinstance(data_field, dict) else resp
-                    if isinstance(target, dict):
-                        parsed = self.parse_user_profile_data(target, uid)
-                        if parsed:
-                            details_map[uid] = parsed
-                        else:
-                            self._emit_log(f"⚠️ 用户详情解析为空: {uid}")
-                    else:
-                        self._emit_log(f"⚠️ 用户详情数据格式错误: {uid}")
-                else:
-                    self._emit_log(f"⚠️ 用户详情HTTP失败: {uid} {status} {reason}")
-            except Exception as e:
-                self._emit_log(f"❌ 获取用户详情异常: {uid} {e}")
-        return details_map
+        return self._enrich_concurrently("用户详情", user_ids, self.create_user_profile_payload, self._parse_user_profile_response)
 
-    def augment_notes_with_user_details(self, notes: List[Dict[str, Any]], details_map: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
-        for item in notes:
-            uid = item.get("作者ID")
+    def augment_notes_with_user_details(self, columns: Dict[str, List[Any]], details_map: Dict[str, Dict[str, Any]]) -> Dict[str, List[Any]]:
+        for i, uid in enumerate(columns["作者ID"]):
             if uid and uid in details_map:
-                item.update(details_map[uid])
-        return notes
+                self._write_detail(columns, i, details_map[uid])
+        return columns
+
+    @staticmethod
+    def _write_detail(columns: Dict[str, List[Any]], row: int, detail: Dict[str, Any]) -> None:
+        """详情字段写入第 row 行（不在输出列中的字段忽略）"""
+        for k, v in detail.items():
+            col = columns.get(k)
+            if col is not None:
+                col[row] = v
+
+    def fill_defaults(self, columns: Dict[str, List[Any]]) -> Dict[str, List[Any]]:
+        """缺失的用户详情等字段补默认值"""
+        for k, default in self.FIELD_DEFAULTS.items():
+            columns[k] = [default if v is None else v for v in columns[k]]
+        return columns
+
+    def rows_from_columns(self, columns: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+        """列数组还原为按字段顺序排列的行字典（Data 输出格式）"""
+        fields = list(columns)
+        return [dict(zip(fields, values)) for values in zip(*columns.values())]
+
+    def columns_to_dataframe(self, columns: Dict[str, List[Any]]) -> "DataFrame":
+        """由列数组一次构建 DataFrame，低基数字段转为分类类型"""
+        from langflow.schema.dataframe import DataFrame
+
+        df = DataFrame(columns, columns=list(columns))
+        for k in self.CATEGORICAL_FIELDS:
+            if k in df.columns:
+                df[k] = df[k].astype("category")
+        return df
+
+    def _run_key(self) -> Tuple[Any, ...]:
+        return (self.keyword, self.start_page, self.end_page, self.sort_type, self.note_type,
+                self.get_user_details, self.fetch_note_detail,
+                getattr(self, "use_detail_cache", False), getattr(self, "detail_cache_path", ""))
+
+    def _run_once(self) -> Tuple[Data, Optional[Dict[str, List[Any]]]]:
+        """
+        两个输出共用的入口：同一组输入只爬取一次，返回 (Data 结果, 列数组)。
+        无论 LangFlow 先调用 build_output 还是 build_dataframe，另一个输出都复用这次结果；失败时列数组为 None。
+        """
+        key = self._run_key()
+        cached = getattr(self, "_run_cache", None)
+        if cached is None or cached[0] != key:
+            result = self._crawl()
+            cached = (key, result, self._last_columns)
+            self._run_cache = cached
+        return cached[1], cached[2]
+
+    def build_dataframe(self) -> "DataFrame":
+        """表格输出：与 build_output 共用同一次爬取的列数组"""
+        from langflow.schema.dataframe import DataFrame
+
+        result, columns = self._run_once()
+        if columns is None:
+            data = getattr(result, "data", None) or {}
+            value = data.get("value", data) if isinstance(data, dict) else {}
+            return DataFrame([{k: value.get(k) for k in ("status", "message", "total_items")}])
+        return self.columns_to_dataframe(columns)
 
     def build_output(self) -> Data:
         """
-        LangFlow调用该组件时执行的核心方法
+        LangFlow调用该组件时执行的核心方法（与 build_dataframe 共用同一次爬取）；
+        结果行在首次需要 Data 输出时才由列数组生成
         """
-        self._debug_logs = []
+        result, columns = self._run_once()
+        value = result.data.get("value")
+        if columns is not None and isinstance(value, dict) and value.get("data") is None:
+            value["data"] = self.rows_from_columns(columns)
+        return result
+
+    def _crawl(self) -> Data:
+        """执行一次完整爬取；列数组写入 self._last_columns 供表格输出使用"""
+        self._debug_logs = deque(maxlen=max(1, int(self.DEBUG_LOG_MAX_LINES)))
+        self._enrich_stats = {}
+        self._param_stats = {"已避免回退请求": 0, "回退请求": 0}
+        # 限速器在调用线程中创建一次，之后所有补全工作线程共用
+        self._shared_rate_limiter = _RateLimiter(self.ENRICH_RATE_PER_SEC)
+        self._last_columns = None
+        self._http_stats = _HttpStats()
         self.status = "开始执行小红书爬虫组件"
-        self._emit_log("🎯 开始执行小红书爬虫组件")
+        self._emit_log("🎯 开始执行小红书爬虫组件", level="INFO")
         
         try:
             # 获取输入参数
@@ -879,12 +1406,12 @@ class XiaohongshuScraper(Component):
             # 验证页数范围
             if start_page > end_page:
                 error_msg = f"输入参数不合格: 开始页数({start_page})不能大于结束页数({end_page})"
-                self._emit_log(f"❌ {error_msg}")
+                self._emit_log("❌ %s", error_msg, level="ERROR")
                 return Data(value={
                     "status": "error",
                     "message": error_msg,
                     "total_items": 0,
-                    "logs": self._debug_logs
+                    "logs": list(self._debug_logs)
                 })
             
             # 精简日志输出，详细日志只在工作流日志面板显示
@@ -902,7 +1429,13 @@ class XiaohongshuScraper(Component):
             self.log(f"🎯 笔记类型转换: {note_type_str} -> {note_type}")
             
             # 获取数据
-            response_data_list = self.fetch_data(keyword, start_page, end_page, sort_type, note_type)
+            # 获取并提取数据：已返回的页立即提取，与后续页的网络等待重叠
+            response_data_list = []
+            columns = self.new_columns()
+            for page_idx, (_, response_data) in enumerate(self.iter_pages(keyword, start_page, end_page, sort_type, note_type), 1):
+                response_data_list.append(response_data)
+                self.extract_page_data(page_idx, response_data, columns, note_type)
+            total = len(columns["笔记id"])
             
             # 检查是否有API错误响应
             api_errors = []
@@ -915,8 +1448,7 @@ class XiaohongshuScraper(Component):
                         "msg": error_msg,
                         "status_code": error_code
                     })
-                    self._emit_log(f"❌ API错误: {error_msg} (状态码: {error_code})")
-            
+                    self._emit_log("❌ API错误: %s (状态码: %s)", error_msg, error_code, level="ERROR")
             # 如果所有响应都是错误，直接返回错误信息
             if len(api_errors) == len(response_data_list) and api_errors:
                 # 如果所有页面都返回错误，返回第一个错误信息
@@ -940,10 +1472,7 @@ class XiaohongshuScraper(Component):
                     # 移除logs字段，日志只在工作流日志面板显示
                 })
             
-            # 提取数据
-            extracted_data = self.extract_all_data(response_data_list, note_type)
-            
-            if not extracted_data:
+            if not total:
                 error_msg = "没有提取到有效数据"
                 self.log(f"❌ {error_msg}")
                 
@@ -994,59 +1523,27 @@ class XiaohongshuScraper(Component):
             
             # 如果有部分API错误，在结果中包含错误信息
             if api_errors:
-                self._emit_log(f"⚠️ 共有 {len(api_errors)} 个API错误，但仍有部分数据成功提取")
-            
+                self._emit_log("⚠️ 共有 %s 个API错误，但仍有部分数据成功提取", lambda: len(api_errors), level="WARNING")
             if get_user_details:
                 try:
-                    user_ids = [d.get("作者ID") for d in extracted_data]
-                    details_map = self.fetch_user_details_for_ids(user_ids)
-                    extracted_data = self.augment_notes_with_user_details(extracted_data, details_map)
+                    details_map = self.fetch_user_details_for_ids(list(columns["作者ID"]))
+                    self.augment_notes_with_user_details(columns, details_map)
                 except Exception as e:
-                    self._emit_log(f"⚠️ 合并用户详情失败: {e}")
+                    self._emit_log("⚠️ 合并用户详情失败: %s", e, level="WARNING")
             if fetch_note_detail:
                 try:
-                    note_ids = [d.get("笔记ID") or d.get("笔记id") for d in extracted_data]
-                    note_ids = [nid for nid in note_ids if nid]
+                    note_ids = [nid for nid in columns["笔记id"] if nid]
                     nd_map = self.fetch_note_details_for_ids(note_ids)
-                    extracted_data = self.augment_notes_with_note_details(extracted_data, nd_map)
+                    self.augment_notes_with_note_details(columns, nd_map)
                 except Exception as e:
-                    self._emit_log(f"⚠️ 合并笔记详情失败: {e}")
-            field_order = [
-                # 搜索结果字段
-                "笔记id","标题","笔记类型","发布时间","笔记链接",
-                "封面图链接","视频链接","所有图片链接","图片数量","笔记正文","笔记tag",
-                "点赞数","评论数","收藏数","好看数","分享数",
-                # 用户详情字段
-                "作者ID","作者昵称","小红书号","是否官方认证",
-                "作者粉丝数","作者获赞与收藏数","作者简介","作者主页链接",
-                # 笔记详情字段
-                "笔记完整正文","笔记关联话题","作者IP",
-            ]
-            pruned = []
-            for d in extracted_data:
-                d["笔记id"] = d.get("笔记ID")
-                # 设置默认值
-                for k, v in {
-                    "作者粉丝数": 0, 
-                    "作者获赞与收藏数": 0, 
-                    "作者简介": "", 
-                    "作者主页链接": "",
-                    "所有图片链接": [],
-                    "图片数量": 0
-                }.items():
-                    if d.get(k) is None:
-                        d[k] = v
-                out = {}
-                for k in field_order:
-                    out[k] = d.get(k)
-                pruned.append(out)
-            extracted_data = pruned
-            # 构建结果 - 精简输出，移除详细日志
+                    self._emit_log("⚠️ 合并笔记详情失败: %s", e, level="WARNING")
+            self._last_columns = self.fill_defaults(columns)
+            # 构建结果 - 精简输出，移除详细日志；data 行由 build_output 按需从列数组生成
             result = {
                 "status": "success",
-                "message": f"成功爬取 {len(extracted_data)} 条数据",
-                "total_items": len(extracted_data),
-                "data": extracted_data,
+                "message": f"成功爬取 {total} 条数据",
+                "total_items": total,
+                "data": None,
                 "config": {
                     "keyword": keyword,
                     "start_page": start_page,
@@ -1055,12 +1552,17 @@ class XiaohongshuScraper(Component):
                     "note_type": note_type_str,
                     "get_user_details": get_user_details
                     # "download_images": download_images
-                }
+                },
+                "stats": {
+                    "http": self.connection_reuse_stats(),
+                    "enrich": self._enrich_stats,
+                    "param_encoding": self._param_stats,
+                },
                 # 移除logs字段，日志只在工作流日志面板显示
             }
             
-            self.status = f"爬取完成，共 {len(extracted_data)} 条数据"
-            self.log(f"✅ 爬取完成！共获取 {len(extracted_data)} 条数据")
+            self.status = f"爬取完成，共 {total} 条数据"
+            self.log(f"✅ 爬取完成！共获取 {total} 条数据")
             
             return Data(value=result)
             
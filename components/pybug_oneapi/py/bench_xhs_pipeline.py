@@ -0,0 +1,271 @@
+import sys
+import os
+import glob
+import json
+import time
+import tracemalloc
+from datetime import datetime
+
+# 将组件目录加入模块搜索路径
+sys.path.append(os.path.dirname(__file__))
+
+from xhs_unified_structured_output import XHSUnifiedStructuredOutputComponent
+
+REALDATA_DIR = os.path.join(os.path.dirname(__file__), "..", "apitest", "realdata2.0")
+
+
+def _best_of(fn, rounds: int = 5) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench_json_loader() -> None:
+    """容错 JSON 加载：分层加载总耗时与逐字符转义扫描一遍（旧版每次解析前都要执行）的耗时对比"""
+    comp = XHSUnifiedStructuredOutputComponent
+    for path in sorted(glob.glob(os.path.join(REALDATA_DIR, "*.json"))):
+        with open(path, encoding="utf-8") as f:
+            raw = f.read()
+        if not raw.strip():
+            continue
+        # 同一份数据的“字符串内含原始换行”版本（上游拼接文本时常见），走 strict=False 层
+        raw_nl = raw.replace("\\n", "\n")
+        for label, text in (("合法", raw), ("含原始换行", raw_nl)):
+            tiered = _best_of(lambda: comp._safe_json_loads_from_string(text))
+            scan_only = _best_of(lambda: comp._escape_ctrl_in_strings(text))
+            print(f"[JSON加载] {os.path.basename(path)} ({len(text) / 1024:.0f} KB, {label}): "
+                  f"分层加载 {tiered * 1000:.1f} ms  仅逐字符转义一遍 {scan_only * 1000:.1f} ms")
+
+
+def _synthetic_search_doc(pages: int) -> str:
+    """以 realdata2.0/search.json 的单页为模板，拼出 pages 页的大体量搜索结果字符串"""
+    with open(os.path.join(REALDATA_DIR, "search.json"), encoding="utf-8") as f:
+        doc = json.load(f)
+    page = doc["数据"][0]
+    doc["数据"] = [dict(page, 页码=i + 1) for i in range(pages)]
+    return json.dumps(doc, ensure_ascii=False)
+
+
+def bench_stream_parse(page_counts=(10, 50, 200)) -> None:
+    """流式解析：输入体量增长时，完整解析与流式解析的耗时与峰值内存（不含输入字符串本身）"""
+    for pages in page_counts:
+        text = _synthetic_search_doc(pages)
+        for label, threshold in (("完整解析", len(text) + 1), ("流式解析", 0)):
+            comp = XHSUnifiedStructuredOutputComponent()
+            comp.input_data = None
+            comp.input_json = text
+            comp.STREAM_PARSE_MIN_CHARS = threshold
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            out = comp._structured_records()
+            elapsed = time.perf_counter() - t0
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"[流式解析] {pages} 页 / {len(text) / 1024 / 1024:.1f} MB {label}: {len(out)} 条  "
+                  f"耗时 {elapsed * 1000:.0f} ms  峰值内存 {peak / 1024 / 1024:.1f} MiB")
+
+
+def bench_sniff_and_fast_fail() -> None:
+    """前缀嗅探与非 JSON 快速失败：与完整容错解析的耗时对比"""
+    comp = XHSUnifiedStructuredOutputComponent()
+    inputs = [("非JSON报错文本", "接口返回错误：token 无效，请检查后重试。" * 20000)]
+    for name in ("comments.json", "search.json", "user2.json"):
+        with open(os.path.join(REALDATA_DIR, name), encoding="utf-8") as f:
+            inputs.append((name, f.read()))
+    for label, text in inputs:
+        sniff = _best_of(lambda: comp._sniff_top_fields(text))
+        full = _best_of(lambda: XHSUnifiedStructuredOutputComponent._safe_json_loads_from_string(text))
+        fields = comp._sniff_top_fields(text)
+        mode = "非JSON" if fields is None else fields.get("模式", "")
+        print(f"[前缀嗅探] {label} ({len(text) / 1024:.0f} KB) 模式={mode}: "
+              f"嗅探 {sniff * 1000:.3f} ms  完整容错解析 {full * 1000:.1f} ms")
+
+
+def _synthetic_comment_doc(min_comments: int) -> dict:
+    """以 realdata2.0/comments.json 为模板，重复其数据集直到评论总数不少于 min_comments"""
+    with open(os.path.join(REALDATA_DIR, "comments.json"), encoding="utf-8") as f:
+        doc = json.load(f)
+    comp = XHSUnifiedStructuredOutputComponent()
+    comp.input_data = None
+    comp.input_json = doc
+    per_copy = max(1, len(comp._structured_records()))
+    doc["数据"] = doc["数据"] * max(1, (min_comments + per_copy - 1) // per_copy)
+    return doc
+
+
+def bench_dataframe_build(min_comments: int = 10_000) -> None:
+    """评论导出：逐行字典构建 DataFrame 与按列（带类型）构建的耗时与峰值内存对比"""
+    from xhs_unified_structured_output import _rows_from_columns, _typed_column_arrays
+    from langflow.schema.dataframe import DataFrame
+
+    doc = _synthetic_comment_doc(min_comments)
+    comp = XHSUnifiedStructuredOutputComponent()
+    comp.input_data = None
+    comp.input_json = doc
+    t0 = time.perf_counter()
+    specs_name, columns = comp._structured_columns()
+    map_elapsed = time.perf_counter() - t0
+    specs = getattr(comp, specs_name)
+    n = len(columns["评论内容"])
+
+    def by_rows():
+        return DataFrame(_rows_from_columns(columns))
+
+    def by_columns():
+        return DataFrame(_typed_column_arrays(specs, columns, comp.DATETIME_FIELDS))
+
+    print(f"[DataFrame构建] {n} 条评论，解析+按列映射 {map_elapsed * 1000:.0f} ms")
+    for label, build in (("逐行字典", by_rows), ("按列带类型", by_columns)):
+        elapsed = _best_of(build)
+        tracemalloc.start()
+        df = build()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        mem = df.memory_usage(deep=True).sum()
+        print(f"  {label}: 耗时 {elapsed * 1000:.1f} ms  构建峰值内存 {peak / 1024 / 1024:.1f} MiB  "
+              f"结果占用 {mem / 1024 / 1024:.1f} MiB")
+
+
+def _format_ts_per_item(value) -> str:
+    """对照：整列工具引入前逐条判定秒 / 毫秒并格式化的写法"""
+    ts = XHSUnifiedStructuredOutputComponent._as_int(value)
+    if ts <= 0:
+        return ""
+    if ts > 10**11:
+        ts = ts // 1000
+    dt = datetime.fromtimestamp(ts)
+    return f"{dt.year}年{dt.month:02d}月{dt.day:02d}日 {dt.hour:02d}时{dt.minute:02d}分{dt.second:02d}秒"
+
+
+def bench_timestamp_format(pages: int = 200) -> None:
+    """搜索模式发布时间：逐条格式化与整列归一化 + LRU 格式化的耗时对比"""
+    from xhs_unified_structured_output import _format_ts_column, _format_ts_seconds
+
+    comp = XHSUnifiedStructuredOutputComponent()
+    comp.input_data = None
+    comp.input_json = _synthetic_search_doc(pages)
+    _, columns = comp._structured_columns()
+    # 真实分页复制出的列（同一时刻大量重复）与逐条不同的毫秒时间戳列
+    for label, ints in (("搜索结果", columns["发布时间"]), ("全部不同时刻", [1730000000000 + i * 1000 for i in range(len(columns["发布时间"]))])):
+        per_item = _best_of(lambda: [_format_ts_per_item(v) for v in ints])
+        _format_ts_seconds.cache_clear()
+        t0 = time.perf_counter()
+        _format_ts_column(ints)
+        cold = time.perf_counter() - t0
+        warm = _best_of(lambda: _format_ts_column(ints))
+        print(f"[时间格式化] {label} {len(ints)} 条（{len(set(ints))} 个不同时刻）: 逐条 {per_item * 1000:.1f} ms  "
+              f"整列首次 {cold * 1000:.1f} ms  整列再次 {warm * 1000:.1f} ms")
+
+    # 不同列长下逐条换算与 NumPy 整列换算的对比（_TS_NUMPY_MIN_ROWS 以下走逐条换算）
+    import xhs_unified_structured_output as unified
+
+    threshold = unified._TS_NUMPY_MIN_ROWS
+    for size in (20, 100, threshold, 1000, 5000):
+        ints = [1730000000000 + i * 1000 for i in range(size)]
+        times = {}
+        for label, min_rows in (("逐条", size + 1), ("NumPy", 0)):
+            unified._TS_NUMPY_MIN_ROWS = min_rows
+            times[label] = _best_of(lambda: (unified._ts_seconds_list(ints), unified._ts_to_datetime64(ints)))
+        unified._TS_NUMPY_MIN_ROWS = threshold
+        print(f"[时间换算] {size} 条: 逐条 {times['逐条'] * 1e6:.0f} us  NumPy {times['NumPy'] * 1e6:.0f} us")
+
+
+def _fixture_descs() -> list:
+    """realdata2.0 与 final 中全部笔记正文"""
+    descs = []
+
+    def walk(obj):
+        if isinstance(obj, dict):
+            for k, v in obj.items():
+                if k == "desc" and isinstance(v, str):
+                    descs.append(v)
+                else:
+                    walk(v)
+        elif isinstance(obj, list):
+            for v in obj:
+                walk(v)
+
+    for path in sorted(glob.glob(os.path.join(REALDATA_DIR, "..", "*", "*.json"))):
+        with open(path, encoding="utf-8") as f:
+            raw = f.read()
+        if raw.strip():
+            walk(json.loads(raw))
+    return descs
+
+
+def bench_hashtag_extract(min_texts: int = 50_000) -> None:
+    """话题提取：各组件原先逐次调用 re.findall 的写法与共用预编译提取器（同一标签格式）的耗时对比"""
+    import re
+    from xhs_unified_structured_output import _extract_hashtags
+
+    descs = _fixture_descs()
+    texts = descs * max(1, (min_texts + len(descs) - 1) // len(descs))
+
+    def legacy_structured():
+        return [[m.strip() for m in re.findall(r"#([^#\n\r]+)", t) if m.strip()] for t in texts]
+
+    def legacy_rednote():
+        return [[m.strip() for m in re.findall(r"#([^#]+)#", t) if m.strip()] for t in texts]
+
+    def legacy_trycode():
+        return [list(dict.fromkeys(re.findall(r"(?:^|\s)#([\w\-\u4e00-\u9fa5]+)", t.replace("＃", "#")))) for t in texts]
+
+    print(f"[话题提取] {len(texts)} 段正文（含 # 的 {sum('#' in t for t in texts)} 段）")
+    for label, legacy, style in (
+        ("结构化输出", legacy_structured, "正文"),
+        ("RedNote", legacy_rednote, "成对"),
+        ("爬虫", legacy_trycode, "名称"),
+    ):
+        shared = _best_of(lambda: [_extract_hashtags(t, style) for t in texts])
+        print(f"  {label}: 原写法 {_best_of(legacy) * 1000:.1f} ms，共用提取器 {shared * 1000:.1f} ms")
+
+
+def bench_object_handoff(pages: int = 200, min_comments: int = 20_000) -> None:
+    """组件间交接：RedNote -> 过滤器 -> 统一结构化输出两跳，以文本（序列化+解析）交接与以 Data 活对象交接的耗时对比"""
+    from langflow.schema.data import Data
+    from langflow.schema.message import Message
+    from xhs_filter_component import XHSFilterComponent
+
+    def filtered(payload):
+        comp = XHSFilterComponent()
+        comp.input_message = payload
+        return comp._filter_payload()
+
+    def structured(input_data=None, input_json=None):
+        comp = XHSUnifiedStructuredOutputComponent()
+        comp.input_data = input_data
+        comp.input_json = input_json
+        return comp._structured_records()
+
+    for label, doc in (
+        (f"搜索 {pages} 页", json.loads(_synthetic_search_doc(pages))),
+        (f"评论 {min_comments} 条", _synthetic_comment_doc(min_comments)),
+    ):
+        out = filtered(Data(data=doc))
+        size = len(json.dumps(doc, ensure_ascii=False)) / 1024 / 1024
+        hop1_text = _best_of(lambda: filtered(Message(text=json.dumps(doc, ensure_ascii=False))), rounds=3)
+        hop1_obj = _best_of(lambda: filtered(Data(data=doc)), rounds=3)
+        hop2_text = _best_of(lambda: structured(input_json=json.dumps(out, ensure_ascii=False, indent=2)), rounds=3)
+        hop2_obj = _best_of(lambda: structured(input_data=Data(data=out)), rounds=3)
+        print(f"[对象交接] {label}（{size:.1f} MB）")
+        print(f"  RedNote -> 过滤器: 文本 {hop1_text * 1000:.0f} ms  对象 {hop1_obj * 1000:.0f} ms  "
+              f"节省 {(hop1_text - hop1_obj) * 1000:.0f} ms")
+        print(f"  过滤器 -> 结构化输出: 文本 {hop2_text * 1000:.0f} ms  对象 {hop2_obj * 1000:.0f} ms  "
+              f"节省 {(hop2_text - hop2_obj) * 1000:.0f} ms")
+
+
+def main():
+    bench_json_loader()
+    bench_stream_parse()
+    bench_sniff_and_fast_fail()
+    bench_dataframe_build()
+    bench_timestamp_format()
+    bench_hashtag_extract()
+    bench_object_handoff()
+
+
+if __name__ == "__main__":
+    main()
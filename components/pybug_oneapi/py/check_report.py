@@ -0,0 +1,4 @@
+def report(name, same, detail=""):
+    """打印一行 [OK] / [FAIL] 检查结果并返回是否通过，供各测试脚本累计 ok &= report(...)"""
+    print(f"[{'OK' if same else 'FAIL'}] {name}{detail}")
+    return same
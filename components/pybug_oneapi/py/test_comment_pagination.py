@@ -0,0 +1,202 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+
+# 将组件目录加入模块搜索路径
+sys.path.append(os.path.dirname(__file__))
+
+import xiaohongshu_rednote
+from check_report import report
+from xiaohongshu_rednote import XiaohongshuRedNote
+
+PAGE_SIZE = 5
+ROOT_PAGES = 10
+SUB_PAGES = 3
+
+
+def make_api(calls):
+    """合成评论接口：根评论 ROOT_PAGES 页 × PAGE_SIZE 条，偶数位根评论各带 SUB_PAGES 页二级回复；记录每次请求。"""
+    lock = threading.Lock()
+
+    def fake_http_get(path, params):
+        with lock:
+            calls.append((path, params.get("commentId"), params.get("lastCursor")))
+        cur = int(params.get("lastCursor") or 0)
+        if "sub-comment" in path:
+            cid = params["commentId"]
+            items = [{"id": f"{cid}-s{cur}-{i}", "content": "回复", "user": {"nickname": "s"}, "time": 1730000000000} for i in range(2)]
+            return {"code": 0, "data": {"comments": items, "has_more": cur + 1 < SUB_PAGES, "cursor": str(cur + 1)}}
+        if "get-note-comment" in path:
+            items = [
+                {"id": f"c{cur}-{i}", "content": f"评论{cur}-{i}", "user": {"nickname": "n"}, "time": 1730000000000 - cur * 100 - i,
+                 "sub_comment_count": 2 if i % 2 == 0 else 0}
+                for i in range(PAGE_SIZE)
+            ]
+            return {"code": 0, "data": {"user_id": "author", "comments": items, "has_more": cur + 1 < ROOT_PAGES, "cursor": str(cur + 1)}}
+        if "get-user-note-list" in path:
+            items = [{"id": f"n{cur}-{i}", "desc": "正文", "user": {"nickname": "A"}, "timestamp": 1730000000} for i in range(PAGE_SIZE)]
+            return {"code": 0, "data": {"notes": items, "has_more": cur + 1 < ROOT_PAGES, "cursor": str(cur + 1)}}
+        return {"code": 0, "data": {}}
+
+    return fake_http_get
+
+
+def run(**kw):
+    calls = []
+    comp = XiaohongshuRedNote()
+    comp.mode = "按笔记采集评论"
+    comp.environment = "中国区"
+    comp.token = "DUMMY_TOKEN_123456"
+    comp.note_input = "abc123"
+    comp.comment_mode = "默认"
+    comp.REQUEST_PRE_DELAY_MS = 0
+    for k, v in kw.items():
+        setattr(comp, k, v)
+    comp._http_get = make_api(calls)
+    block = comp.build_output().data["数据"][0]
+    return block, calls
+
+
+def _store_closed_after(comp_kwargs, fail_on=None):
+    """以增量模式运行一次（fail_on 路径的请求抛出异常），返回 (是否抛出, 本地状态库连接是否均已关闭)。"""
+    opened = []
+    original = XiaohongshuRedNote._open_local_store
+
+    def tracking_open(self):
+        conn = original(self)
+        opened.append(conn)
+        return conn
+
+    calls = []
+    api = make_api(calls)
+
+    def failing_api(path, params):
+        if fail_on and fail_on in path and params.get("lastCursor"):
+            raise RuntimeError("模拟网络异常")
+        return api(path, params)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        comp = XiaohongshuRedNote()
+        comp.environment = "中国区"
+        comp.token = "DUMMY_TOKEN_123456"
+        comp.REQUEST_PRE_DELAY_MS = 0
+        comp.incremental_sync = True
+        comp.local_store_path = os.path.join(tmp, "state.sqlite3")
+        for k, v in comp_kwargs.items():
+            setattr(comp, k, v)
+        comp._http_get = failing_api
+        XiaohongshuRedNote._open_local_store = tracking_open
+        raised = False
+        try:
+            comp.build_output()
+        except RuntimeError:
+            raised = True
+        finally:
+            XiaohongshuRedNote._open_local_store = original
+        closed = []
+        for conn in opened:
+            try:
+                conn.execute("SELECT 1")
+                closed.append(False)
+            except sqlite3.ProgrammingError:
+                closed.append(True)
+        return raised, all(closed), len(opened), os.path.exists(comp.local_store_path)
+
+
+def main():
+    ok = True
+
+    # 1) 条数上限：达到上限后不再预取下一页；末页截断时续采 cursor 指向被截断的那一页
+    block, calls = run(comment_pages=0, comment_max_count=7, include_sub_comments=False)
+    root_calls = [c for c in calls if "sub-comment" not in c[0]]
+    ids = [c["评论ID"] for c in block["评论"]]
+    ok &= report("条数上限内的评论", ids == [f"c0-{i}" for i in range(5)] + ["c1-0", "c1-1"], f": {len(ids)} 条")
+    ok &= report("达到上限后不多请求一页", len(root_calls) == 2, f": {len(root_calls)} 次请求")
+    cursor = block["请求信息"]["评论"]["params_v2"].get("lastCursor")
+    ok &= report("末页截断时续采 cursor 为该页请求 cursor", cursor == "1", f": {cursor!r}")
+
+    # 上限恰好落在页尾：续采 cursor 为接口返回的下一页 cursor，且同样不多请求
+    block, calls = run(comment_pages=0, comment_max_count=10, include_sub_comments=False)
+    cursor = block["请求信息"]["评论"]["params_v2"].get("lastCursor")
+    ok &= report("上限落在页尾", len(block["评论"]) == 10 and len(calls) == 2 and cursor == "2", f": {len(calls)} 次请求 cursor={cursor!r}")
+
+    # 2) 全部页 + 二级回复：输出顺序与内容完整，整次运行只创建一个线程池
+    created = []
+    original = xiaohongshu_rednote.ThreadPoolExecutor
+
+    class CountingExecutor(original):
+        def __init__(self, *args, **kwargs):
+            created.append(self)
+            super().__init__(*args, **kwargs)
+
+    xiaohongshu_rednote.ThreadPoolExecutor = CountingExecutor
+    try:
+        block, calls = run(comment_pages=0, sub_comment_pages=0, include_sub_comments=True)
+    finally:
+        xiaohongshu_rednote.ThreadPoolExecutor = original
+    ids = [c["评论ID"] for c in block["评论"]]
+    expected = [f"c{p}-{i}" for p in range(ROOT_PAGES) for i in range(PAGE_SIZE)]
+    ok &= report("全部页根评论", ids == expected, f": {len(ids)} 条")
+    replies = [r["评论ID"] for c in block["评论"] for r in c.get("二级评论", [])]
+    expected_replies = [f"{cid}-s{p}-{i}" for cid in expected if int(cid[-1]) % 2 == 0 for p in range(SUB_PAGES) for i in range(2)]
+    ok &= report("二级回复完整且有序", replies == expected_replies, f": {len(replies)} 条")
+    ok &= report("原始响应逐页保留", len(block["原始"]) == ROOT_PAGES)
+    ok &= report("整次运行共用一个线程池", len(created) == 1, f": 创建 {len(created)} 个")
+    threads = sum(1 for cid in expected if int(cid[-1]) % 2 == 0)
+    ok &= report("请求次数", len(calls) == ROOT_PAGES + threads * SUB_PAGES, f": {len(calls)} 次")
+
+    # 3) 增量模式：翻页中途异常时本地状态库同样被关闭
+    raised, closed, n_open, _ = _store_closed_after(
+        {"mode": "按笔记采集评论", "note_input": "abc123", "comment_pages": 0}, fail_on="get-note-comment"
+    )
+    ok &= report("评论增量：异常时关闭状态库", raised and closed and n_open == 1, f": 打开 {n_open} 次")
+
+    # 4) 用户笔记增量：UID 不合法时不打开（也不创建）状态库；翻页中途异常时状态库被关闭
+    raised, closed, n_open, created_file = _store_closed_after({"mode": "按用户信息采集笔记", "xhs_user_id": "bad-uid"})
+    ok &= report("用户笔记增量：UID 不合法不打开状态库", not raised and n_open == 0 and not created_file)
+    raised, closed, n_open, _ = _store_closed_after(
+        {"mode": "按用户信息采集笔记", "xhs_user_id": "636519f2000000001f019e57", "user_notes_pages": 5},
+        fail_on="get-user-note-list",
+    )
+    ok &= report("用户笔记增量：异常时关闭状态库", raised and closed and n_open == 1, f": 打开 {n_open} 次")
+
+    # 5) 评论增量：二级回复被页数截断或未采集时不记录其数量，下次补采；“最新”排序按上次最新时间停止翻页；状态库打不开时写入“错误”
+    with tempfile.TemporaryDirectory() as tmp:
+        def sync(**kw):
+            block, calls = run(incremental_sync=True, local_store_path=os.path.join(tmp, "state.sqlite3"), comment_pages=0, **kw)
+            return sum(len(c.get("二级评论") or []) for c in block["评论"]), calls
+
+        per_root = SUB_PAGES * 2
+        first, _ = sync(include_sub_comments=True, sub_comment_pages=1)
+        second, _ = sync(include_sub_comments=True, sub_comment_pages=0)
+        third, _ = sync(include_sub_comments=True, sub_comment_pages=0)
+        ok &= report("回复截断后补采", (first, second, third) == (threads * 2, threads * (per_root - 2), 0), f": {first}/{second}/{third}")
+
+        os.remove(os.path.join(tmp, "state.sqlite3"))
+        first, _ = sync(include_sub_comments=False)
+        second, _ = sync(include_sub_comments=True, sub_comment_pages=0)
+        ok &= report("未采集回复时不记录回复数", (first, second) == (0, threads * per_root), f": {first}/{second}")
+
+        os.remove(os.path.join(tmp, "state.sqlite3"))
+        sync(include_sub_comments=False, comment_mode="最新")
+        with sqlite3.connect(os.path.join(tmp, "state.sqlite3")) as conn:
+            conn.execute("DELETE FROM comment_seen")
+        _, calls = sync(include_sub_comments=False, comment_mode="最新")
+        ok &= report("按上次最新时间停止翻页", len(calls) == 1, f": {len(calls)} 次请求")
+
+        blocker = os.path.join(tmp, "not-a-dir")
+        open(blocker, "w").close()
+        comp = XiaohongshuRedNote()
+        comp.mode, comp.environment, comp.token, comp.note_input = "按笔记采集评论", "中国区", "DUMMY_TOKEN_123456", "abc123"
+        comp.incremental_sync, comp.local_store_path = True, os.path.join(blocker, "state.sqlite3")
+        error = comp.build_output().data.get("错误") or {}
+        ok &= report("状态库打不开时写入错误", error.get("类型") == "local_store_error", f": {error.get('消息')}")
+
+    print("全部通过" if ok else "存在不一致")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,302 @@
+import glob
+import json
+import os
+import re
+import sys
+from datetime import datetime
+
+# 将组件目录加入模块搜索路径
+sys.path.append(os.path.dirname(__file__))
+
+from langflow.schema.data import Data
+
+from xhs_comment_structured_output import XHSCommentStructuredOutputComponent
+from xhs_search_structured_output import XHSSearchStructuredOutputComponent
+from xhs_unified_structured_output import _MS_TS_THRESHOLD, XHSUnifiedStructuredOutputComponent, _format_ts_column
+from xhs_user_notes_structured_output import XHSUserNotesStructuredOutputComponent
+from xiaohongshu_rednote import XiaohongshuRedNote
+from xiaohongshu_rednote import _MS_TS_THRESHOLD as _REDNOTE_MS_TS_THRESHOLD
+
+HERE = os.path.dirname(__file__)
+FIXTURES = sorted(
+    glob.glob(os.path.join(HERE, "..", "apitest", "final", "*.json"))
+    + glob.glob(os.path.join(HERE, "..", "apitest", "realdata2.0", "*.json"))
+)
+COMPONENT_FILES = [
+    "xhs_search_structured_output.py",
+    "xhs_comment_structured_output.py",
+    "xhs_user_notes_structured_output.py",
+    "xhs_unified_structured_output.py",
+]
+
+
+# -----------------------------
+# 对照：逐字段复刻的参考映射（unified=True 为统一组件的展示格式）
+# -----------------------------
+def _s(v):
+    return "" if v is None else (v if isinstance(v, str) else str(v))
+
+
+def _i(v):
+    try:
+        if v is None:
+            return 0
+        if isinstance(v, (int, float)):
+            return int(v)
+        return int(str(v))
+    except Exception:
+        return 0
+
+
+def _b(v):
+    if v is None:
+        return False
+    if isinstance(v, bool):
+        return v
+    return str(v).strip().lower() in {"true", "1", "yes", "y"}
+
+
+def _label(note_type):
+    return {"normal": "图文笔记", "video": "视频笔记"}.get(note_type, note_type)
+
+
+def _ymdhms(value):
+    ts = _i(value)
+    if ts <= 0:
+        return ""
+    if ts > 10**11:
+        ts = ts // 1000
+    try:
+        dt = datetime.fromtimestamp(ts)
+    except Exception:
+        return ""
+    return f"{dt.year}年{dt.month:02d}月{dt.day:02d}日 {dt.hour:02d}时{dt.minute:02d}分{dt.second:02d}秒"
+
+
+def legacy_search_note(comp, note, unified):
+    user = note.get("user") or {}
+    note_type = _s(note.get("type"))
+    note_id = _s(note.get("id"))
+    publish_time = _i(note.get("timestamp")) or _i(note.get("create_time"))
+    official = _b(user.get("official_verified"))
+    return {
+        "标题": _s(note.get("title")) or _s(note.get("display_title")),
+        "点赞数": _i(note.get("liked_count")) or _i(note.get("likes")),
+        "评论数": _i(note.get("comments_count")),
+        "收藏数": _i(note.get("collected_count")),
+        "好看数": _i(note.get("nice_count")),
+        "分享数": _i(note.get("shared_count")) or _i(note.get("share_count")),
+        "笔记类型": _label(note_type) if unified else note_type,
+        "笔记id": note_id,
+        "笔记链接": f"https://www.xiaohongshu.com/explore/{note_id}" if note_id else "",
+        "笔记正文": _s(note.get("desc")),
+        "笔记tag": comp._extract_tags(note),
+        "封面图链接": comp._extract_cover_url(note),
+        "视频链接": comp._extract_video_url(note),
+        "发布时间": _ymdhms(publish_time) if unified else publish_time,
+        "作者昵称": _s(user.get("nickname")),
+        "小红书号": _s(user.get("red_id")),
+        "是否官方认证": ("是" if official else "否") if unified else official,
+    }
+
+
+def legacy_user_note(comp, note, unified):
+    user = note.get("user") or {}
+    note_type = _s(note.get("type"))
+    note_id = _s(note.get("id"))
+    images = comp._extract_image_urls(note.get("images_list"))
+    if unified:
+        link = f"https://www.xiaohongshu.com/explore/{note_id}" if note_id else ""
+    else:
+        link = "https://www.xiaohongshu.com/exp"
+    return {
+        "用户昵称": _s(user.get("nickname")),
+        "笔记ID": note_id,
+        "笔记链接": link,
+        "笔记标题": _s(note.get("title")) or _s(note.get("display_title")),
+        "笔记正文": _s(note.get("desc")),
+        "点赞数": _i(note.get("liked_count")) or _i(note.get("likes")),
+        "评论数": _i(note.get("comments_count")),
+        "收藏数": _i(note.get("collected_count")),
+        "好看数": _i(note.get("nice_count")) if note_type == "video" else 0,
+        "分享次数": _i(note.get("shared_count")) or _i(note.get("share_count")),
+        "笔记图片链接": ";".join(images) if images else "",
+        "浏览数": _i(note.get("view_count")),
+        "发布时间": _i(note.get("create_time")) or _i(note.get("timestamp")),
+        "是否是商品笔记": _b(note.get("is_goods_note")),
+        "笔记类型": _label(note_type) if unified else note_type,
+    }
+
+
+def legacy_comment(comment, level, author_id, default_location, unified):
+    user = comment.get("user") or {}
+    official = _b(user.get("official_verified"))
+    return {
+        "昵称": _s(user.get("nickname")),
+        "评论内容": _s(comment.get("content")),
+        "点赞数": _i(comment.get("like_count")),
+        "发布时间": _i(comment.get("time")),
+        "发布地点": _s(comment.get("ip_location")) or _s(default_location),
+        "评论级别": level,
+        "用户昵称": _s(user.get("nickname")),
+        "小红书号": _s(user.get("red_id")),
+        "作者ID": _s(author_id),
+        "是否官方认证": ("是" if official else "否") if unified else official,
+    }
+
+
+# -----------------------------
+# 样本：全部 fixture 中的笔记 / 评论 + 人工构造的边界记录
+# -----------------------------
+def _walk(obj, key):
+    """递归收集 data.<key> 数组中的字典元素"""
+    found = []
+    if isinstance(obj, dict):
+        val = obj.get(key)
+        if isinstance(val, list):
+            found.extend(x for x in val if isinstance(x, dict))
+        for v in obj.values():
+            found.extend(_walk(v, key))
+    elif isinstance(obj, list):
+        for v in obj:
+            found.extend(_walk(v, key))
+    return found
+
+
+def _load_fixtures():
+    docs = []
+    for path in FIXTURES:
+        with open(path, encoding="utf-8") as f:
+            raw = f.read()
+        if raw.strip():
+            docs.append(json.loads(raw))
+    return docs
+
+
+EDGE_NOTES = [
+    {},
+    {"user": None, "type": "video", "nice_count": "12", "likes": 7, "share_count": "3", "create_time": 1730000000123},
+    {"user": {"nickname": 123, "red_id": None, "official_verified": "true"}, "display_title": "备用标题", "liked_count": "x"},
+    {"id": 42, "title": "", "desc": "正文 #话题一 #话题二", "timestamp": "1730000000", "type": "normal", "is_goods_note": 1},
+    {"id": "n1", "images_list": [{"url_size_large": " https://a/1 "}, "https://a/2", {"src": ""}], "view_count": 3.9},
+    {"type": "live", "liked_count": 0, "likes": 0, "shared_count": None, "timestamp": 0, "create_time": 0},
+]
+EDGE_COMMENTS = [
+    {},
+    {"user": None, "content": None, "like_count": "5", "time": "bad", "ip_location": ""},
+    {"user": {"nickname": "甲", "red_id": 1, "official_verified": 1}, "content": "内容", "ip_location": "上海"},
+]
+
+
+def _results(cls, doc):
+    """按生产路径（上游 Data → build_structured_output）取结构化记录"""
+    comp = cls()
+    comp.input_data, comp.input_json = Data(data=doc), None
+    out = comp.build_structured_output().data
+    return out["results"] if "results" in out else [out]
+
+
+def _search_doc(notes):
+    return {"数据": [{"原始": {"code": 0, "data": {"items": [{"note": n} for n in notes]}}}]}
+
+
+def _user_notes_doc(notes):
+    return {"数据": [{"原始": {"code": 0, "data": {"notes": notes}}}]}
+
+
+def _comment_doc(comments, level, author_id, env):
+    """根评论放在原始分页中；二级评论放在无根评论ID的分组中（不加“回复X：”前缀），作者ID 仍取自原始分页"""
+    doc = {"环境": env} if env is not None else {}
+    if level == "根评论":
+        doc["数据"] = [{"原始": [{"code": 0, "data": {"user_id": author_id, "comments": comments}}]}]
+    else:
+        doc["数据"] = [{
+            "原始": [{"code": 0, "data": {"user_id": author_id, "comments": []}}],
+            "评论": [{"二级评论原始响应": [{"code": 0, "data": {"comments": comments}}]}],
+        }]
+    return doc
+
+
+def _expected_comments(comp, comments, level, author_id, env, unified):
+    loc = env or "未知"
+    rows = [legacy_comment(c, level, author_id, loc, unified) for c in comments]
+    for row, c in zip(rows, comments):
+        row["评论内容"] = comp._augment_comment_content(row["评论内容"], c, reply_target_name=None)
+    return rows
+
+
+def _check(name, expected, actual):
+    same = [list(e.items()) for e in expected] == [list(a.items()) for a in actual]
+    print(f"[{'OK' if same else 'FAIL'}] {name}: {len(expected)} 条")
+    return same
+
+
+def main():
+    docs = _load_fixtures()
+    notes = [it["note"] for it in _walk(docs, "items") if isinstance(it.get("note"), dict)] + EDGE_NOTES
+    user_notes = _walk(docs, "notes") + EDGE_NOTES
+    comments = _walk(docs, "comments") + EDGE_COMMENTS
+    ok = True
+
+    # 1) 四个文件中的列式结果代码块必须逐字一致
+    blocks = []
+    for fname in COMPONENT_FILES:
+        with open(os.path.join(HERE, fname), encoding="utf-8") as f:
+            src = f.read()
+        m = re.search(r"# -----------------------------\n# 列式结果.*?\n(?=# -----------------------------\n# 时间戳归一化)", src, re.DOTALL)
+        blocks.append(m.group(0) if m else "")
+    same_block = all(blocks) and len(set(blocks)) == 1
+    print(f"[{'OK' if same_block else 'FAIL'}] 列式结果代码块在 {len(COMPONENT_FILES)} 个组件中一致")
+    ok &= same_block
+
+    # 时间戳工具代码块在各结构化输出组件中逐字一致；采集组件沿用同一毫秒阈值
+    blocks = []
+    for fname in COMPONENT_FILES:
+        with open(os.path.join(HERE, fname), encoding="utf-8") as f:
+            src = f.read()
+        m = re.search(r"# -----------------------------\n# 时间戳归一化.*?\ndef _format_ts_column\(.*?\n(?=\n)", src, re.DOTALL)
+        blocks.append(m.group(0) if m else "")
+    same_block = all(blocks) and len(set(blocks)) == 1
+    print(f"[{'OK' if same_block else 'FAIL'}] 时间戳工具代码块在 {len(blocks)} 个组件中一致")
+    ok &= same_block
+    same = _REDNOTE_MS_TS_THRESHOLD == _MS_TS_THRESHOLD
+    print(f"[{'OK' if same else 'FAIL'}] 采集组件与结构化输出的毫秒阈值一致")
+    ok &= same
+
+    # 整列时间戳归一化 / 格式化与逐条结果一致（含秒、毫秒、0、负数与超出 int64 的值）
+    raw_ts = [n.get("timestamp") for n in notes] + [n.get("create_time") for n in user_notes] + [c.get("time") for c in comments]
+    raw_ts += [0, -5, 1730000000, 1730000000123, 10**11, 10**11 + 1, 2**63 + 7, "1730000000", "x", None, 1.5]
+    ints = [_i(v) for v in raw_ts]
+    same = _format_ts_column(ints) == [_ymdhms(v) for v in ints]
+    print(f"[{'OK' if same else 'FAIL'}] 整列时间格式化: {len(ints)} 条")
+    ok &= same
+    same = XiaohongshuRedNote._normalize_ts_column(raw_ts) == [XiaohongshuRedNote._normalize_ts(v) for v in raw_ts]
+    print(f"[{'OK' if same else 'FAIL'}] 整列时间戳归一化: {len(raw_ts)} 条")
+    ok &= same
+
+    # 2) 生产路径（整页批量映射 → 列 → 记录）与参考映射逐字段（含字段顺序）一致
+    search = XHSSearchStructuredOutputComponent()
+    user = XHSUserNotesStructuredOutputComponent()
+    comment = XHSCommentStructuredOutputComponent()
+    unified = XHSUnifiedStructuredOutputComponent()
+    ok &= _check("搜索组件", [legacy_search_note(search, n, False) for n in notes],
+                 _results(XHSSearchStructuredOutputComponent, _search_doc(notes)))
+    ok &= _check("用户笔记组件", [legacy_user_note(user, n, False) for n in user_notes],
+                 _results(XHSUserNotesStructuredOutputComponent, _user_notes_doc(user_notes)))
+    ok &= _check("统一组件 搜索", [legacy_search_note(unified, n, True) for n in notes],
+                 _results(XHSUnifiedStructuredOutputComponent, _search_doc(notes)))
+    ok &= _check("统一组件 用户笔记", [legacy_user_note(unified, n, True) for n in user_notes],
+                 _results(XHSUnifiedStructuredOutputComponent, _user_notes_doc(user_notes)))
+    for level, author_id, env in (("根评论", "author1", "中国区"), ("二级评论", 9527, None)):
+        doc = _comment_doc(comments, level, author_id, env)
+        ok &= _check(f"评论组件 {level}", _expected_comments(comment, comments, level, author_id, env, False),
+                     _results(XHSCommentStructuredOutputComponent, doc))
+        ok &= _check(f"统一组件 评论 {level}", _expected_comments(unified, comments, level, author_id, env, True),
+                     _results(XHSUnifiedStructuredOutputComponent, doc))
+
+    print("全部通过" if ok else "存在不一致")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+import glob
+import json
+import os
+import re
+import sys
+
+# 将组件目录加入模块搜索路径
+sys.path.append(os.path.dirname(__file__))
+
+from check_report import report
+from xhs_unified_structured_output import _extract_hashtags
+
+HERE = os.path.dirname(__file__)
+FIXTURES = sorted(glob.glob(os.path.join(HERE, "..", "apitest", "**", "*.json"), recursive=True))
+BLOCK_FILES = [
+    os.path.join(HERE, "xhs_search_structured_output.py"),
+    os.path.join(HERE, "xhs_unified_structured_output.py"),
+    os.path.join(HERE, "xiaohongshu_rednote.py"),
+    os.path.join(HERE, "..", "..", "pybug_batmkey", "trycode.py"),
+]
+
+CASES = [
+    "#银渐层[话题]# #我家宠物好可爱[话题]#",
+    "#网易严选[话题]##妮可露矿砂[话题]#",
+    "截断的话题 #一口超20种天然精华食材[话题]",
+    "正文 #话题一 #话题二 #话题一",
+    "视频时间点 #00:12[时刻]#柠檬片\n#00:27[时刻]#花丝葫芦 #黄金首饰[话题]#",
+    "好可爱#猫咪，今天 ＃全角[话题]＃ #a-b_c",
+    "# 空 # #[话题]#",
+    "",
+    None,
+    123,
+]
+
+
+def reference_tags(text, style):
+    """对照：各组件原先逐次调用 re.findall 的写法，标签格式以此为准"""
+    if not isinstance(text, str):
+        return []
+    if style == "正文":
+        return [m.strip() for m in re.findall(r"#([^#\n\r]+)", text) if m.strip()]
+    if style == "成对":
+        return [t.strip() for t in re.findall(r"#([^#]+)#", text) if t.strip()]
+    tags = re.findall(r"(?:^|\s)#([\w\-\u4e00-\u9fa5]+)", text.replace("＃", "#"))
+    return list(dict.fromkeys(t.strip() for t in tags if t))
+
+
+def _walk_descs(obj, out):
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            if k in ("desc", "笔记正文") and isinstance(v, str):
+                out.append(v)
+            else:
+                _walk_descs(v, out)
+    elif isinstance(obj, list):
+        for v in obj:
+            _walk_descs(v, out)
+    return out
+
+
+def _load_descs():
+    descs = []
+    for path in FIXTURES:
+        with open(path, encoding="utf-8") as f:
+            raw = f.read()
+        try:
+            _walk_descs(json.loads(raw), descs)
+        except json.JSONDecodeError:
+            continue
+    return descs
+
+
+def main():
+    ok = True
+
+    # 1) 四个组件中的话题提取代码块必须逐字一致
+    blocks = []
+    for path in BLOCK_FILES:
+        with open(path, encoding="utf-8") as f:
+            src = f.read()
+        m = re.search(r"# -----------------------------\n# 话题标签提取.*?\ndef _extract_hashtags\(.*?\n(?=\n)", src, re.DOTALL)
+        blocks.append(m.group(0) if m else "")
+    ok &= report("话题提取代码块一致", all(blocks) and len(set(blocks)) == 1, f": {len(blocks)} 个文件")
+
+    # 2) 典型写法与 fixture 中的全部笔记正文：每种格式都与原写法逐条一致
+    descs = _load_descs()
+    for style in ("正文", "成对", "名称"):
+        for text in CASES:
+            got = _extract_hashtags(text, style)
+            ok &= report(f"{style} {text!r}", got == reference_tags(text, style), f": {got}")
+        bad = [d for d in descs if _extract_hashtags(d, style) != reference_tags(d, style)]
+        ok &= report(f"{style} fixture 正文与原写法一致", not bad, f": {len(descs)} 段")
+        for d in bad[:3]:
+            print("   ", repr(d[:120]), _extract_hashtags(d, style), reference_tags(d, style))
+
+    # 3) "[话题]" 后缀：结构化输出与 XHS 采集保留，爬虫组件只取名称
+    text = "#银渐层[话题]# #我家宠物好可爱[话题]#"
+    ok &= report("结构化输出保留 [话题] 后缀", _extract_hashtags(text, "正文") == ["银渐层[话题]", "我家宠物好可爱[话题]"])
+    ok &= report("XHS 采集保留 [话题] 后缀", _extract_hashtags(text, "成对") == ["银渐层[话题]", "我家宠物好可爱[话题]"])
+    ok &= report("爬虫组件只取名称", _extract_hashtags(text, "名称") == ["银渐层", "我家宠物好可爱"])
+
+    print("全部通过" if ok else "存在不一致")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
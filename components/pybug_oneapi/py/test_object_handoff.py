@@ -0,0 +1,122 @@
+import copy
+import glob
+import json
+import os
+import sys
+
+# 将组件目录加入模块搜索路径
+sys.path.append(os.path.dirname(__file__))
+
+from langflow.schema.data import Data
+from langflow.schema.message import Message
+
+from check_report import report
+from xhs_comment_structured_output import XHSCommentStructuredOutputComponent
+from xhs_filter_component import XHSFilterComponent
+from xhs_search_structured_output import XHSSearchStructuredOutputComponent
+from xhs_unified_structured_output import XHSUnifiedStructuredOutputComponent
+from xhs_user_notes_structured_output import XHSUserNotesStructuredOutputComponent
+
+HERE = os.path.dirname(__file__)
+FIXTURES = sorted(
+    glob.glob(os.path.join(HERE, "..", "apitest", "final", "*.json"))
+    + glob.glob(os.path.join(HERE, "..", "apitest", "realdata2.0", "*.json"))
+)
+STRUCTURED = [
+    XHSUnifiedStructuredOutputComponent,
+    XHSSearchStructuredOutputComponent,
+    XHSCommentStructuredOutputComponent,
+    XHSUserNotesStructuredOutputComponent,
+]
+
+
+def _filter(payload):
+    comp = XHSFilterComponent()
+    comp.input_message = payload
+    return comp
+
+
+def _structured(cls, input_data=None, input_json=None):
+    comp = cls()
+    comp.input_data = input_data
+    comp.input_json = input_json
+    try:
+        data = comp.build_structured_output().data
+    except Exception as e:
+        return "ERR" + type(e).__name__
+    df = comp.build_structured_dataframe()
+    return data, list(df.columns), df.astype(str).values.tolist()
+
+
+def main():
+    ok = True
+    for path in FIXTURES:
+        with open(path, encoding="utf-8") as f:
+            raw = f.read()
+        try:
+            doc = json.loads(raw)
+        except json.JSONDecodeError:
+            continue
+        if not isinstance(doc, dict):
+            continue
+        name = os.path.basename(path)
+        snapshot = copy.deepcopy(doc)
+
+        # 1) 过滤器：Data 活对象输入与文本消息输入的过滤结果一致；对象输出与文本输出内容一致；不修改上游对象
+        by_text = _filter(Message(text=raw))
+        by_object = _filter(Data(data=doc))
+        text_out = json.loads(by_text.filter_message().text)
+        object_out = by_object.filter_data().data
+        ok &= report(f"过滤器 {name}", object_out == text_out and by_object.filter_message().text == by_text.filter_message().text)
+        ok &= report(f"过滤器未修改上游对象 {name}", doc == snapshot)
+
+        # 2) 结构化输出：接收过滤器的对象输出与接收其文本输出结果一致
+        for cls in STRUCTURED:
+            expected = _structured(cls, input_json=by_text.filter_message().text)
+            via_message = _structured(cls, input_data=by_text.filter_message())
+            via_object = _structured(cls, input_data=by_object.filter_data())
+            ok &= report(f"{cls.__name__} {name}", expected == via_object == via_message)
+        ok &= report(f"结构化输出未修改上游对象 {name}", object_out == text_out)
+
+    # 3) 未识别模式：对象输出与输入对象内容相同；无法解析的输入原样回显
+    unknown = {"foo": [1, 2, 3]}
+    ok &= report("未识别模式原样传递对象", _filter(Data(data=unknown)).filter_data().data == {"foo": [1, 2, 3]})
+    bad = _filter(Message(text="not json"))
+    ok &= report("无法解析的输入原样回显", bad.filter_message().text == "not json" and bad.filter_data().data == {"text": "not json"})
+
+    # 4) 单模式组件：两个输入都为空时报“缺少输入”；上游 Data 为空时使用备用 JSON 输入
+    with open(os.path.join(HERE, "..", "apitest", "final", "search.json"), encoding="utf-8") as f:
+        search_raw = f.read()
+    for cls in STRUCTURED[1:]:
+        for input_data, input_json in ((None, None), (None, "  "), (Data(data={}), None)):
+            comp = cls()
+            comp.input_data, comp.input_json = input_data, input_json
+            try:
+                comp.build_structured_output()
+                message = ""
+            except ValueError as e:
+                message = str(e)
+            ok &= report(f"{cls.__name__} 缺少输入 {type(input_data).__name__}/{input_json!r}", message.startswith("缺少输入"), f": {message}")
+    fallback = _structured(XHSSearchStructuredOutputComponent, input_data=Data(data={}), input_json=search_raw)
+    ok &= report("上游 Data 为空时使用备用 JSON", fallback == _structured(XHSSearchStructuredOutputComponent, input_json=search_raw))
+
+    # 5) 运行内缓存按输入内容命中：两个输出共用一次映射；同一 Data 对象被原地修改后重新计算
+    for cls, fixture in zip(STRUCTURED, ("search.json", "search.json", "comment.json", "user.json")):
+        with open(os.path.join(HERE, "..", "apitest", "final", fixture), encoding="utf-8") as f:
+            doc = json.load(f)
+        comp = cls()
+        comp.input_data, comp.input_json = Data(data=doc), None
+        first = comp.build_structured_output().data
+        columns = comp._structured_columns()
+        comp.build_structured_dataframe()
+        reused = comp._structured_columns() is columns
+        doc["数据"] = doc["数据"] * 2
+        changed = comp.build_structured_output().data
+        ok &= report(f"{cls.__name__} 运行内缓存按内容命中", reused and changed != first)
+
+    print("全部通过" if ok else "存在不一致")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
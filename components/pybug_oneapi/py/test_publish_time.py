@@ -0,0 +1,116 @@
+import glob
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+# 将组件目录加入模块搜索路径
+sys.path.append(os.path.dirname(__file__))
+
+import numpy as np
+
+import xhs_comment_structured_output
+import xhs_search_structured_output
+import xhs_unified_structured_output
+import xhs_user_notes_structured_output
+from check_report import report
+
+HERE = os.path.dirname(__file__)
+FIXTURES = sorted(
+    glob.glob(os.path.join(HERE, "..", "apitest", "final", "*.json"))
+    + glob.glob(os.path.join(HERE, "..", "apitest", "realdata2.0", "*.json"))
+)
+MODULES = {
+    xhs_unified_structured_output: "XHSUnifiedStructuredOutputComponent",
+    xhs_search_structured_output: "XHSSearchStructuredOutputComponent",
+    xhs_comment_structured_output: "XHSCommentStructuredOutputComponent",
+    xhs_user_notes_structured_output: "XHSUserNotesStructuredOutputComponent",
+}
+# 非 UTC 时区才能暴露 UTC / 本地时间混用；纽约时区额外覆盖夏令时切换
+TIMEZONES = ("Asia/Shanghai", "America/New_York")
+
+
+def _set_tz(name):
+    os.environ["TZ"] = name
+    time.tzset()
+    for module in MODULES:
+        module._format_ts_seconds.cache_clear()
+        module._local_utc_offset.cache_clear()
+
+
+def _as_text(module, value):
+    """Data 中的时间戳 / DataFrame 中的时间值 -> 中文时间文本，便于逐行对比"""
+    if value is None or (hasattr(value, "year") and value != value):
+        return ""
+    if isinstance(value, str):
+        return value
+    if hasattr(value, "year"):
+        return f"{value.year}年{value.month:02d}月{value.day:02d}日 {value.hour:02d}时{value.minute:02d}分{value.second:02d}秒"
+    return module._format_ts_seconds(module._ts_seconds(int(value)))
+
+
+def main():
+    if not hasattr(time, "tzset"):
+        print("当前平台不支持切换时区，跳过")
+        return 0
+    ok = True
+    original_tz = os.environ.get("TZ")
+    try:
+        for tz in TIMEZONES:
+            _set_tz(tz)
+
+            # 1) 同一行的 Data 输出与 DataFrame 输出表示同一时刻（同为本地时区）
+            for module, cls_name in MODULES.items():
+                cls = getattr(module, cls_name)
+                rows_checked, mismatched = 0, []
+                for path in FIXTURES:
+                    with open(path, encoding="utf-8") as f:
+                        raw = f.read()
+                    comp = cls()
+                    comp.input_data = None
+                    comp.input_json = raw
+                    try:
+                        rows = comp.build_structured_output().data.get("results") or []
+                    except Exception:
+                        continue
+                    df = comp.build_structured_dataframe()
+                    if "发布时间" not in df.columns or len(df) != len(rows):
+                        continue
+                    for row, value in zip(rows, df["发布时间"].tolist()):
+                        rows_checked += 1
+                        if _as_text(module, row.get("发布时间")) != _as_text(module, value):
+                            mismatched.append((os.path.basename(path), row.get("发布时间"), value))
+                ok &= report(f"{tz} {cls_name} Data 与 DataFrame 发布时间一致", rows_checked > 0 and not mismatched,
+                              f": {rows_checked} 行" + (f"，首个不一致 {mismatched[0]}" if mismatched else ""))
+
+            # 2) 整列换算与逐条 datetime.fromtimestamp 一致（含夏令时切换前后、毫秒、0、负数与超出范围的值）
+            rnd = random.Random(46)
+            transitions = (1710054000, 1730613600, 1741503600, 1762063200)
+            ints = [t + rnd.randint(-7200, 7200) for t in transitions for _ in range(500)]
+            ints += [rnd.randint(1, 2_000_000_000) for _ in range(2000)]
+            ints += [1730000000123, 0, -5, 10**11, 10**11 + 1, 2**62]
+            got = xhs_unified_structured_output._ts_to_datetime64(ints)
+            expected = [_as_text(xhs_unified_structured_output, v) for v in ints]
+            same = [_as_text(xhs_unified_structured_output, None if np.isnat(g) else g.astype(datetime)) for g in got] == expected
+            ok &= report(f"{tz} 整列时间换算", same, f": {len(ints)} 条")
+            # 小列逐条换算的结果与整列 NumPy 换算一致
+            small = [ints[i:i + 50] for i in range(0, len(ints), 50)]
+            same = all(
+                [str(v) for v in xhs_unified_structured_output._ts_to_datetime64(part)] == [str(v) for v in got[i * 50:i * 50 + len(part)]]
+                for i, part in enumerate(small)
+            )
+            ok &= report(f"{tz} 小列时间换算", same, f": {len(small)} 列")
+    finally:
+        if original_tz is None:
+            os.environ.pop("TZ", None)
+        else:
+            os.environ["TZ"] = original_tz
+        time.tzset()
+
+    print("全部通过" if ok else "存在不一致")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -21,7 +21,8 @@
 - 做好兜底：除非完全没有数据，否则不产生 null；字符串用空字符串，数值用 0，布尔用 False。
 
 输入：
-- input_json: 上游 JSON 字符串（或 Python 字典），支持 /components/pybug/final/comment.filtered.json 的结构。
+- input_data: 上游组件输出的 Data / Message（优先使用；Data 携带的字典直接使用，不再经过 JSON 解析）。
+- input_json: 上游 JSON 字符串（或 Python 字典，作为备用通道），支持 /components/pybug/final/comment.filtered.json 的结构。
 
 输出：
 - structured_output: Data（单条直接返回对象，多条以 {"results": [...]} 返回）
@@ -31,16 +32,151 @@
 
 from __future__ import annotations
 
+import functools
+import hashlib
 import json
+import pickle
 import re
-from typing import Any, Dict, List
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Tuple
 
+import numpy as np
 from langflow.custom.custom_component.component import Component
-from langflow.io import MultilineInput, Output
+from langflow.io import HandleInput, MultilineInput, Output
 from langflow.schema.data import Data
 from langflow.schema.dataframe import DataFrame
 
 
+# -----------------------------
+# 列式结果（四个结构化输出组件共用同一份实现，修改时请逐字同步）
+# - 每条记录由组件的手写映射函数产出，字段顺序与列类型表一致，逐列追加
+# - 列类型表为 ((字段, 类型), ...)，顺序即输出字段顺序；DataFrame 中 int → int64（时间字段 → datetime64），
+#   bool → bool，其余类型的列保持原样
+# -----------------------------
+Columns = Dict[str, List[Any]]
+ColumnTypes = Tuple[Tuple[str, type], ...]
+
+
+def _empty_columns(column_types: ColumnTypes) -> Columns:
+    return {name: [] for name, _ in column_types}
+
+
+def _append_rows(columns: Columns, rows: Iterable[Dict[str, Any]]) -> None:
+    """记录逐列追加（记录的字段顺序须与 columns 一致）"""
+    appends = [col.append for col in columns.values()]
+    for row in rows:
+        for append, value in zip(appends, row.values()):
+            append(value)
+
+
+def _column_length(columns: Columns) -> int:
+    return len(next(iter(columns.values()), ()))
+
+
+def _rows_from_columns(columns: Columns) -> List[Dict[str, Any]]:
+    keys = list(columns)
+    return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
+
+def _typed_column_arrays(column_types: ColumnTypes, columns: Columns, datetime_fields: Iterable[str] = ()) -> Dict[str, Any]:
+    """按列类型表转换各列：int → int64（其中 datetime_fields → datetime64），bool → bool；其余列保持原样"""
+    datetime_fields = set(datetime_fields)
+    arrays: Dict[str, Any] = {}
+    for name, kind in column_types:
+        values = columns[name]
+        try:
+            if kind is int:
+                ints = np.fromiter(values, dtype=np.int64, count=len(values))
+                arrays[name] = _ts_to_datetime64(ints) if name in datetime_fields else ints
+            elif kind is bool:
+                arrays[name] = np.fromiter(values, dtype=np.bool_, count=len(values))
+            else:
+                arrays[name] = values
+        except (OverflowError, TypeError, ValueError):
+            # 超出 int64 等异常值：该列退回原始 Python 对象
+            arrays[name] = values
+    return arrays
+
+
+# -----------------------------
+# 时间戳归一化与格式化（各结构化输出组件共用同一份实现，修改时请逐字同步；XHS 采集组件只沿用同一毫秒阈值）
+# - 原始时间戳可能是秒级或毫秒级：大于 _MS_TS_THRESHOLD 视为毫秒
+# - 不少于 _TS_NUMPY_MIN_ROWS 条的整列用 NumPy 整数运算一次完成；单页规模的小列逐条换算，省去数组转换的固定开销
+# - 中文时间文本按秒级时间戳 LRU 缓存：同一时刻（重复数据、同批发布）只格式化一次
+# - 时间类型列（datetime64）与中文时间文本统一取本地时区的墙上时间，同一行两种输出一致
+# -----------------------------
+_MS_TS_THRESHOLD = 10**11
+_TS_NUMPY_MIN_ROWS = 128
+
+
+def _ts_seconds(ts: int) -> int:
+    return ts // 1000 if ts > _MS_TS_THRESHOLD else ts
+
+
+def _ts_seconds_list(ints: List[int]) -> List[int]:
+    """整数时间戳列（秒 / 毫秒混合）-> 秒级时间戳列；小列与超出 int64 的异常值逐条处理"""
+    if len(ints) < _TS_NUMPY_MIN_ROWS:
+        return [_ts_seconds(ts) for ts in ints]
+    try:
+        arr = np.asarray(ints, dtype=np.int64)
+    except OverflowError:
+        return [_ts_seconds(ts) for ts in ints]
+    return np.where(arr > _MS_TS_THRESHOLD, arr // 1000, arr).tolist()
+
+
+_EPOCH = datetime(1970, 1, 1)
+_MAX_TS_SECONDS = 253402300799  # 9999-12-31 23:59:59，datetime 可表示的上限
+
+
+@functools.lru_cache(maxsize=8192)
+def _local_utc_offset(ts: int) -> int:
+    """秒级时间戳处本地时区相对 UTC 的偏移（秒），与 datetime.fromtimestamp 的换算一致（含夏令时）"""
+    try:
+        delta = datetime.fromtimestamp(ts) - _EPOCH
+    except (OverflowError, OSError, ValueError):
+        return 0
+    return delta.days * 86400 + delta.seconds - ts
+
+
+def _ts_to_datetime64(ints: Any) -> Any:
+    """整数时间戳列 -> datetime64[s]，取本地时区的墙上时间（与 _format_ts_seconds 的文本一致）；
+    0、负数或超出范围视为缺失（NaT）"""
+    if len(ints) < _TS_NUMPY_MIN_ROWS:
+        secs = [_ts_seconds(ts) for ts in ints]
+        return np.array([s + _local_utc_offset(s) if 0 < s <= _MAX_TS_SECONDS else "NaT" for s in secs], dtype="datetime64[s]")
+    arr = np.asarray(ints, dtype=np.int64)
+    secs = np.where(arr > _MS_TS_THRESHOLD, arr // 1000, arr)
+    missing = (secs <= 0) | (secs > _MAX_TS_SECONDS)
+    secs = np.where(missing, 0, secs)
+    # 时区偏移按小时求一次：整小时首尾偏移相同时共用，跨夏令时切换的小时逐秒换算
+    hours, inverse = np.unique(secs // 3600, return_inverse=True)
+    start = np.array([_local_utc_offset(int(h) * 3600) for h in hours], dtype=np.int64)
+    end = np.array([_local_utc_offset(int(h) * 3600 + 3599) for h in hours], dtype=np.int64)
+    offsets = start[inverse]
+    for i in np.flatnonzero((start != end)[inverse]):
+        offsets[i] = _local_utc_offset(int(secs[i]))
+    out = (secs + offsets).astype("datetime64[s]")
+    out[missing] = np.datetime64("NaT")
+    return out
+
+
+@functools.lru_cache(maxsize=8192)
+def _format_ts_seconds(ts: int) -> str:
+    """秒级时间戳 -> “YYYY年MM月DD日 HH时MM分SS秒”（本地时区）；0、负数或超出范围返回空字符串"""
+    if ts <= 0:
+        return ""
+    try:
+        dt = datetime.fromtimestamp(ts)
+    except (OverflowError, OSError, ValueError):
+        return ""
+    return f"{dt.year}年{dt.month:02d}月{dt.day:02d}日 {dt.hour:02d}时{dt.minute:02d}分{dt.second:02d}秒"
+
+
+def _format_ts_column(ints: List[int]) -> List[str]:
+    """整数时间戳列整列格式化为中文时间文本"""
+    return [_format_ts_seconds(ts) for ts in _ts_seconds_list(ints)]
+
+
 class XHSCommentStructuredOutputComponent(Component):
     display_name = "小红书评论结构化输出"
     description = "从小红书评论原始 JSON 提取并输出结构化数据，避免依赖中文映射字段。"
@@ -49,12 +185,19 @@ class XHSCommentStructuredOutputComponent(Component):
     icon = "table"
 
     inputs = [
+        HandleInput(
+            name="input_data",
+            display_name="上游数据",
+            info="接收上游组件输出的 Data 或 Message（若存在则优先使用）。",
+            input_types=["Data", "Message"],
+            required=False,
+        ),
         MultilineInput(
             name="input_json",
-            display_name="输入JSON",
+            display_name="输入JSON（备用）",
             info="原始响应 JSON（字符串或对象），例如 comment.filtered.json 的内容。",
             tool_mode=True,
-            required=True,
+            required=False,
         ),
     ]
 
@@ -71,11 +214,51 @@ class XHSCommentStructuredOutputComponent(Component):
         ),
     ]
 
+    # 输出字段与列类型（顺序即输出字段顺序，与 _map_comment 产出的记录一致）
+    COMMENT_FIELDS: ColumnTypes = (
+        ("昵称", str),
+        ("评论内容", str),
+        ("点赞数", int),
+        ("发布时间", int),
+        ("发布地点", str),
+        ("评论级别", str),
+        ("用户昵称", str),
+        ("小红书号", str),
+        ("作者ID", str),
+        ("是否官方认证", bool),
+    )
+    # DataFrame 中按时间类型输出的字段（原始为毫秒级时间戳）
+    DATETIME_FIELDS: Tuple[str, ...] = ("发布时间",)
+
     # -----------------------------
     # 公用：从输入解析为 Python 对象
     # -----------------------------
+    def _resolve_input_obj(self) -> Any:
+        # 优先使用上游句柄数据，其次使用备用字符串输入
+        obj: Any = None
+        payload = getattr(self, "input_data", None)
+        if payload is not None:
+            base = payload[0] if isinstance(payload, list) and payload else payload
+            if base is not None:
+                # Message 取其文本；Data 携带的字典/列表是上游的活对象，直接使用，不经过文本序列化与解析
+                text = getattr(base, "text", None)
+                live = getattr(base, "data", None)
+                if isinstance(text, str) and text.strip():
+                    obj = text
+                elif isinstance(live, (dict, list)) and live:
+                    obj = live
+                elif text is None and live is None:
+                    # 不是 Data / Message（如直接传入的字符串或字典）：原样使用；内容为空的 Data / Message 视为未连接
+                    obj = base
+        if obj is None:
+            obj = self.input_json
+        return obj
+
     def _parse_input(self) -> Dict[str, Any] | List[Any]:
-        obj = self.input_json
+        obj = self._resolve_input_obj()
+        if obj is None or (isinstance(obj, str) and not obj.strip()):
+            msg = "缺少输入：请连接上游数据，或在“输入JSON（备用）”中填写原始响应 JSON"
+            raise ValueError(msg)
         if isinstance(obj, (dict, list)):
             return obj
         if isinstance(obj, str):
@@ -87,6 +270,44 @@ class XHSCommentStructuredOutputComponent(Component):
         msg = "输入类型不支持：请提供 JSON 字符串或字典/列表"
         raise TypeError(msg)
 
+    # -----------------------------
+    # 公用：单次运行内缓存（两个输出共用同一份解析结果与映射记录，按输入内容判定是否命中）
+    # -----------------------------
+    def _input_key(self) -> Any:
+        """输入内容的比较键：文本输入即字符串本身；Data 携带的活对象取其序列化摘要，上游原地修改后不会命中旧结果"""
+        obj = self._resolve_input_obj()
+        if isinstance(obj, (str, bytes)):
+            return obj
+        try:
+            payload = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            payload = repr(obj).encode("utf-8", errors="replace")
+        return hashlib.blake2b(payload, digest_size=16).digest()
+
+    def _run_memo(self, slot: str, build: Callable[[], Any]) -> Any:
+        # 嵌套调用（记录 -> 列 -> 解析）沿用外层已算出的键，每次输出只计算一次
+        outer = getattr(self, "_memo_key", None)
+        key = outer if outer is not None else self._input_key()
+        cached = getattr(self, slot, None)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        self._memo_key = key
+        try:
+            value = build()
+        finally:
+            self._memo_key = outer
+        setattr(self, slot, (key, value))
+        return value
+
+    def _parsed_input(self) -> Dict[str, Any] | List[Any]:
+        return self._run_memo("_parsed_input_cache", self._parse_input)
+
+    def _structured_columns(self) -> Columns:
+        return self._run_memo("_columns_cache", self._build_columns)
+
+    def _structured_records(self) -> List[Dict[str, Any]]:
+        return self._run_memo("_records_cache", self.build_structured_output_base)
+
     # -----------------------------
     # 公用：安全取值与兜底
     # -----------------------------
@@ -172,9 +393,6 @@ class XHSCommentStructuredOutputComponent(Component):
     def _map_comment(self, comment: Dict[str, Any], level: str, author_id: str, default_location: str) -> Dict[str, Any]:
         user = comment.get("user") or {}
         nickname = self._as_str(user.get("nickname"))
-        red_id = self._as_str(user.get("red_id"))
-        official_verified = self._as_bool(user.get("official_verified"))
-
         return {
             "昵称": nickname,
             "评论内容": self._as_str(comment.get("content")),
@@ -184,16 +402,19 @@ class XHSCommentStructuredOutputComponent(Component):
             "发布地点": (self._as_str(comment.get("ip_location")) or self._as_str(default_location)),
             "评论级别": level,
             "用户昵称": nickname,
-            "小红书号": red_id,
+            "小红书号": self._as_str(user.get("red_id")),
             "作者ID": self._as_str(author_id),
-            "是否官方认证": official_verified,
+            "是否官方认证": self._as_bool(user.get("official_verified")),
         }
 
     # -----------------------------
-    # 核心：构建结构化数据（列表）
+    # 核心：构建结构化数据（按列写入，记录列表与 DataFrame 都由列生成）
     # -----------------------------
     def build_structured_output_base(self) -> List[Dict[str, Any]]:
-        doc = self._parse_input()
+        return _rows_from_columns(self._structured_columns())
+
+    def _build_columns(self) -> Columns:
+        doc = self._parsed_input()
 
         # 顶层可能是 dict（含“数据”数组）或直接是列表
         datasets: List[Dict[str, Any]] = []
@@ -207,18 +428,20 @@ class XHSCommentStructuredOutputComponent(Component):
         elif isinstance(doc, list):
             datasets = [d for d in doc if isinstance(d, dict)]
 
-        final_results: List[Dict[str, Any]] = []
+        columns = _empty_columns(self.COMMENT_FIELDS)
 
         # 顶层环境兜底（如“中国区”）
         global_default_location = ""
         if isinstance(doc, dict):
             global_default_location = self._as_str(doc.get("环境")) or "未知"
-        
+
         for ds in datasets:
-            # 收集根评论（按出现顺序）和映射
+            # 本数据集的根评论与二级评论先按出现顺序写入临时列，最后按输出顺序取行追加到总列
+            ds_cols = _empty_columns(self.COMMENT_FIELDS)
+            srcs: List[Dict[str, Any]] = []  # 与临时列同序的原始评论
             author_id = ""
             raw_list = ds.get("原始")
-            root_seq: List[Dict[str, Any]] = []  # 每项：{"id": str, "mapped": dict, "src": dict}
+            root_seq: List[Tuple[int, str]] = []  # 每项：(临时列行号, 根评论ID)
             root_nickname_by_id: Dict[str, str] = {}
 
             if isinstance(raw_list, list):
@@ -234,19 +457,18 @@ class XHSCommentStructuredOutputComponent(Component):
                     author_id = self._as_str(data_node.get("user_id")) or author_id
                     comments = data_node.get("comments") or []
                     if isinstance(comments, list):
-                        for c in comments:
-                            if isinstance(c, dict):
-                                # 构造根评论映射并追加图片信息
-                                mapped = self._map_comment(c, level="根评论", author_id=author_id, default_location=global_default_location)
-                                mapped["评论内容"] = self._augment_comment_content(mapped["评论内容"], c, reply_target_name=None)
-                                cid = self._as_str(c.get("id"))
-                                root_seq.append({"id": cid, "mapped": mapped, "src": c})
-                                root_nickname_by_id[cid] = self._as_str((c.get("user") or {}).get("nickname"))
-
-            # 收集二级评论并按根评论ID归组
+                        page = [c for c in comments if isinstance(c, dict)]
+                        _append_rows(ds_cols, (self._map_comment(c, "根评论", author_id, global_default_location) for c in page))
+                        for c in page:
+                            cid = self._as_str(c.get("id"))
+                            root_seq.append((len(srcs), cid))
+                            srcs.append(c)
+                            root_nickname_by_id[cid] = self._as_str((c.get("user") or {}).get("nickname"))
+
+            # 收集二级评论并按根评论ID归组（值为临时列行号）
             replies_groups = ds.get("评论")
-            replies_by_root: Dict[str, List[Dict[str, Any]]] = {}
-            orphan_replies: List[Dict[str, Any]] = []
+            replies_by_root: Dict[str, List[int]] = {}
+            orphan_replies: List[int] = []
             if isinstance(replies_groups, list):
                 for rg in replies_groups:
                     if not isinstance(rg, dict):
@@ -264,46 +486,49 @@ class XHSCommentStructuredOutputComponent(Component):
                         data_node = rr.get("data") or {}
                         comments = data_node.get("comments") or []
                         if isinstance(comments, list):
-                            for c in comments:
-                                if isinstance(c, dict):
-                                    mapped = self._map_comment(c, level="二级评论", author_id=author_id, default_location=global_default_location)
-                                    # 回复对象稍后根据根评论昵称补充，同时追加图片信息
-                                    entry = {"mapped": mapped, "src": c, "root_id": root_id_key}
-                                    if root_id_key:
-                                        replies_by_root.setdefault(root_id_key, []).append(entry)
-                                    else:
-                                        orphan_replies.append(entry)
+                            page = [c for c in comments if isinstance(c, dict)]
+                            _append_rows(ds_cols, (self._map_comment(c, "二级评论", author_id, global_default_location) for c in page))
+                            for c in page:
+                                # 回复对象稍后根据根评论昵称补充，同时追加图片信息
+                                if root_id_key:
+                                    replies_by_root.setdefault(root_id_key, []).append(len(srcs))
+                                else:
+                                    orphan_replies.append(len(srcs))
+                                srcs.append(c)
 
             # 生成最终序列：根评论 -> 其对应的二级评论（带“回复某某”前缀）
-            for root in root_seq:
-                final_results.append(root["mapped"])
-                rid = root["id"]
+            content = ds_cols["评论内容"]
+            order: List[int] = []
+            for row, rid in root_seq:
+                content[row] = self._augment_comment_content(content[row], srcs[row], reply_target_name=None)
+                order.append(row)
                 root_nick = root_nickname_by_id.get(rid, "")
                 for rp in replies_by_root.get(rid, []):
                     # 为子评论补充“回复某某”并拼接图片URL
-                    rp_m = rp["mapped"]
-                    rp_m["评论内容"] = self._augment_comment_content(rp_m["评论内容"], rp["src"], reply_target_name=root_nick)
-                    final_results.append(rp_m)
+                    content[rp] = self._augment_comment_content(content[rp], srcs[rp], reply_target_name=root_nick)
+                    order.append(rp)
 
             # 将孤立的二级评论（无法定位根）放到最后一个根评论之后，若无根则直接附加
             if orphan_replies:
                 if root_seq:
                     # 取最后一个根的昵称用于“回复某某”前缀
-                    last_root_nick = root_nickname_by_id.get(root_seq[-1]["id"], "")
+                    last_root_nick = root_nickname_by_id.get(root_seq[-1][1], "")
                 else:
                     last_root_nick = ""
                 for rp in orphan_replies:
-                    rp_m = rp["mapped"]
-                    rp_m["评论内容"] = self._augment_comment_content(rp_m["评论内容"], rp["src"], reply_target_name=last_root_nick or None)
-                    final_results.append(rp_m)
+                    content[rp] = self._augment_comment_content(content[rp], srcs[rp], reply_target_name=last_root_nick or None)
+                    order.append(rp)
 
-        return final_results
+            for name, values in ds_cols.items():
+                columns[name].extend([values[i] for i in order])
+
+        return columns
 
     # -----------------------------
     # 输出：Data（Structure Output 类型）
     # -----------------------------
     def build_structured_output(self) -> Data:
-        output = self.build_structured_output_base()
+        output = self._structured_records()
         if not isinstance(output, list) or not output:
             msg = "No structured output returned"
             raise ValueError(msg)
@@ -315,10 +540,9 @@ class XHSCommentStructuredOutputComponent(Component):
     # 输出：DataFrame（便于列表展示）
     # -----------------------------
     def build_structured_dataframe(self) -> DataFrame:
-        output = self.build_structured_output_base()
-        if not isinstance(output, list) or not output:
+        # 直接由列构建：计数为 int64、布尔为 bool、发布时间为 datetime64，不经过逐行字典
+        columns = self._structured_columns()
+        if not _column_length(columns):
             msg = "No structured output returned"
             raise ValueError(msg)
-        if len(output) == 1:
-            return DataFrame([output[0]])
-        return DataFrame(output)
\ No newline at end of file
+        return DataFrame(_typed_column_arrays(self.COMMENT_FIELDS, columns, self.DATETIME_FIELDS))
\ No newline at end of file
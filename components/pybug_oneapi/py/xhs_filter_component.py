@@ -2,8 +2,9 @@ import json
 # 使用 Langflow 的标准组件基类（带有 build_results 等内部方法）
 from langflow.custom.custom_component.component import Component
 # 统一使用 lfx.io 提供的输入/输出类型，避免跨模块类型不一致
-from langflow.inputs.inputs import MessageInput
+from langflow.inputs.inputs import HandleInput
 from langflow.template import Output
+from langflow.schema.data import Data
 from langflow.schema.message import Message
 
 
@@ -14,15 +15,18 @@ class XHSFilterComponent(Component):
     name = "XHSFilter"
 
     inputs = [
-        MessageInput(
+        HandleInput(
             name="input_message",
             display_name="输入消息",
-            info="包含 JSON 数据的消息对象。",
+            info="包含 JSON 数据的消息对象，或携带字典的 Data（如 RedNote 组件输出，直接使用其中的对象，不经过文本序列化）。",
+            input_types=["Message", "Data"],
         ),
     ]
 
     outputs = [
         Output(display_name="过滤后的消息", name="filtered_message", method="filter_message"),
+        # 对象输出：过滤结果以字典原样交给下游（如结构化输出的“上游数据”），省去一次序列化与解析
+        Output(display_name="过滤后的数据", name="filtered_data", method="filter_data"),
     ]
 
     # === 通用过滤策略 ===
@@ -159,39 +163,48 @@ class XHSFilterComponent(Component):
             pass
         return filtered
 
-    def filter_message(self) -> Message:
+    def _input_text_for_echo(self) -> str:
+        """失败时原样回显的输入文本（仅在出错时才序列化）"""
         input_obj = self.input_message
-        original_text_content = ""
-        # 优先将输入转换为字符串形式，用于错误回显
-        if isinstance(input_obj, Message):
-            original_text_content = getattr(input_obj, "text", "")
-            if not original_text_content and isinstance(getattr(input_obj, "data", None), (dict, list)):
-                try:
-                    original_text_content = json.dumps(getattr(input_obj, "data"), ensure_ascii=False, indent=2)
-                except:
-                    pass
-        elif isinstance(input_obj, str):
-            original_text_content = input_obj
-        elif isinstance(input_obj, (dict, list)):
+        text = getattr(input_obj, "text", None)
+        if isinstance(text, str) and text:
+            return text
+        if isinstance(input_obj, str):
+            return input_obj
+        payload = input_obj if isinstance(input_obj, (dict, list)) else getattr(input_obj, "data", None)
+        if isinstance(payload, (dict, list)):
             try:
-                original_text_content = json.dumps(input_obj, ensure_ascii=False, indent=2)
-            except:
+                return json.dumps(payload, ensure_ascii=False, indent=2)
+            except Exception:
                 pass
+        return ""
 
+    def _filter_payload(self):
+        """过滤一次并在同一次运行内复用（消息输出与数据输出共用，按输入对象身份判定是否命中）。
+        返回过滤后的对象；输入无法解析时返回 None。"""
+        cached = getattr(self, "_filtered_cache", None)
+        if cached is not None and cached[0] is self.input_message:
+            return cached[1]
+        result = self._filter_input()
+        self._filtered_cache = (self.input_message, result)
+        return result
+
+    def _filter_input(self):
         data = None
         input_content = None
 
-        # 1. 从 Message 对象中提取核心内容（字符串或字典）
-        if isinstance(self.input_message, Message):
-            msg = self.input_message
-            text = getattr(msg, "text", None)
-            msg_data = getattr(msg, "data", None)
+        # 1. 从 Message / Data 对象中提取核心内容（字符串或字典）
+        #    有文本时使用文本；否则使用对象携带的字典（上游 Data 的活对象，无需再解析）
+        input_obj = self.input_message
+        if isinstance(input_obj, (str, dict, list)):
+            input_content = input_obj
+        elif input_obj is not None:
+            text = getattr(input_obj, "text", None)
+            obj_data = getattr(input_obj, "data", None)
             if isinstance(text, str) and text.strip():
                 input_content = text.strip()
-            elif isinstance(msg_data, (dict, list)):
-                input_content = msg_data
-        else:
-            input_content = self.input_message
+            elif isinstance(obj_data, (dict, list)):
+                input_content = obj_data
 
         # 2. 解析核心内容，得到 data 字典
         if isinstance(input_content, dict):
@@ -221,11 +234,11 @@ class XHSFilterComponent(Component):
                         data = json.loads(s2)
                     except Exception:
                         self.status = "输入的不是有效 JSON 字符串。"
-                        return Message(text=original_text_content)
+                        return None
 
-        if data is None:
+        if not isinstance(data, dict):
             self.status = "输入类型不正确或无法解析，应为 JSON 字符串或字典。"
-            return Message(text=original_text_content)
+            return None
 
         mode = data.get("模式")
 
@@ -242,7 +255,7 @@ class XHSFilterComponent(Component):
 
         if not mode:
             self.status = "未识别模式，原样输出。"
-            return Message(text=json.dumps(data, ensure_ascii=False, indent=2))
+            return data
 
         filtered_data = {}
         if "按关键词采集笔记" in mode:
@@ -253,7 +266,7 @@ class XHSFilterComponent(Component):
             filtered_data = self.filter_user_data(data)
         else:
             self.status = f"未识别模式，原样输出。模式值: {mode}"
-            return Message(text=json.dumps(data, ensure_ascii=False, indent=2))
+            return data
 
         # 保留顶部模式（如果未在过滤后出现，显式添加）
         if isinstance(data, dict) and "模式" in data and isinstance(filtered_data, dict):
@@ -284,4 +297,18 @@ class XHSFilterComponent(Component):
             }
 
         self.status = f"已根据“{mode}”模式完成过滤。"
-        return Message(text=json.dumps(filtered_data, ensure_ascii=False, indent=2))
\ No newline at end of file
+        return filtered_data
+
+    def filter_message(self) -> Message:
+        """文本输出：供需要文本的下游（文本输入框、聊天输出等）使用"""
+        filtered = self._filter_payload()
+        if filtered is None:
+            return Message(text=self._input_text_for_echo())
+        return Message(text=json.dumps(filtered, ensure_ascii=False, indent=2))
+
+    def filter_data(self) -> Data:
+        """对象输出：过滤结果（未识别模式时为输入对象本身）直接交给下游，不做序列化"""
+        filtered = self._filter_payload()
+        if filtered is None:
+            return Data(data={"text": self._input_text_for_echo()})
+        return Data(data=filtered)
@@ -8,7 +8,8 @@
 - 做好兜底：除非完全没有数据，否则不产生 null；字符串用空字符串，数值用 0，布尔用 False。
 
 输入：
-- input_json: 上游 JSON 字符串（或 Python 字典），支持 /components/pybug/final/search.filtered.json 的结构。
+- input_data: 上游组件输出的 Data / Message（优先使用；Data 携带的字典直接使用，不再经过 JSON 解析）。
+- input_json: 上游 JSON 字符串（或 Python 字典，作为备用通道），支持 /components/pybug/final/search.filtered.json 的结构。
 
 输出：
 - structured_output: Data（单条直接返回对象，多条以 {"results": [...]} 返回）
@@ -17,16 +18,175 @@
 
 from __future__ import annotations
 
+import functools
+import hashlib
 import json
+import pickle
 import re
-from typing import Any, Dict, List
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Tuple
 
+import numpy as np
 from langflow.custom.custom_component.component import Component
-from langflow.io import MultilineInput, Output
+from langflow.io import HandleInput, MultilineInput, Output
 from langflow.schema.data import Data
 from langflow.schema.dataframe import DataFrame
 
 
+# -----------------------------
+# 话题标签提取（XHS 采集、结构化输出与爬虫组件共用同一份实现，修改时请逐字同步）
+# 各组件输出的标签格式保持原样，这里只把各自的正则预编译为模块级常量，按格式名选用：
+# - "正文"（结构化输出的正文兜底）：# 之后到下一个 # 或换行为止，"#名称[话题]#" 得到 "名称[话题]"
+# - "成对"（XHS 采集）：成对 # 之间的内容，同样保留 "[话题]" 后缀
+# - "名称"（爬虫组件）：文本开头或空白之后的 #名称（全角＃视同半角），只取名称并去重
+# -----------------------------
+_HASHTAG_PATTERNS: Dict[str, "re.Pattern[str]"] = {
+    "正文": re.compile(r"#([^#\n\r]+)"),
+    "成对": re.compile(r"#([^#]+)#"),
+    "名称": re.compile(r"(?:^|\s)#([\w\-\u4e00-\u9fa5]+)"),
+}
+
+
+def _extract_hashtags(text: Any, style: str) -> List[str]:
+    """单段文本 -> 标签列表（格式见上）；非字符串或不含 # 的文本不进入正则"""
+    if not isinstance(text, str) or ("#" not in text and "＃" not in text):
+        return []
+    if style == "名称":
+        text = text.replace("＃", "#")
+    tags = [t for t in map(str.strip, _HASHTAG_PATTERNS[style].findall(text)) if t]
+    return list(dict.fromkeys(tags)) if style == "名称" else tags
+
+
+# -----------------------------
+# 列式结果（四个结构化输出组件共用同一份实现，修改时请逐字同步）
+# - 每条记录由组件的手写映射函数产出，字段顺序与列类型表一致，逐列追加
+# - 列类型表为 ((字段, 类型), ...)，顺序即输出字段顺序；DataFrame 中 int → int64（时间字段 → datetime64），
+#   bool → bool，其余类型的列保持原样
+# -----------------------------
+Columns = Dict[str, List[Any]]
+ColumnTypes = Tuple[Tuple[str, type], ...]
+
+
+def _empty_columns(column_types: ColumnTypes) -> Columns:
+    return {name: [] for name, _ in column_types}
+
+
+def _append_rows(columns: Columns, rows: Iterable[Dict[str, Any]]) -> None:
+    """记录逐列追加（记录的字段顺序须与 columns 一致）"""
+    appends = [col.append for col in columns.values()]
+    for row in rows:
+        for append, value in zip(appends, row.values()):
+            append(value)
+
+
+def _column_length(columns: Columns) -> int:
+    return len(next(iter(columns.values()), ()))
+
+
+def _rows_from_columns(columns: Columns) -> List[Dict[str, Any]]:
+    keys = list(columns)
+    return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
+
+def _typed_column_arrays(column_types: ColumnTypes, columns: Columns, datetime_fields: Iterable[str] = ()) -> Dict[str, Any]:
+    """按列类型表转换各列：int → int64（其中 datetime_fields → datetime64），bool → bool；其余列保持原样"""
+    datetime_fields = set(datetime_fields)
+    arrays: Dict[str, Any] = {}
+    for name, kind in column_types:
+        values = columns[name]
+        try:
+            if kind is int:
+                ints = np.fromiter(values, dtype=np.int64, count=len(values))
+                arrays[name] = _ts_to_datetime64(ints) if name in datetime_fields else ints
+            elif kind is bool:
+                arrays[name] = np.fromiter(values, dtype=np.bool_, count=len(values))
+            else:
+                arrays[name] = values
+        except (OverflowError, TypeError, ValueError):
+            # 超出 int64 等异常值：该列退回原始 Python 对象
+            arrays[name] = values
+    return arrays
+
+
+# -----------------------------
+# 时间戳归一化与格式化（各结构化输出组件共用同一份实现，修改时请逐字同步；XHS 采集组件只沿用同一毫秒阈值）
+# - 原始时间戳可能是秒级或毫秒级：大于 _MS_TS_THRESHOLD 视为毫秒
+# - 不少于 _TS_NUMPY_MIN_ROWS 条的整列用 NumPy 整数运算一次完成；单页规模的小列逐条换算，省去数组转换的固定开销
+# - 中文时间文本按秒级时间戳 LRU 缓存：同一时刻（重复数据、同批发布）只格式化一次
+# - 时间类型列（datetime64）与中文时间文本统一取本地时区的墙上时间，同一行两种输出一致
+# -----------------------------
+_MS_TS_THRESHOLD = 10**11
+_TS_NUMPY_MIN_ROWS = 128
+
+
+def _ts_seconds(ts: int) -> int:
+    return ts // 1000 if ts > _MS_TS_THRESHOLD else ts
+
+
+def _ts_seconds_list(ints: List[int]) -> List[int]:
+    """整数时间戳列（秒 / 毫秒混合）-> 秒级时间戳列；小列与超出 int64 的异常值逐条处理"""
+    if len(ints) < _TS_NUMPY_MIN_ROWS:
+        return [_ts_seconds(ts) for ts in ints]
+    try:
+        arr = np.asarray(ints, dtype=np.int64)
+    except OverflowError:
+        return [_ts_seconds(ts) for ts in ints]
+    return np.where(arr > _MS_TS_THRESHOLD, arr // 1000, arr).tolist()
+
+
+_EPOCH = datetime(1970, 1, 1)
+_MAX_TS_SECONDS = 253402300799  # 9999-12-31 23:59:59，datetime 可表示的上限
+
+
+@functools.lru_cache(maxsize=8192)
+def _local_utc_offset(ts: int) -> int:
+    """秒级时间戳处本地时区相对 UTC 的偏移（秒），与 datetime.fromtimestamp 的换算一致（含夏令时）"""
+    try:
+        delta = datetime.fromtimestamp(ts) - _EPOCH
+    except (OverflowError, OSError, ValueError):
+        return 0
+    return delta.days * 86400 + delta.seconds - ts
+
+
+def _ts_to_datetime64(ints: Any) -> Any:
+    """整数时间戳列 -> datetime64[s]，取本地时区的墙上时间（与 _format_ts_seconds 的文本一致）；
+    0、负数或超出范围视为缺失（NaT）"""
+    if len(ints) < _TS_NUMPY_MIN_ROWS:
+        secs = [_ts_seconds(ts) for ts in ints]
+        return np.array([s + _local_utc_offset(s) if 0 < s <= _MAX_TS_SECONDS else "NaT" for s in secs], dtype="datetime64[s]")
+    arr = np.asarray(ints, dtype=np.int64)
+    secs = np.where(arr > _MS_TS_THRESHOLD, arr // 1000, arr)
+    missing = (secs <= 0) | (secs > _MAX_TS_SECONDS)
+    secs = np.where(missing, 0, secs)
+    # 时区偏移按小时求一次：整小时首尾偏移相同时共用，跨夏令时切换的小时逐秒换算
+    hours, inverse = np.unique(secs // 3600, return_inverse=True)
+    start = np.array([_local_utc_offset(int(h) * 3600) for h in hours], dtype=np.int64)
+    end = np.array([_local_utc_offset(int(h) * 3600 + 3599) for h in hours], dtype=np.int64)
+    offsets = start[inverse]
+    for i in np.flatnonzero((start != end)[inverse]):
+        offsets[i] = _local_utc_offset(int(secs[i]))
+    out = (secs + offsets).astype("datetime64[s]")
+    out[missing] = np.datetime64("NaT")
+    return out
+
+
+@functools.lru_cache(maxsize=8192)
+def _format_ts_seconds(ts: int) -> str:
+    """秒级时间戳 -> “YYYY年MM月DD日 HH时MM分SS秒”（本地时区）；0、负数或超出范围返回空字符串"""
+    if ts <= 0:
+        return ""
+    try:
+        dt = datetime.fromtimestamp(ts)
+    except (OverflowError, OSError, ValueError):
+        return ""
+    return f"{dt.year}年{dt.month:02d}月{dt.day:02d}日 {dt.hour:02d}时{dt.minute:02d}分{dt.second:02d}秒"
+
+
+def _format_ts_column(ints: List[int]) -> List[str]:
+    """整数时间戳列整列格式化为中文时间文本"""
+    return [_format_ts_seconds(ts) for ts in _ts_seconds_list(ints)]
+
+
 class XHSSearchStructuredOutputComponent(Component):
     display_name = "小红书搜索结果结构化输出"
     description = "从小红书搜索原始 JSON 提取并输出结构化数据，避免依赖中文映射字段。"
@@ -35,12 +195,19 @@ class XHSSearchStructuredOutputComponent(Component):
     icon = "table"
 
     inputs = [
+        HandleInput(
+            name="input_data",
+            display_name="上游数据",
+            info="接收上游组件输出的 Data 或 Message（若存在则优先使用）。",
+            input_types=["Data", "Message"],
+            required=False,
+        ),
         MultilineInput(
             name="input_json",
-            display_name="输入JSON",
+            display_name="输入JSON（备用）",
             info="原始响应 JSON（字符串或对象），例如 search.filtered.json 的内容。",
             tool_mode=True,
-            required=True,
+            required=False,
         ),
     ]
 
@@ -57,11 +224,58 @@ class XHSSearchStructuredOutputComponent(Component):
         ),
     ]
 
+    # 输出字段与列类型（顺序即输出字段顺序，与 _map_note 产出的记录一致）
+    NOTE_FIELDS: ColumnTypes = (
+        ("标题", str),
+        ("点赞数", int),
+        ("评论数", int),
+        ("收藏数", int),
+        ("好看数", int),
+        ("分享数", int),
+        ("笔记类型", str),
+        ("笔记id", str),
+        ("笔记链接", str),
+        ("笔记正文", str),
+        ("笔记tag", str),
+        ("封面图链接", str),
+        ("视频链接", str),
+        ("发布时间", int),
+        ("作者昵称", str),
+        ("小红书号", str),
+        ("是否官方认证", bool),
+    )
+    # DataFrame 中按时间类型输出的字段（原始为秒 / 毫秒级时间戳）
+    DATETIME_FIELDS: Tuple[str, ...] = ("发布时间",)
+
     # -----------------------------
     # 公用：从输入解析为 Python 对象
     # -----------------------------
+    def _resolve_input_obj(self) -> Any:
+        # 优先使用上游句柄数据，其次使用备用字符串输入
+        obj: Any = None
+        payload = getattr(self, "input_data", None)
+        if payload is not None:
+            base = payload[0] if isinstance(payload, list) and payload else payload
+            if base is not None:
+                # Message 取其文本；Data 携带的字典/列表是上游的活对象，直接使用，不经过文本序列化与解析
+                text = getattr(base, "text", None)
+                live = getattr(base, "data", None)
+                if isinstance(text, str) and text.strip():
+                    obj = text
+                elif isinstance(live, (dict, list)) and live:
+                    obj = live
+                elif text is None and live is None:
+                    # 不是 Data / Message（如直接传入的字符串或字典）：原样使用；内容为空的 Data / Message 视为未连接
+                    obj = base
+        if obj is None:
+            obj = self.input_json
+        return obj
+
     def _parse_input(self) -> Dict[str, Any] | List[Any]:
-        obj = self.input_json
+        obj = self._resolve_input_obj()
+        if obj is None or (isinstance(obj, str) and not obj.strip()):
+            msg = "缺少输入：请连接上游数据，或在“输入JSON（备用）”中填写原始响应 JSON"
+            raise ValueError(msg)
         if isinstance(obj, (dict, list)):
             return obj
         if isinstance(obj, str):
@@ -73,6 +287,44 @@ class XHSSearchStructuredOutputComponent(Component):
         msg = "输入类型不支持：请提供 JSON 字符串或字典/列表"
         raise TypeError(msg)
 
+    # -----------------------------
+    # 公用：单次运行内缓存（两个输出共用同一份解析结果与映射记录，按输入内容判定是否命中）
+    # -----------------------------
+    def _input_key(self) -> Any:
+        """输入内容的比较键：文本输入即字符串本身；Data 携带的活对象取其序列化摘要，上游原地修改后不会命中旧结果"""
+        obj = self._resolve_input_obj()
+        if isinstance(obj, (str, bytes)):
+            return obj
+        try:
+            payload = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            payload = repr(obj).encode("utf-8", errors="replace")
+        return hashlib.blake2b(payload, digest_size=16).digest()
+
+    def _run_memo(self, slot: str, build: Callable[[], Any]) -> Any:
+        # 嵌套调用（记录 -> 列 -> 解析）沿用外层已算出的键，每次输出只计算一次
+        outer = getattr(self, "_memo_key", None)
+        key = outer if outer is not None else self._input_key()
+        cached = getattr(self, slot, None)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        self._memo_key = key
+        try:
+            value = build()
+        finally:
+            self._memo_key = outer
+        setattr(self, slot, (key, value))
+        return value
+
+    def _parsed_input(self) -> Dict[str, Any] | List[Any]:
+        return self._run_memo("_parsed_input_cache", self._parse_input)
+
+    def _structured_columns(self) -> Columns:
+        return self._run_memo("_columns_cache", self._build_columns)
+
+    def _structured_records(self) -> List[Dict[str, Any]]:
+        return self._run_memo("_records_cache", self.build_structured_output_base)
+
     # -----------------------------
     # 公用：安全取值与兜底
     # -----------------------------
@@ -104,6 +356,10 @@ class XHSSearchStructuredOutputComponent(Component):
         s = str(value).strip().lower()
         return s in {"true", "1", "yes", "y"}
 
+    @staticmethod
+    def _explore_link(note_id: str) -> str:
+        return f"https://www.xiaohongshu.com/explore/{note_id}" if note_id else ""
+
     # -----------------------------
     # 公用：提取图片 URL（封面）
     # -----------------------------
@@ -167,9 +423,7 @@ class XHSSearchStructuredOutputComponent(Component):
                             tags.append(name.strip())
         # 兜底：从正文里抓取 #xxx
         if not tags:
-            desc = self._as_str(note.get("desc"))
-            if desc:
-                tags += [m.strip() for m in re.findall(r"#([^#\n\r]+)", desc) if m.strip()]
+            tags = _extract_hashtags(note.get("desc"), "正文")
         # 去重后以分号拼接
         dedup = []
         for t in tags:
@@ -178,87 +432,39 @@ class XHSSearchStructuredOutputComponent(Component):
         return ";".join(dedup) if dedup else ""
 
     # -----------------------------
-    # 映射：将单条笔记转为目标结构（不显示作者详情开关）
+    # 映射：将单条笔记转为目标结构（不显示作者详情）
     # -----------------------------
-    def _map_note(self, note: Dict[str, Any], include_author_details: bool) -> Dict[str, Any]:
+    def _map_note(self, note: Dict[str, Any]) -> Dict[str, Any]:
         user = note.get("user") or {}
-        nickname = self._as_str(user.get("nickname"))
-        red_id = self._as_str(user.get("red_id"))
-        official_verified = self._as_bool(user.get("official_verified"))
-
-        title = self._as_str(note.get("title")) or self._as_str(note.get("display_title"))
-        desc = self._as_str(note.get("desc"))
-
-        like_count = self._as_int(note.get("liked_count")) or self._as_int(note.get("likes"))
-        comment_count = self._as_int(note.get("comments_count"))
-        collect_count = self._as_int(note.get("collected_count"))
-        nice_count = self._as_int(note.get("nice_count"))
-        share_count = self._as_int(note.get("shared_count")) or self._as_int(note.get("share_count"))
-        note_type = self._as_str(note.get("type"))
         note_id = self._as_str(note.get("id"))
-
-        link = f"https://www.xiaohongshu.com/explore/{note_id}" if note_id else ""
-        tags = self._extract_tags(note)
-        cover_url = self._extract_cover_url(note)
-        video_url = self._extract_video_url(note)
-        publish_time = self._as_int(note.get("timestamp")) or self._as_int(note.get("create_time"))
-
-        mapped: Dict[str, Any] = {
-            "标题": title,
-            "点赞数": like_count,
-            "评论数": comment_count,
-            "收藏数": collect_count,
-            "好看数": nice_count,
-            "分享数": share_count,
-            "笔记类型": note_type,
+        return {
+            "标题": self._as_str(note.get("title")) or self._as_str(note.get("display_title")),
+            "点赞数": self._as_int(note.get("liked_count")) or self._as_int(note.get("likes")),
+            "评论数": self._as_int(note.get("comments_count")),
+            "收藏数": self._as_int(note.get("collected_count")),
+            "好看数": self._as_int(note.get("nice_count")),
+            "分享数": self._as_int(note.get("shared_count")) or self._as_int(note.get("share_count")),
+            "笔记类型": self._as_str(note.get("type")),
             "笔记id": note_id,
-            "笔记链接": link,
-            "笔记正文": desc,
-            "笔记tag": tags,
-            "封面图链接": cover_url,
-            "视频链接": video_url,
-            "发布时间": publish_time,
-            "作者昵称": nickname,
-            "小红书号": red_id,
-            "是否官方认证": official_verified,
+            "笔记链接": self._explore_link(note_id),
+            "笔记正文": self._as_str(note.get("desc")),
+            "笔记tag": self._extract_tags(note),
+            "封面图链接": self._extract_cover_url(note),
+            "视频链接": self._extract_video_url(note),
+            "发布时间": self._as_int(note.get("timestamp")) or self._as_int(note.get("create_time")),
+            "作者昵称": self._as_str(user.get("nickname")),
+            "小红书号": self._as_str(user.get("red_id")),
+            "是否官方认证": self._as_bool(user.get("official_verified")),
         }
 
-        # 是否包含作者详细信息：默认不选（False）时不显示以下四个字段
-        if include_author_details:
-            user_id = self._as_str(user.get("userid"))
-            author_home = f"https://www.xiaohongshu.com/user/profile/{user_id}" if user_id else ""
-            # 无站内详情数据时兜底为空或 0
-            mapped.update({
-                "作者粉丝数": 0,
-                "作者获赞与收藏数": 0,
-                "作者简介": "",
-                "作者主页链接": author_home,
-            })
-
-            # 如果四项都为空（或 0），则不显示它们
-            author_fields = [
-                mapped.get("作者粉丝数"),
-                mapped.get("作者获赞与收藏数"),
-                mapped.get("作者简介"),
-                mapped.get("作者主页链接"),
-            ]
-            all_empty = (
-                (self._as_int(author_fields[0]) == 0)
-                and (self._as_int(author_fields[1]) == 0)
-                and (self._as_str(author_fields[2]) == "")
-                and (self._as_str(author_fields[3]) == "")
-            )
-            if all_empty:
-                for k in ("作者粉丝数", "作者获赞与收藏数", "作者简介", "作者主页链接"):
-                    mapped.pop(k, None)
-
-        return mapped
-
     # -----------------------------
-    # 核心：构建结构化数据（列表）
+    # 核心：构建结构化数据（按列写入，记录列表与 DataFrame 都由列生成）
     # -----------------------------
     def build_structured_output_base(self) -> List[Dict[str, Any]]:
-        doc = self._parse_input()
+        return _rows_from_columns(self._structured_columns())
+
+    def _build_columns(self) -> Columns:
+        doc = self._parsed_input()
 
         # 顶层可能是 dict（含“数据”数组）或直接是列表/字典
         datasets: List[Dict[str, Any]] = []
@@ -273,7 +479,7 @@ class XHSSearchStructuredOutputComponent(Component):
 
         # 输出模式不在结果中显示，故不处理
 
-        final_results: List[Dict[str, Any]] = []
+        columns = _empty_columns(self.NOTE_FIELDS)
 
         for ds in datasets:
             raw = ds.get("原始")
@@ -290,21 +496,16 @@ class XHSSearchStructuredOutputComponent(Component):
                 items = data_node.get("items") or []
                 if not isinstance(items, list):
                     continue
-                for it in items:
-                    if not isinstance(it, dict):
-                        continue
-                    note = it.get("note")
-                    if isinstance(note, dict):
-                        mapped = self._map_note(note, include_author_details=False)
-                        final_results.append(mapped)
+                notes = (it.get("note") for it in items if isinstance(it, dict))
+                _append_rows(columns, (self._map_note(n) for n in notes if isinstance(n, dict)))
 
-        return final_results
+        return columns
 
     # -----------------------------
     # 输出：Data（Structure Output 类型）
     # -----------------------------
     def build_structured_output(self) -> Data:
-        output = self.build_structured_output_base()
+        output = self._structured_records()
         if not isinstance(output, list) or not output:
             msg = "No structured output returned"
             raise ValueError(msg)
@@ -316,10 +517,9 @@ class XHSSearchStructuredOutputComponent(Component):
     # 输出：DataFrame（便于列表展示）
     # -----------------------------
     def build_structured_dataframe(self) -> DataFrame:
-        output = self.build_structured_output_base()
-        if not isinstance(output, list) or not output:
+        # 直接由列构建：计数为 int64、布尔为 bool、发布时间为 datetime64，不经过逐行字典
+        columns = self._structured_columns()
+        if not _column_length(columns):
             msg = "No structured output returned"
             raise ValueError(msg)
-        if len(output) == 1:
-            return DataFrame([output[0]])
-        return DataFrame(output)
\ No newline at end of file
+        return DataFrame(_typed_column_arrays(self.NOTE_FIELDS, columns, self.DATETIME_FIELDS))
\ No newline at end of file
@@ -26,17 +26,287 @@
 
 from __future__ import annotations
 
+import functools
+import hashlib
 import json
+import pickle
 import re
-from typing import Any, Dict, List, Tuple
 from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
+import numpy as np
 from langflow.custom.custom_component.component import Component
 from langflow.io import HandleInput, MultilineInput, Output
 from langflow.schema.data import Data
 from langflow.schema.dataframe import DataFrame
 
 
+# 容错解析用到的正则：代码块包裹的 JSON；\t \n \r 以外的控制字符
+_CODE_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*\})\s*```", re.DOTALL)
+_ODD_CTRL_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+# 流式解析用到的正则：JSON 空白、字符串字面量、跳过容器时关心的记号（字符串整体匹配以忽略其中的括号）
+_JSON_WS_RE = re.compile(r"[ \t\n\r]*")
+_JSON_STRING_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_JSON_SKIP_TOKEN_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{}]', re.DOTALL)
+
+
+class _JsonStream:
+    """JSON 文本上的游标：逐个枚举对象成员 / 数组元素，只解码调用方需要的值，其余按括号深度跳过。
+    调用方解码了某个值时，把结束位置追加到随之产出的 done 列表，游标据此继续；否则自动跳过该值。
+    遇到任何格式问题抛出 ValueError，由调用方回退到完整解析。"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self._decoder = json.JSONDecoder(strict=False)
+        # 最近一个枚举完毕的对象 / 数组的结束位置
+        self.last_end = -1
+
+    def ws(self, pos: int) -> int:
+        return _JSON_WS_RE.match(self.text, pos).end()
+
+    def peek(self, pos: int) -> str:
+        return self.text[pos] if pos < len(self.text) else ""
+
+    def decode(self, pos: int) -> Tuple[Any, int]:
+        try:
+            return self._decoder.raw_decode(self.text, pos)
+        except json.JSONDecodeError as e:
+            raise ValueError(str(e)) from e
+
+    def skip(self, pos: int) -> int:
+        text = self.text
+        ch = self.peek(pos)
+        if ch == '"':
+            m = _JSON_STRING_RE.match(text, pos)
+            if m is None:
+                raise ValueError(f"字符串未闭合: {pos}")
+            return m.end()
+        if ch in ("{", "["):
+            depth = 0
+            for m in _JSON_SKIP_TOKEN_RE.finditer(text, pos):
+                tok = m.group()
+                if tok[0] == '"':
+                    continue
+                if tok in "{[":
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        return m.end()
+            raise ValueError(f"容器未闭合: {pos}")
+        return self.decode(pos)[1]
+
+    def _entries(self, pos: int, open_ch: str, close_ch: str, keyed: bool) -> Iterator[Tuple[str, int, List[int]]]:
+        text = self.text
+        if self.peek(pos) != open_ch:
+            raise ValueError(f"期望 {open_ch}: {pos}")
+        pos = self.ws(pos + 1)
+        if self.peek(pos) == close_ch:
+            self.last_end = pos + 1
+            return
+        while True:
+            key = ""
+            if keyed:
+                m = _JSON_STRING_RE.match(text, pos)
+                if m is None:
+                    raise ValueError(f"期望键名: {pos}")
+                raw_key = m.group()
+                key = raw_key[1:-1] if "\\" not in raw_key else json.loads(raw_key)
+                pos = self.ws(m.end())
+                if self.peek(pos) != ":":
+                    raise ValueError(f"期望冒号: {pos}")
+                pos = self.ws(pos + 1)
+            done: List[int] = []
+            yield key, pos, done
+            pos = self.ws(done[0] if done else self.skip(pos))
+            ch = self.peek(pos)
+            if ch == ",":
+                pos = self.ws(pos + 1)
+            elif ch == close_ch:
+                self.last_end = pos + 1
+                return
+            else:
+                raise ValueError(f"期望 , 或 {close_ch}: {pos}")
+
+    def members(self, pos: int) -> Iterator[Tuple[str, int, List[int]]]:
+        """对象成员：产出 (键, 值起始位置, done)"""
+        return self._entries(pos, "{", "}", keyed=True)
+
+    def elements(self, pos: int) -> Iterator[Tuple[str, int, List[int]]]:
+        """数组元素：产出 ("", 元素起始位置, done)"""
+        return self._entries(pos, "[", "]", keyed=False)
+
+    def decoded_dicts(self, pos: int) -> Iterator[Dict[str, Any]]:
+        """逐个解码数组中的对象元素（非对象元素跳过）；pos 处为对象时只产出它本身。
+        迭代完毕后 last_end 为该值的结束位置"""
+        if self.peek(pos) == "{":
+            value, end = self.decode(pos)
+            self.last_end = end
+            yield value
+            return
+        for _, epos, done in self.elements(pos):
+            if self.peek(epos) == "{":
+                value, end = self.decode(epos)
+                done.append(end)
+                yield value
+
+
+# -----------------------------
+# 话题标签提取（XHS 采集、结构化输出与爬虫组件共用同一份实现，修改时请逐字同步）
+# 各组件输出的标签格式保持原样，这里只把各自的正则预编译为模块级常量，按格式名选用：
+# - "正文"（结构化输出的正文兜底）：# 之后到下一个 # 或换行为止，"#名称[话题]#" 得到 "名称[话题]"
+# - "成对"（XHS 采集）：成对 # 之间的内容，同样保留 "[话题]" 后缀
+# - "名称"（爬虫组件）：文本开头或空白之后的 #名称（全角＃视同半角），只取名称并去重
+# -----------------------------
+_HASHTAG_PATTERNS: Dict[str, "re.Pattern[str]"] = {
+    "正文": re.compile(r"#([^#\n\r]+)"),
+    "成对": re.compile(r"#([^#]+)#"),
+    "名称": re.compile(r"(?:^|\s)#([\w\-\u4e00-\u9fa5]+)"),
+}
+
+
+def _extract_hashtags(text: Any, style: str) -> List[str]:
+    """单段文本 -> 标签列表（格式见上）；非字符串或不含 # 的文本不进入正则"""
+    if not isinstance(text, str) or ("#" not in text and "＃" not in text):
+        return []
+    if style == "名称":
+        text = text.replace("＃", "#")
+    tags = [t for t in map(str.strip, _HASHTAG_PATTERNS[style].findall(text)) if t]
+    return list(dict.fromkeys(tags)) if style == "名称" else tags
+
+
+# -----------------------------
+# 列式结果（四个结构化输出组件共用同一份实现，修改时请逐字同步）
+# - 每条记录由组件的手写映射函数产出，字段顺序与列类型表一致，逐列追加
+# - 列类型表为 ((字段, 类型), ...)，顺序即输出字段顺序；DataFrame 中 int → int64（时间字段 → datetime64），
+#   bool → bool，其余类型的列保持原样
+# -----------------------------
+Columns = Dict[str, List[Any]]
+ColumnTypes = Tuple[Tuple[str, type], ...]
+
+
+def _empty_columns(column_types: ColumnTypes) -> Columns:
+    return {name: [] for name, _ in column_types}
+
+
+def _append_rows(columns: Columns, rows: Iterable[Dict[str, Any]]) -> None:
+    """记录逐列追加（记录的字段顺序须与 columns 一致）"""
+    appends = [col.append for col in columns.values()]
+    for row in rows:
+        for append, value in zip(appends, row.values()):
+            append(value)
+
+
+def _column_length(columns: Columns) -> int:
+    return len(next(iter(columns.values()), ()))
+
+
+def _rows_from_columns(columns: Columns) -> List[Dict[str, Any]]:
+    keys = list(columns)
+    return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
+
+def _typed_column_arrays(column_types: ColumnTypes, columns: Columns, datetime_fields: Iterable[str] = ()) -> Dict[str, Any]:
+    """按列类型表转换各列：int → int64（其中 datetime_fields → datetime64），bool → bool；其余列保持原样"""
+    datetime_fields = set(datetime_fields)
+    arrays: Dict[str, Any] = {}
+    for name, kind in column_types:
+        values = columns[name]
+        try:
+            if kind is int:
+                ints = np.fromiter(values, dtype=np.int64, count=len(values))
+                arrays[name] = _ts_to_datetime64(ints) if name in datetime_fields else ints
+            elif kind is bool:
+                arrays[name] = np.fromiter(values, dtype=np.bool_, count=len(values))
+            else:
+                arrays[name] = values
+        except (OverflowError, TypeError, ValueError):
+            # 超出 int64 等异常值：该列退回原始 Python 对象
+            arrays[name] = values
+    return arrays
+
+
+# -----------------------------
+# 时间戳归一化与格式化（各结构化输出组件共用同一份实现，修改时请逐字同步；XHS 采集组件只沿用同一毫秒阈值）
+# - 原始时间戳可能是秒级或毫秒级：大于 _MS_TS_THRESHOLD 视为毫秒
+# - 不少于 _TS_NUMPY_MIN_ROWS 条的整列用 NumPy 整数运算一次完成；单页规模的小列逐条换算，省去数组转换的固定开销
+# - 中文时间文本按秒级时间戳 LRU 缓存：同一时刻（重复数据、同批发布）只格式化一次
+# - 时间类型列（datetime64）与中文时间文本统一取本地时区的墙上时间，同一行两种输出一致
+# -----------------------------
+_MS_TS_THRESHOLD = 10**11
+_TS_NUMPY_MIN_ROWS = 128
+
+
+def _ts_seconds(ts: int) -> int:
+    return ts // 1000 if ts > _MS_TS_THRESHOLD else ts
+
+
+def _ts_seconds_list(ints: List[int]) -> List[int]:
+    """整数时间戳列（秒 / 毫秒混合）-> 秒级时间戳列；小列与超出 int64 的异常值逐条处理"""
+    if len(ints) < _TS_NUMPY_MIN_ROWS:
+        return [_ts_seconds(ts) for ts in ints]
+    try:
+        arr = np.asarray(ints, dtype=np.int64)
+    except OverflowError:
+        return [_ts_seconds(ts) for ts in ints]
+    return np.where(arr > _MS_TS_THRESHOLD, arr // 1000, arr).tolist()
+
+
+_EPOCH = datetime(1970, 1, 1)
+_MAX_TS_SECONDS = 253402300799  # 9999-12-31 23:59:59，datetime 可表示的上限
+
+
+@functools.lru_cache(maxsize=8192)
+def _local_utc_offset(ts: int) -> int:
+    """秒级时间戳处本地时区相对 UTC 的偏移（秒），与 datetime.fromtimestamp 的换算一致（含夏令时）"""
+    try:
+        delta = datetime.fromtimestamp(ts) - _EPOCH
+    except (OverflowError, OSError, ValueError):
+        return 0
+    return delta.days * 86400 + delta.seconds - ts
+
+
+def _ts_to_datetime64(ints: Any) -> Any:
+    """整数时间戳列 -> datetime64[s]，取本地时区的墙上时间（与 _format_ts_seconds 的文本一致）；
+    0、负数或超出范围视为缺失（NaT）"""
+    if len(ints) < _TS_NUMPY_MIN_ROWS:
+        secs = [_ts_seconds(ts) for ts in ints]
+        return np.array([s + _local_utc_offset(s) if 0 < s <= _MAX_TS_SECONDS else "NaT" for s in secs], dtype="datetime64[s]")
+    arr = np.asarray(ints, dtype=np.int64)
+    secs = np.where(arr > _MS_TS_THRESHOLD, arr // 1000, arr)
+    missing = (secs <= 0) | (secs > _MAX_TS_SECONDS)
+    secs = np.where(missing, 0, secs)
+    # 时区偏移按小时求一次：整小时首尾偏移相同时共用，跨夏令时切换的小时逐秒换算
+    hours, inverse = np.unique(secs // 3600, return_inverse=True)
+    start = np.array([_local_utc_offset(int(h) * 3600) for h in hours], dtype=np.int64)
+    end = np.array([_local_utc_offset(int(h) * 3600 + 3599) for h in hours], dtype=np.int64)
+    offsets = start[inverse]
+    for i in np.flatnonzero((start != end)[inverse]):
+        offsets[i] = _local_utc_offset(int(secs[i]))
+    out = (secs + offsets).astype("datetime64[s]")
+    out[missing] = np.datetime64("NaT")
+    return out
+
+
+@functools.lru_cache(maxsize=8192)
+def _format_ts_seconds(ts: int) -> str:
+    """秒级时间戳 -> “YYYY年MM月DD日 HH时MM分SS秒”（本地时区）；0、负数或超出范围返回空字符串"""
+    if ts <= 0:
+        return ""
+    try:
+        dt = datetime.fromtimestamp(ts)
+    except (OverflowError, OSError, ValueError):
+        return ""
+    return f"{dt.year}年{dt.month:02d}月{dt.day:02d}日 {dt.hour:02d}时{dt.minute:02d}分{dt.second:02d}秒"
+
+
+def _format_ts_column(ints: List[int]) -> List[str]:
+    """整数时间戳列整列格式化为中文时间文本"""
+    return [_format_ts_seconds(ts) for ts in _ts_seconds_list(ints)]
+
+
 class XHSUnifiedStructuredOutputComponent(Component):
     display_name = "小红书统一结构化输出"
     description = "根据输入自动识别模式并输出与原组件完全一致的结构化数据。"
@@ -74,6 +344,68 @@ class XHSUnifiedStructuredOutputComponent(Component):
         ),
     ]
 
+    # 解析控制（不影响前台选项）：字符串输入不少于 STREAM_PARSE_MIN_CHARS 个字符时，
+    # 按 数据[*].原始 / 数据[*].评论[*] 逐页流式解码并立即映射，不构建整棵 JSON 树
+    STREAM_PARSE_MIN_CHARS: int = 1_000_000
+    # 前缀嗅探（不影响前台选项）：只读取输入前 SNIFF_PREFIX_CHARS 个字符判断 模式 / 环境 与是否为内嵌包装
+    SNIFF_PREFIX_CHARS: int = 8192
+
+    # 列类型表（顺序即输出字段顺序），与三个单模式组件的列一一对应，仅展示格式不同
+    SEARCH_NOTE_FIELDS: ColumnTypes = (
+        ("标题", str),
+        ("点赞数", int),
+        ("评论数", int),
+        ("收藏数", int),
+        ("好看数", int),
+        ("分享数", int),
+        ("笔记类型", str),
+        ("笔记id", str),
+        ("笔记链接", str),
+        ("笔记正文", str),
+        ("笔记tag", str),
+        ("封面图链接", str),
+        ("视频链接", str),
+        # 映射时保留原始时间戳，整列格式化见 YMDHMS_FIELDS
+        ("发布时间", int),
+        ("作者昵称", str),
+        ("小红书号", str),
+        ("是否官方认证", str),
+    )
+    USER_NOTE_FIELDS: ColumnTypes = (
+        ("用户昵称", str),
+        ("笔记ID", str),
+        ("笔记链接", str),
+        ("笔记标题", str),
+        ("笔记正文", str),
+        ("点赞数", int),
+        ("评论数", int),
+        ("收藏数", int),
+        ("好看数", int),
+        ("分享次数", int),
+        ("笔记图片链接", str),
+        ("浏览数", int),
+        ("发布时间", int),
+        ("是否是商品笔记", bool),
+        ("笔记类型", str),
+    )
+    COMMENT_FIELDS: ColumnTypes = (
+        ("昵称", str),
+        ("评论内容", str),
+        ("点赞数", int),
+        ("发布时间", int),
+        ("发布地点", str),
+        ("评论级别", str),
+        ("用户昵称", str),
+        ("小红书号", str),
+        ("作者ID", str),
+        ("是否官方认证", str),
+    )
+    KIND_FIELD_SPECS: Dict[str, str] = {"search": "SEARCH_NOTE_FIELDS", "usernotes": "USER_NOTE_FIELDS", "comment": "COMMENT_FIELDS"}
+    # DataFrame 中按时间类型输出的字段（原始时间戳列）
+    DATETIME_FIELDS: Tuple[str, ...] = ("发布时间",)
+    # 按字段规格名列出需整列格式化为“YYYY年MM月DD日 HH时MM分SS秒”的时间戳字段（Data 与 DataFrame 均输出文本）
+    YMDHMS_FIELDS: Dict[str, Tuple[str, ...]] = {"SEARCH_NOTE_FIELDS": ("发布时间",)}
+
     # -----------------------------
     # 公用：安全取值与兜底
     # -----------------------------
@@ -105,23 +437,35 @@ class XHSUnifiedStructuredOutputComponent(Component):
         s = str(value).strip().lower()
         return s in {"true", "1", "yes", "y"}
 
+    @staticmethod
+    def _yes_no(flag: bool) -> str:
+        return "是" if flag else "否"
+
+    @staticmethod
+    def _note_type_label(note_type: str) -> str:
+        # 类型显示规则：normal → 图文笔记；video → 视频笔记；其他保持原值
+        if note_type == "normal":
+            return "图文笔记"
+        if note_type == "video":
+            return "视频笔记"
+        return note_type
+
+    @staticmethod
+    def _explore_link(note_id: str) -> str:
+        return f"https://www.xiaohongshu.com/explore/{note_id}" if note_id else ""
+
     @staticmethod
     def _format_ts_to_ymdhms(value: Any) -> str:
         """
         将时间戳格式化为中文的“YYYY年MM月DD日 HH时MM分SS秒”。
         - 支持秒或毫秒级时间戳；当值无效或为0时返回空字符串。
+        - 单值入口；整列请用 _ymdhms_columns（NumPy 一次归一化）。
         """
-        try:
-            ts = XHSUnifiedStructuredOutputComponent._as_int(value)
-            if ts <= 0:
-                return ""
-            # 毫秒级时间戳容错
-            if ts > 10**11:
-                ts = ts // 1000
-            dt = datetime.fromtimestamp(ts)
-            return f"{dt.year}年{dt.month:02d}月{dt.day:02d}日 {dt.hour:02d}时{dt.minute:02d}分{dt.second:02d}秒"
-        except Exception:
-            return ""
+        return _format_ts_seconds(_ts_seconds(XHSUnifiedStructuredOutputComponent._as_int(value)))
+
+    def _ymdhms_columns(self, specs_name: str, columns: Columns) -> Columns:
+        """YMDHMS_FIELDS 中的时间戳列整列格式化为中文时间文本，返回 {字段: 文本列}"""
+        return {name: _format_ts_column(columns[name]) for name in self.YMDHMS_FIELDS.get(specs_name, ())}
 
     # -----------------------------
     # 公用：提取图片 URL（评论/用户笔记使用）
@@ -191,13 +535,25 @@ class XHSUnifiedStructuredOutputComponent(Component):
     @staticmethod
     def _safe_json_loads_from_string(obj_str: str) -> Any:
         s = obj_str.strip()
-        m = re.search(r"```(?:json)?\s*(\{.*\})\s*```", s, re.DOTALL)
+        m = _CODE_FENCE_RE.search(s) if "```" in s else None
         if m:
             s = m.group(1)
         first = s.find("{")
         last = s.rfind("}")
         candidate = s[first:last + 1] if first != -1 and last != -1 and last > first else s
         candidate = candidate.lstrip("\ufeff")
+        # 第一层：严格解析（绝大多数上游 JSON 本身合法）
+        try:
+            return json.loads(candidate)
+        except json.JSONDecodeError:
+            pass
+        # 第二层：仅含 \n \r \t 控制字符时，strict=False 直接接受字符串内的原始换行/制表符，结果与逐字符转义后解析一致
+        if not _ODD_CTRL_RE.search(candidate):
+            try:
+                return json.loads(candidate, strict=False)
+            except json.JSONDecodeError:
+                pass
+        # 第三层：逐字符转义字符串内的控制字符，再依次尝试修复尾逗号、单引号
         candidate2 = XHSUnifiedStructuredOutputComponent._escape_ctrl_in_strings(candidate)
         try:
             return json.loads(candidate2)
@@ -225,21 +581,60 @@ class XHSUnifiedStructuredOutputComponent(Component):
     # 备注：若输入为字符串，严格从首个“{”开始解析。
     #       若输入为 dict，优先解析 results.text.data.text 内嵌 JSON（user.filtered.json 包装场景）。
     # -----------------------------
-    def _parse_doc_and_detect_mode(self) -> Tuple[Dict[str, Any] | List[Any], str]:
+    def _resolve_input_obj(self) -> Any:
         # 优先使用上游句柄数据，其次使用备用字符串输入
         obj: Any = None
         payload = getattr(self, "input_data", None)
         if payload is not None:
             base = payload[0] if isinstance(payload, list) and payload else payload
             if base is not None:
-                if hasattr(base, "data"):
-                    obj = getattr(base, "data")
-                elif hasattr(base, "text"):
-                    obj = getattr(base, "text")
-                else:
+                # Message 取其文本；Data 携带的字典/列表是上游的活对象，直接使用，不经过文本序列化与解析
+                text = getattr(base, "text", None)
+                live = getattr(base, "data", None)
+                if isinstance(text, str) and text.strip():
+                    obj = text
+                elif isinstance(live, (dict, list)) and live:
+                    obj = live
+                elif text is None and live is None:
+                    # 不是 Data / Message（如直接传入的字符串或字典）：原样使用；内容为空的 Data / Message 视为未连接
                     obj = base
         if obj is None:
             obj = self.input_json
+        return obj
+
+    def _sniff_top_fields(self, obj: str | bytes | bytearray) -> Optional[Dict[str, Any]]:
+        """只看输入前缀，读出首个嵌套值之前的顶层标量字段（上游输出中 模式、环境 总在 数据 之前）。
+        遇到嵌套值时只记录键名（值为 None）并停止；前缀被截断或格式不规整时返回已读到的部分。
+        输入中完全不含“{”时返回 None：这类输入无论如何修复都不会产出记录，调用方可直接返回空结果。"""
+        if isinstance(obj, (bytes, bytearray)):
+            if b"{" not in obj:
+                return None
+            prefix = bytes(obj[:self.SNIFF_PREFIX_CHARS]).decode("utf-8", errors="ignore")
+        else:
+            if "{" not in obj:
+                return None
+            prefix = obj[:self.SNIFF_PREFIX_CHARS]
+        fields: Dict[str, Any] = {}
+        first = prefix.find("{")
+        if first == -1 or prefix[:first].strip("\ufeff \t\n\r"):
+            return fields
+        stream = _JsonStream(prefix)
+        try:
+            for key, vpos, done in stream.members(first):
+                if stream.peek(vpos) in ("{", "["):
+                    fields[key] = None
+                    break
+                value, end = stream.decode(vpos)
+                done.append(end)
+                fields[key] = value
+        except (ValueError, IndexError, RecursionError):
+            pass
+        return fields
+
+    def _parse_doc_and_detect_mode(self) -> Tuple[Dict[str, Any] | List[Any], str]:
+        obj = self._resolve_input_obj()
+        if isinstance(obj, (bytes, bytearray)):
+            obj = bytes(obj).decode("utf-8", errors="replace")
 
         # 1) 字符串：容错解析
         if isinstance(obj, str):
@@ -291,24 +686,106 @@ class XHSUnifiedStructuredOutputComponent(Component):
     def _map_comment(self, comment: Dict[str, Any], level: str, author_id: str, default_location: str) -> Dict[str, Any]:
         user = comment.get("user") or {}
         nickname = self._as_str(user.get("nickname"))
-        red_id = self._as_str(user.get("red_id"))
-        official_verified = self._as_bool(user.get("official_verified"))
-        official_verified_str = "是" if official_verified else "否"
-
         return {
             "昵称": nickname,
             "评论内容": self._as_str(comment.get("content")),
             "点赞数": self._as_int(comment.get("like_count")),
             "发布时间": self._as_int(comment.get("time")),
-            "发布地点": (self._as_str(comment.get("ip_location")) or self._as_str(default_location)),
+            "发布地点": self._as_str(comment.get("ip_location")) or self._as_str(default_location),
             "评论级别": level,
             "用户昵称": nickname,
-            "小红书号": red_id,
+            "小红书号": self._as_str(user.get("red_id")),
             "作者ID": self._as_str(author_id),
-            "是否官方认证": official_verified_str,
+            "是否官方认证": self._yes_no(self._as_bool(user.get("official_verified"))),
         }
 
-    def _build_comment_base(self, doc: Dict[str, Any] | List[Any]) -> List[Dict[str, Any]]:
+    def _build_comment_dataset(
+        self,
+        raw_list: Iterable[Any],
+        replies_groups: Iterable[Any],
+        global_default_location: str,
+        columns: Columns,
+    ) -> None:
+        """单个数据集（一条笔记）的评论追加到 columns：根评论按原始分页顺序，二级评论挂在各自根评论之后；
+        raw_list / replies_groups 可以是列表，也可以是流式解析逐个产出的元素"""
+        # 根评论与二级评论先按出现顺序写入临时列，最后按输出顺序取行
+        ds_cols = _empty_columns(self.COMMENT_FIELDS)
+        srcs: List[Dict[str, Any]] = []
+        author_id = ""
+        root_seq: List[Tuple[int, str]] = []
+        root_nickname_by_id: Dict[str, str] = {}
+
+        for raw in raw_list:
+            if not isinstance(raw, dict):
+                continue
+            if raw.get("code") != 0:
+                continue
+            data_node = raw.get("data") or {}
+            if not isinstance(data_node, dict):
+                continue
+            author_id = self._as_str(data_node.get("user_id")) or author_id
+            comments = data_node.get("comments") or []
+            if isinstance(comments, list):
+                page = [c for c in comments if isinstance(c, dict)]
+                _append_rows(ds_cols, (self._map_comment(c, "根评论", author_id, global_default_location) for c in page))
+                for c in page:
+                    cid = self._as_str(c.get("id"))
+                    root_seq.append((len(srcs), cid))
+                    srcs.append(c)
+                    root_nickname_by_id[cid] = self._as_str((c.get("user") or {}).get("nickname"))
+
+        # 二级评论先收集，待根评论（及作者ID）全部就绪后再整批写入
+        pending_replies: List[Tuple[Dict[str, Any], str]] = []
+        for rg in replies_groups:
+            if not isinstance(rg, dict):
+                continue
+            root_id_cn = rg.get("评论ID")
+            root_id_key = self._as_str(root_id_cn) if root_id_cn is not None else ""
+            raw_replies = rg.get("二级评论原始响应")
+            if not isinstance(raw_replies, list):
+                continue
+            for rr in raw_replies:
+                if not isinstance(rr, dict):
+                    continue
+                if rr.get("code") != 0:
+                    continue
+                data_node = rr.get("data") or {}
+                comments = data_node.get("comments") or []
+                if isinstance(comments, list):
+                    for c in comments:
+                        if isinstance(c, dict):
+                            pending_replies.append((c, root_id_key))
+
+        replies_by_root: Dict[str, List[int]] = {}
+        orphan_replies: List[int] = []
+        _append_rows(ds_cols, (self._map_comment(c, "二级评论", author_id, global_default_location) for c, _ in pending_replies))
+        for c, root_id_key in pending_replies:
+            if root_id_key:
+                replies_by_root.setdefault(root_id_key, []).append(len(srcs))
+            else:
+                orphan_replies.append(len(srcs))
+            srcs.append(c)
+
+        content = ds_cols["评论内容"]
+        order: List[int] = []
+        for row, rid in root_seq:
+            content[row] = self._augment_comment_content(content[row], srcs[row], reply_target_name=None)
+            order.append(row)
+            root_nick = root_nickname_by_id.get(rid, "")
+            for rp in replies_by_root.get(rid, []):
+                content[rp] = self._augment_comment_content(content[rp], srcs[rp], reply_target_name=root_nick)
+                order.append(rp)
+
+        if orphan_replies:
+            last_root_nick = root_nickname_by_id.get(root_seq[-1][1], "") if root_seq else ""
+            for rp in orphan_replies:
+                content[rp] = self._augment_comment_content(content[rp], srcs[rp], reply_target_name=last_root_nick or None)
+                order.append(rp)
+
+        for name, values in ds_cols.items():
+            columns[name].extend([values[i] for i in order])
+
+    def _build_comment_base(self, doc: Dict[str, Any] | List[Any]) -> Columns:
         # 兼容原文件的解析与遍历逻辑
         datasets: List[Dict[str, Any]] = []
         if isinstance(doc, dict):
@@ -320,84 +797,23 @@ class XHSUnifiedStructuredOutputComponent(Component):
         elif isinstance(doc, list):
             datasets = [d for d in doc if isinstance(d, dict)]
 
-        final_results: List[Dict[str, Any]] = []
+        columns = _empty_columns(self.COMMENT_FIELDS)
 
         global_default_location = ""
         if isinstance(doc, dict):
             global_default_location = self._as_str(doc.get("环境")) or "未知"
 
         for ds in datasets:
-            author_id = ""
             raw_list = ds.get("原始")
-            root_seq: List[Dict[str, Any]] = []
-            root_nickname_by_id: Dict[str, str] = {}
-
-            if isinstance(raw_list, list):
-                for raw in raw_list:
-                    if not isinstance(raw, dict):
-                        continue
-                    if raw.get("code") != 0:
-                        continue
-                    data_node = raw.get("data") or {}
-                    if not isinstance(data_node, dict):
-                        continue
-                    author_id = self._as_str(data_node.get("user_id")) or author_id
-                    comments = data_node.get("comments") or []
-                    if isinstance(comments, list):
-                        for c in comments:
-                            if isinstance(c, dict):
-                                mapped = self._map_comment(c, level="根评论", author_id=author_id, default_location=global_default_location)
-                                mapped["评论内容"] = self._augment_comment_content(mapped["评论内容"], c, reply_target_name=None)
-                                cid = self._as_str(c.get("id"))
-                                root_seq.append({"id": cid, "mapped": mapped, "src": c})
-                                root_nickname_by_id[cid] = self._as_str((c.get("user") or {}).get("nickname"))
-
             replies_groups = ds.get("评论")
-            replies_by_root: Dict[str, List[Dict[str, Any]]] = {}
-            orphan_replies: List[Dict[str, Any]] = []
-            if isinstance(replies_groups, list):
-                for rg in replies_groups:
-                    if not isinstance(rg, dict):
-                        continue
-                    root_id_cn = rg.get("评论ID")
-                    root_id_key = self._as_str(root_id_cn) if root_id_cn is not None else ""
-                    raw_replies = rg.get("二级评论原始响应")
-                    if not isinstance(raw_replies, list):
-                        continue
-                    for rr in raw_replies:
-                        if not isinstance(rr, dict):
-                            continue
-                        if rr.get("code") != 0:
-                            continue
-                        data_node = rr.get("data") or {}
-                        comments = data_node.get("comments") or []
-                        if isinstance(comments, list):
-                            for c in comments:
-                                if isinstance(c, dict):
-                                    mapped = self._map_comment(c, level="二级评论", author_id=author_id, default_location=global_default_location)
-                                    entry = {"mapped": mapped, "src": c, "root_id": root_id_key}
-                                    if root_id_key:
-                                        replies_by_root.setdefault(root_id_key, []).append(entry)
-                                    else:
-                                        orphan_replies.append(entry)
-
-            for root in root_seq:
-                final_results.append(root["mapped"])
-                rid = root["id"]
-                root_nick = root_nickname_by_id.get(rid, "")
-                for rp in replies_by_root.get(rid, []):
-                    rp_m = rp["mapped"]
-                    rp_m["评论内容"] = self._augment_comment_content(rp_m["评论内容"], rp["src"], reply_target_name=root_nick)
-                    final_results.append(rp_m)
-
-            if orphan_replies:
-                last_root_nick = root_nickname_by_id.get(root_seq[-1]["id"], "") if root_seq else ""
-                for rp in orphan_replies:
-                    rp_m = rp["mapped"]
-                    rp_m["评论内容"] = self._augment_comment_content(rp_m["评论内容"], rp["src"], reply_target_name=last_root_nick or None)
-                    final_results.append(rp_m)
-
-        return final_results
+            self._build_comment_dataset(
+                raw_list if isinstance(raw_list, list) else [],
+                replies_groups if isinstance(replies_groups, list) else [],
+                global_default_location,
+                columns,
+            )
+
+        return columns
 
     # -----------------------------
     # 搜索模式：与 XHSSearchStructuredOutputComponent 逻辑保持一致
@@ -452,96 +868,38 @@ class XHSUnifiedStructuredOutputComponent(Component):
                         if isinstance(name, str) and name.strip():
                             tags.append(name.strip())
         if not tags:
-            desc = self._as_str(note.get("desc"))
-            if desc:
-                tags += [m.strip() for m in re.findall(r"#([^#\n\r]+)", desc) if m.strip()]
+            tags = _extract_hashtags(note.get("desc"), "正文")
         dedup: List[str] = []
         for t in tags:
             if t not in dedup:
                 dedup.append(t)
         return ";".join(dedup) if dedup else ""
 
-    def _map_search_note(self, note: Dict[str, Any], include_author_details: bool) -> Dict[str, Any]:
+    def _map_search_note(self, note: Dict[str, Any]) -> Dict[str, Any]:
+        """发布时间保留原始时间戳，由 _ymdhms_columns 整列格式化"""
         user = note.get("user") or {}
-        nickname = self._as_str(user.get("nickname"))
-        red_id = self._as_str(user.get("red_id"))
-        official_verified = self._as_bool(user.get("official_verified"))
-        official_verified_str = "是" if official_verified else "否"
-
-        title = self._as_str(note.get("title")) or self._as_str(note.get("display_title"))
-        desc = self._as_str(note.get("desc"))
-
-        like_count = self._as_int(note.get("liked_count")) or self._as_int(note.get("likes"))
-        comment_count = self._as_int(note.get("comments_count"))
-        collect_count = self._as_int(note.get("collected_count"))
-        nice_count = self._as_int(note.get("nice_count"))
-        share_count = self._as_int(note.get("shared_count")) or self._as_int(note.get("share_count"))
-        note_type = self._as_str(note.get("type"))
-        # 类型显示规则：normal → 图文笔记；video → 视频笔记；其他保持原值
-        if note_type == "normal":
-            display_type = "图文笔记"
-        elif note_type == "video":
-            display_type = "视频笔记"
-        else:
-            display_type = note_type
         note_id = self._as_str(note.get("id"))
-
-        link = f"https://www.xiaohongshu.com/explore/{note_id}" if note_id else ""
-        tags = self._extract_tags(note)
-        cover_url = self._extract_cover_url(note)
-        video_url = self._extract_video_url(note)
-        publish_time = self._as_int(note.get("timestamp")) or self._as_int(note.get("create_time"))
-        publish_time_str = self._format_ts_to_ymdhms(publish_time)
-
-        mapped: Dict[str, Any] = {
-            "标题": title,
-            "点赞数": like_count,
-            "评论数": comment_count,
-            "收藏数": collect_count,
-            "好看数": nice_count,
-            "分享数": share_count,
-            "笔记类型": display_type,
+        return {
+            "标题": self._as_str(note.get("title")) or self._as_str(note.get("display_title")),
+            "点赞数": self._as_int(note.get("liked_count")) or self._as_int(note.get("likes")),
+            "评论数": self._as_int(note.get("comments_count")),
+            "收藏数": self._as_int(note.get("collected_count")),
+            "好看数": self._as_int(note.get("nice_count")),
+            "分享数": self._as_int(note.get("shared_count")) or self._as_int(note.get("share_count")),
+            "笔记类型": self._note_type_label(self._as_str(note.get("type"))),
             "笔记id": note_id,
-            "笔记链接": link,
-            "笔记正文": desc,
-            "笔记tag": tags,
-            "封面图链接": cover_url,
-            "视频链接": video_url,
-            "发布时间": publish_time_str,
-            "作者昵称": nickname,
-            "小红书号": red_id,
-            "是否官方认证": official_verified_str,
+            "笔记链接": self._explore_link(note_id),
+            "笔记正文": self._as_str(note.get("desc")),
+            "笔记tag": self._extract_tags(note),
+            "封面图链接": self._extract_cover_url(note),
+            "视频链接": self._extract_video_url(note),
+            "发布时间": self._as_int(note.get("timestamp")) or self._as_int(note.get("create_time")),
+            "作者昵称": self._as_str(user.get("nickname")),
+            "小红书号": self._as_str(user.get("red_id")),
+            "是否官方认证": self._yes_no(self._as_bool(user.get("official_verified"))),
         }
 
-        if include_author_details:
-            user_id = self._as_str(user.get("userid"))
-            author_home = f"https://www.xiaohongshu.com/user/profile/{user_id}" if user_id else ""
-            mapped.update({
-                "作者粉丝数": 0,
-                "作者获赞与收藏数": 0,
-                "作者简介": "",
-                "作者主页链接": author_home,
-            })
-
-            author_fields = [
-                mapped.get("作者粉丝数"),
-                mapped.get("作者获赞与收藏数"),
-                mapped.get("作者简介"),
-                mapped.get("作者主页链接"),
-            ]
-            all_empty = (
-                (self._as_int(author_fields[0]) == 0)
-                and (self._as_int(author_fields[1]) == 0)
-                and (self._as_str(author_fields[2]) == "")
-                and (self._as_str(author_fields[3]) == "")
-            )
-            if all_empty:
-                for k in ("作者粉丝数", "作者获赞与收藏数", "作者简介", "作者主页链接"):
-                    mapped.pop(k, None)
-
-        return mapped
-
-    def _build_search_base(self, doc: Dict[str, Any] | List[Any]) -> List[Dict[str, Any]]:
+    def _build_search_base(self, doc: Dict[str, Any] | List[Any]) -> Columns:
         datasets: List[Dict[str, Any]] = []
         if isinstance(doc, dict):
             data_list = doc.get("数据")
@@ -552,7 +910,7 @@ class XHSUnifiedStructuredOutputComponent(Component):
         elif isinstance(doc, list):
             datasets = [d for d in doc if isinstance(d, dict)]
 
-        final_results: List[Dict[str, Any]] = []
+        columns = _empty_columns(self.SEARCH_NOTE_FIELDS)
         for ds in datasets:
             raw = ds.get("原始")
             raw_candidates: List[Dict[str, Any]] = []
@@ -562,75 +920,48 @@ class XHSUnifiedStructuredOutputComponent(Component):
                 raw_candidates = [r for r in raw if isinstance(r, dict)]
 
             for r in raw_candidates:
-                if r.get("code") != 0:
-                    continue
-                data_node = r.get("data") or {}
-                items = data_node.get("items") or []
-                if not isinstance(items, list):
-                    continue
-                for it in items:
-                    if not isinstance(it, dict):
-                        continue
-                    note = it.get("note")
-                    if isinstance(note, dict):
-                        mapped = self._map_search_note(note, include_author_details=False)
-                        final_results.append(mapped)
-        return final_results
+                self._fill_search_page(r, columns)
+        return columns
+
+    def _fill_search_page(self, r: Dict[str, Any], columns: Columns) -> None:
+        """单页搜索原始响应 -> 笔记记录，逐列追加到 columns"""
+        if r.get("code") != 0:
+            return
+        data_node = r.get("data") or {}
+        items = data_node.get("items") or []
+        if not isinstance(items, list):
+            return
+        notes = (it.get("note") for it in items if isinstance(it, dict))
+        _append_rows(columns, (self._map_search_note(n) for n in notes if isinstance(n, dict)))
 
     # -----------------------------
     # 用户笔记模式：与 XHSUserNotesStructuredOutputComponent 逻辑保持一致
     # -----------------------------
     def _map_user_note(self, note: Dict[str, Any]) -> Dict[str, Any]:
         user = note.get("user") or {}
-        nickname = self._as_str(user.get("nickname"))
         note_id = self._as_str(note.get("id"))
-
-        title = self._as_str(note.get("title")) or self._as_str(note.get("display_title"))
-        desc = self._as_str(note.get("desc"))
-
-        like_count = self._as_int(note.get("liked_count")) or self._as_int(note.get("likes"))
-        comment_count = self._as_int(note.get("comments_count"))
-        collect_count = self._as_int(note.get("collected_count"))
         note_type = self._as_str(note.get("type"))
-        nice_count = self._as_int(note.get("nice_count")) if note_type == "video" else 0
-        share_count = self._as_int(note.get("shared_count")) or self._as_int(note.get("share_count"))
-        view_count = self._as_int(note.get("view_count"))
-
         images = self._extract_image_urls(note.get("images_list"))
-        images_str = ";".join(images) if images else ""
-
-        publish_time = self._as_int(note.get("create_time")) or self._as_int(note.get("timestamp"))
-
-        # 类型显示规则：normal → 图文笔记；video → 视频笔记；其他保持原值
-        if note_type == "normal":
-            display_type = "图文笔记"
-        elif note_type == "video":
-            display_type = "视频笔记"
-        else:
-            display_type = note_type
-
-        # 链接规则：按用户信息采集笔记，链接应为 explore/<note_id>
-        link = f"https://www.xiaohongshu.com/explore/{note_id}" if note_id else ""
-
         return {
-            "用户昵称": nickname,
+            "用户昵称": self._as_str(user.get("nickname")),
             "笔记ID": note_id,
-            "笔记链接": link,
-            "笔记标题": title,
-            "笔记正文": desc,
-            "点赞数": like_count,
-            "评论数": comment_count,
-            "收藏数": collect_count,
-            "好看数": nice_count,
-            "分享次数": share_count,
-            "笔记图片链接": images_str,
-            "浏览数": view_count,
-            "发布时间": publish_time,
+            # 链接规则：按用户信息采集笔记，链接应为 explore/<note_id>
+            "笔记链接": self._explore_link(note_id),
+            "笔记标题": self._as_str(note.get("title")) or self._as_str(note.get("display_title")),
+            "笔记正文": self._as_str(note.get("desc")),
+            "点赞数": self._as_int(note.get("liked_count")) or self._as_int(note.get("likes")),
+            "评论数": self._as_int(note.get("comments_count")),
+            "收藏数": self._as_int(note.get("collected_count")),
+            "好看数": self._as_int(note.get("nice_count")) if note_type == "video" else 0,
+            "分享次数": self._as_int(note.get("shared_count")) or self._as_int(note.get("share_count")),
+            "笔记图片链接": ";".join(images) if images else "",
+            "浏览数": self._as_int(note.get("view_count")),
+            "发布时间": self._as_int(note.get("create_time")) or self._as_int(note.get("timestamp")),
             "是否是商品笔记": self._as_bool(note.get("is_goods_note")),
-            "笔记类型": display_type,
+            "笔记类型": self._note_type_label(note_type),
         }
 
-    def _build_user_notes_base(self, doc: Dict[str, Any] | List[Any]) -> List[Dict[str, Any]]:
+    def _build_user_notes_base(self, doc: Dict[str, Any] | List[Any]) -> Columns:
         datasets: List[Dict[str, Any]] = []
         if isinstance(doc, dict):
             data_list = doc.get("数据")
@@ -641,7 +972,7 @@ class XHSUnifiedStructuredOutputComponent(Component):
         elif isinstance(doc, list):
             datasets = [d for d in doc if isinstance(d, dict)]
 
-        final_results: List[Dict[str, Any]] = []
+        columns = _empty_columns(self.USER_NOTE_FIELDS)
         for ds in datasets:
             raw = ds.get("原始")
             raw_candidates: List[Dict[str, Any]] = []
@@ -651,69 +982,241 @@ class XHSUnifiedStructuredOutputComponent(Component):
                 raw_candidates = [r for r in raw if isinstance(r, dict)]
 
             for r in raw_candidates:
-                if r.get("code") != 0:
-                    continue
-                data_node = r.get("data") or {}
-                notes = data_node.get("notes") or []
-                if not isinstance(notes, list):
+                self._fill_user_notes_page(r, columns)
+        return columns
+
+    def _fill_user_notes_page(self, r: Dict[str, Any], columns: Columns) -> None:
+        """单页用户笔记原始响应 -> 笔记记录，逐列追加到 columns"""
+        if r.get("code") != 0:
+            return
+        data_node = r.get("data") or {}
+        notes = data_node.get("notes") or []
+        if not isinstance(notes, list):
+            return
+        _append_rows(columns, (self._map_user_note(n) for n in notes if isinstance(n, dict)))
+
+    # -----------------------------
+    # 流式解析：大体量字符串输入按页解码并映射，峰值内存只与单页大小相关
+    # -----------------------------
+    def _stream_structured_columns(self, text: str, sniffed: Dict[str, Any]) -> Optional[Tuple[str, Columns]]:
+        """按 数据[*].原始(.data.items/notes/comments) 与 数据[*].评论[*] 流式抽取。
+        只处理“顶层对象 + 数据数组”的常规结构；代码块包裹、内嵌包装、控制字符或任何格式异常时返回 None，
+        由调用方回退到完整容错解析，保证结果与完整解析一致。
+        sniffed 为前缀嗅探到的顶层标量，模式与环境已知时遇到 数据 即按对应模式就地抽取。"""
+        if "```" in text or _ODD_CTRL_RE.search(text):
+            return None
+        first = text.find("{")
+        last = text.rfind("}")
+        if first == -1 or last <= first or text[:first].strip("\ufeff \t\n\r"):
+            return None
+        stream = _JsonStream(text)
+        try:
+            top: Dict[str, Any] = {k: v for k, v in sniffed.items() if k in ("模式", "环境")}
+            data_pos: Optional[int] = None
+            results: Optional[Tuple[str, Columns]] = None
+            for key, vpos, done in stream.members(first):
+                if key == "results":
+                    # user.filtered.json 一类的内嵌包装，交由完整解析处理
+                    return None
+                if key in ("模式", "环境"):
+                    value, end = stream.decode(vpos)
+                    done.append(end)
+                    top[key] = value
+                elif key == "数据":
+                    if stream.peek(vpos) != "[":
+                        return None
+                    data_pos = vpos
+                    # 模式与环境已先出现（上游输出的常规顺序）时就地处理，否则先跳过、读完顶层后再处理
+                    if "模式" in top and "环境" in top:
+                        results = self._stream_datasets(stream, vpos, top)
+                        done.append(stream.last_end)
+            if stream.last_end != last + 1 or data_pos is None:
+                return None
+            if results is None:
+                results = self._stream_datasets(stream, data_pos, top)
+            return results
+        except (ValueError, IndexError, RecursionError):
+            return None
+
+    def _stream_datasets(self, stream: _JsonStream, data_pos: int, top: Dict[str, Any]) -> Tuple[str, Columns]:
+        """遍历 数据 数组，返回 (字段规格名, 列)；返回后 stream.last_end 为该数组的结束位置"""
+        mode_val = self._as_str(top.get("模式"))
+        if mode_val == "按笔记采集评论":
+            kind = "comment"
+        elif mode_val == "按用户信息采集笔记":
+            kind = "usernotes"
+        else:
+            kind = "search"
+            for _, dpos, _done in stream.elements(data_pos):
+                if stream.peek(dpos) != "{":
                     continue
-                for n in notes:
-                    if isinstance(n, dict):
-                        mapped = self._map_user_note(n)
-                        final_results.append(mapped)
-        return final_results
+                for key, vpos, _inner in stream.members(dpos):
+                    if key == "原始" and stream.peek(vpos) in ("{", "["):
+                        kind = self._choose_kind_from_raw(stream.decoded_dicts(vpos))
+                        break
+                break
+        global_default_location = self._as_str(top.get("环境")) or "未知"
+
+        specs_name = self.KIND_FIELD_SPECS[kind]
+        columns = _empty_columns(getattr(self, specs_name))
+        for _, dpos, ds_done in stream.elements(data_pos):
+            if stream.peek(dpos) != "{":
+                continue
+            if kind == "comment":
+                self._stream_comment_dataset(stream, dpos, global_default_location, columns)
+            else:
+                fill_page = self._fill_user_notes_page if kind == "usernotes" else self._fill_search_page
+                for key, vpos, done in stream.members(dpos):
+                    if key == "原始" and stream.peek(vpos) in ("{", "["):
+                        for r in stream.decoded_dicts(vpos):
+                            fill_page(r, columns)
+                        done.append(stream.last_end)
+            ds_done.append(stream.last_end)
+        return specs_name, columns
+
+    def _stream_comment_dataset(self, stream: _JsonStream, pos: int, global_default_location: str, columns: Columns) -> None:
+        """评论数据集：原始分页与二级评论分组都逐个解码；两者在对象中的先后顺序不影响结果"""
+        raw_pages: List[Dict[str, Any]] = []
+        reply_groups: List[Dict[str, Any]] = []
+        for key, vpos, done in stream.members(pos):
+            if key == "原始" and stream.peek(vpos) == "[":
+                raw_pages = [self._comment_page_core(r) for r in stream.decoded_dicts(vpos)]
+                done.append(stream.last_end)
+            elif key == "评论" and stream.peek(vpos) == "[":
+                reply_groups = [self._reply_group_core(rg) for rg in stream.decoded_dicts(vpos)]
+                done.append(stream.last_end)
+        self._build_comment_dataset(raw_pages, reply_groups, global_default_location, columns)
+
+    @staticmethod
+    def _comment_page_core(raw: Dict[str, Any]) -> Dict[str, Any]:
+        """只保留根评论映射用到的字段，解码后的整页响应即可释放"""
+        data_node = raw.get("data")
+        if not isinstance(data_node, dict):
+            return {"code": raw.get("code"), "data": data_node}
+        return {"code": raw.get("code"), "data": {"user_id": data_node.get("user_id"), "comments": data_node.get("comments")}}
+
+    @staticmethod
+    def _reply_group_core(rg: Dict[str, Any]) -> Dict[str, Any]:
+        raw_replies = rg.get("二级评论原始响应")
+        if isinstance(raw_replies, list):
+            raw_replies = [
+                {"code": rr.get("code"), "data": {"comments": (rr.get("data") or {}).get("comments")}}
+                if isinstance(rr, dict) and isinstance(rr.get("data") or {}, dict) else rr
+                for rr in raw_replies
+            ]
+        return {"评论ID": rg.get("评论ID"), "二级评论原始响应": raw_replies}
 
     # -----------------------------
-    # 统一输出
+    # 公用：单次运行内缓存（两个输出共用同一份解析结果与映射记录，按输入内容判定是否命中）
     # -----------------------------
-    def build_structured_output(self) -> Data:
-        doc, mode_val = self._parse_doc_and_detect_mode()
+    def _input_key(self) -> Any:
+        """输入内容的比较键：文本输入即字符串本身；Data 携带的活对象取其序列化摘要，上游原地修改后不会命中旧结果"""
+        obj = self._resolve_input_obj()
+        if isinstance(obj, (str, bytes)):
+            return obj
+        try:
+            payload = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            payload = repr(obj).encode("utf-8", errors="replace")
+        return hashlib.blake2b(payload, digest_size=16).digest()
+
+    def _run_memo(self, slot: str, build: Callable[[], Any]) -> Any:
+        # 嵌套调用（记录 -> 列 -> 解析）沿用外层已算出的键，每次输出只计算一次
+        outer = getattr(self, "_memo_key", None)
+        key = outer if outer is not None else self._input_key()
+        cached = getattr(self, slot, None)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        self._memo_key = key
+        try:
+            value = build()
+        finally:
+            self._memo_key = outer
+        setattr(self, slot, (key, value))
+        return value
+
+    def _parsed_doc_and_mode(self) -> Tuple[Dict[str, Any] | List[Any], str]:
+        return self._run_memo("_parsed_doc_cache", self._parse_doc_and_detect_mode)
+
+    def _structured_columns(self) -> Tuple[str, Columns]:
+        return self._run_memo("_columns_cache", self._build_unified_columns)
+
+    def _structured_records(self) -> List[Dict[str, Any]]:
+        return self._run_memo("_records_cache", self._build_structured_records)
+
+    def _build_structured_records(self) -> List[Dict[str, Any]]:
+        specs_name, columns = self._structured_columns()
+        return _rows_from_columns({**columns, **self._ymdhms_columns(specs_name, columns)})
+
+    # -----------------------------
+    # 统一分派：按模式字符串或原始 data 结构选择 comment / search / usernotes
+    # -----------------------------
+    @staticmethod
+    def _raw_candidates(raw: Any) -> Iterable[Dict[str, Any]]:
+        if isinstance(raw, dict):
+            return [raw]
+        if isinstance(raw, list):
+            return [r for r in raw if isinstance(r, dict)]
+        return []
+
+    @staticmethod
+    def _choose_kind_from_raw(raw_candidates: Iterable[Any]) -> str:
+        """无模式字符串时，按首个数据集原始 data 的结构区分 search / usernotes / comment"""
+        for r in raw_candidates:
+            if not isinstance(r, dict) or r.get("code") != 0:
+                continue
+            dn = r.get("data") or {}
+            if isinstance(dn, dict):
+                if isinstance(dn.get("notes"), list):
+                    return "usernotes"
+                elif isinstance(dn.get("items"), list):
+                    return "search"
+                elif isinstance(dn.get("comments"), list):
+                    return "comment"
+        return "search"
+
+    def _build_unified_columns(self) -> Tuple[str, Columns]:
+        """返回 (字段规格名, 列)；规格名决定 DataFrame 的列类型"""
+        obj = self._resolve_input_obj()
+        if isinstance(obj, (str, bytes, bytearray)):
+            sniffed = self._sniff_top_fields(obj)
+            if sniffed is None:
+                # 快速失败：非 JSON 输入直接返回空结果，不走逐字符转义与修复链
+                return "SEARCH_NOTE_FIELDS", _empty_columns(self.SEARCH_NOTE_FIELDS)
+            if len(obj) >= self.STREAM_PARSE_MIN_CHARS and "results" not in sniffed:
+                text = obj if isinstance(obj, str) else bytes(obj).decode("utf-8", errors="replace")
+                streamed = self._stream_structured_columns(text, sniffed)
+                if streamed is not None:
+                    return streamed
+
+        doc, mode_val = self._parsed_doc_and_mode()
 
         # 判定顺序调整：优先使用明确的模式字符串，避免“顶层有数据”误判
         if mode_val == "按笔记采集评论":
-            output = self._build_comment_base(doc)
+            kind = "comment"
         elif mode_val == "按用户信息采集笔记":
-            output = self._build_user_notes_base(doc)
+            kind = "usernotes"
         elif isinstance(doc, dict) and isinstance(doc.get("数据"), list):
             # 顶层存在“数据”但无模式字符串时，根据原始 data 的结构区分 search / usernotes / comment
-            chosen = "search"
-            data_list = doc.get("数据") or []
-            first_ds = None
-            if isinstance(data_list, list):
-                for d in data_list:
-                    if isinstance(d, dict):
-                        first_ds = d
-                        break
-            if isinstance(first_ds, dict):
-                raw = first_ds.get("原始")
-                raw_candidates: List[Dict[str, Any]] = []
-                if isinstance(raw, dict):
-                    raw_candidates = [raw]
-                elif isinstance(raw, list):
-                    raw_candidates = [r for r in raw if isinstance(r, dict)]
-                for r in raw_candidates:
-                    if r.get("code") != 0:
-                        continue
-                    dn = r.get("data") or {}
-                    if isinstance(dn, dict):
-                        if isinstance(dn.get("notes"), list):
-                            chosen = "usernotes"
-                            break
-                        elif isinstance(dn.get("items"), list):
-                            chosen = "search"
-                            break
-                        elif isinstance(dn.get("comments"), list):
-                            chosen = "comment"
-                            break
-            if chosen == "usernotes":
-                output = self._build_user_notes_base(doc)
-            elif chosen == "comment":
-                output = self._build_comment_base(doc)
-            else:
-                output = self._build_search_base(doc)
+            first_ds = next((d for d in doc.get("数据") or [] if isinstance(d, dict)), None)
+            kind = self._choose_kind_from_raw(self._raw_candidates(first_ds.get("原始")) if isinstance(first_ds, dict) else [])
         else:
             # 兜底：按搜索模式处理
-            output = self._build_search_base(doc)
+            kind = "search"
+
+        if kind == "comment":
+            columns = self._build_comment_base(doc)
+        elif kind == "usernotes":
+            columns = self._build_user_notes_base(doc)
+        else:
+            columns = self._build_search_base(doc)
+        return self.KIND_FIELD_SPECS[kind], columns
+
+    # -----------------------------
+    # 统一输出
+    # -----------------------------
+    def build_structured_output(self) -> Data:
+        output = self._structured_records()
 
         if not isinstance(output, list) or not output:
             # 容错：无结构化结果时返回空结果，避免抛错
@@ -723,54 +1226,14 @@ class XHSUnifiedStructuredOutputComponent(Component):
         return Data(data={"results": output})
 
     def build_structured_dataframe(self) -> DataFrame:
-        doc, mode_val = self._parse_doc_and_detect_mode()
+        # 直接由列构建：计数为 int64、布尔为 bool、原始时间戳为 datetime64（需展示为文本的时间列除外），不经过逐行字典
+        specs_name, columns = self._structured_columns()
 
-        if mode_val == "按笔记采集评论":
-            output = self._build_comment_base(doc)
-        elif mode_val == "按用户信息采集笔记":
-            output = self._build_user_notes_base(doc)
-        elif isinstance(doc, dict) and isinstance(doc.get("数据"), list):
-            chosen = "search"
-            data_list = doc.get("数据") or []
-            first_ds = None
-            if isinstance(data_list, list):
-                for d in data_list:
-                    if isinstance(d, dict):
-                        first_ds = d
-                        break
-            if isinstance(first_ds, dict):
-                raw = first_ds.get("原始")
-                raw_candidates: List[Dict[str, Any]] = []
-                if isinstance(raw, dict):
-                    raw_candidates = [raw]
-                elif isinstance(raw, list):
-                    raw_candidates = [r for r in raw if isinstance(r, dict)]
-                for r in raw_candidates:
-                    if r.get("code") != 0:
-                        continue
-                    dn = r.get("data") or {}
-                    if isinstance(dn, dict):
-                        if isinstance(dn.get("notes"), list):
-                            chosen = "usernotes"
-                            break
-                        elif isinstance(dn.get("items"), list):
-                            chosen = "search"
-                            break
-                        elif isinstance(dn.get("comments"), list):
-                            chosen = "comment"
-                            break
-            if chosen == "usernotes":
-                output = self._build_user_notes_base(doc)
-            elif chosen == "comment":
-                output = self._build_comment_base(doc)
-            else:
-                output = self._build_search_base(doc)
-        else:
-            output = self._build_search_base(doc)
-
-        if not isinstance(output, list) or not output:
+        if not _column_length(columns):
             # 容错：无结构化结果时返回空 DataFrame
             return DataFrame([])
-        if len(output) == 1:
-            return DataFrame([output[0]])
-        return DataFrame(output)
\ No newline at end of file
+        formatted = self._ymdhms_columns(specs_name, columns)
+        datetime_fields = [name for name in self.DATETIME_FIELDS if name not in formatted]
+        arrays = _typed_column_arrays(getattr(self, specs_name), columns, datetime_fields)
+        arrays.update(formatted)
+        return DataFrame(arrays)
@@ -25,7 +25,8 @@
 - 做好兜底：除非完全没有数据，否则不产生 null；字符串用空字符串，数值用 0，布尔用 False。
 
 输入：
-- input_json: 上游 JSON 字符串（或 Python 字典），支持 /components/pybug/final/user.filtered.json 的结构。
+- input_data: 上游组件输出的 Data / Message（优先使用；Data 携带的字典直接使用，不再经过 JSON 解析）。
+- input_json: 上游 JSON 字符串（或 Python 字典，作为备用通道），支持 /components/pybug/final/user.filtered.json 的结构。
 
 输出：
 - structured_output: Data（单条直接返回对象，多条以 {"results": [...]} 返回）
@@ -34,16 +35,151 @@
 
 from __future__ import annotations
 
+import functools
+import hashlib
 import json
+import pickle
 import re
-from typing import Any, Dict, List
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Tuple
 
+import numpy as np
 from langflow.custom.custom_component.component import Component
-from langflow.io import MultilineInput, Output
+from langflow.io import HandleInput, MultilineInput, Output
 from langflow.schema.data import Data
 from langflow.schema.dataframe import DataFrame
 
 
+# -----------------------------
+# 列式结果（四个结构化输出组件共用同一份实现，修改时请逐字同步）
+# - 每条记录由组件的手写映射函数产出，字段顺序与列类型表一致，逐列追加
+# - 列类型表为 ((字段, 类型), ...)，顺序即输出字段顺序；DataFrame 中 int → int64（时间字段 → datetime64），
+#   bool → bool，其余类型的列保持原样
+# -----------------------------
+Columns = Dict[str, List[Any]]
+ColumnTypes = Tuple[Tuple[str, type], ...]
+
+
+def _empty_columns(column_types: ColumnTypes) -> Columns:
+    return {name: [] for name, _ in column_types}
+
+
+def _append_rows(columns: Columns, rows: Iterable[Dict[str, Any]]) -> None:
+    """记录逐列追加（记录的字段顺序须与 columns 一致）"""
+    appends = [col.append for col in columns.values()]
+    for row in rows:
+        for append, value in zip(appends, row.values()):
+            append(value)
+
+
+def _column_length(columns: Columns) -> int:
+    return len(next(iter(columns.values()), ()))
+
+
+def _rows_from_columns(columns: Columns) -> List[Dict[str, Any]]:
+    keys = list(columns)
+    return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
+
+def _typed_column_arrays(column_types: ColumnTypes, columns: Columns, datetime_fields: Iterable[str] = ()) -> Dict[str, Any]:
+    """按列类型表转换各列：int → int64（其中 datetime_fields → datetime64），bool → bool；其余列保持原样"""
+    datetime_fields = set(datetime_fields)
+    arrays: Dict[str, Any] = {}
+    for name, kind in column_types:
+        values = columns[name]
+        try:
+            if kind is int:
+                ints = np.fromiter(values, dtype=np.int64, count=len(values))
+                arrays[name] = _ts_to_datetime64(ints) if name in datetime_fields else ints
+            elif kind is bool:
+                arrays[name] = np.fromiter(values, dtype=np.bool_, count=len(values))
+            else:
+                arrays[name] = values
+        except (OverflowError, TypeError, ValueError):
+            # 超出 int64 等异常值：该列退回原始 Python 对象
+            arrays[name] = values
+    return arrays
+
+
+# -----------------------------
+# 时间戳归一化与格式化（各结构化输出组件共用同一份实现，修改时请逐字同步；XHS 采集组件只沿用同一毫秒阈值）
+# - 原始时间戳可能是秒级或毫秒级：大于 _MS_TS_THRESHOLD 视为毫秒
+# - 不少于 _TS_NUMPY_MIN_ROWS 条的整列用 NumPy 整数运算一次完成；单页规模的小列逐条换算，省去数组转换的固定开销
+# - 中文时间文本按秒级时间戳 LRU 缓存：同一时刻（重复数据、同批发布）只格式化一次
+# - 时间类型列（datetime64）与中文时间文本统一取本地时区的墙上时间，同一行两种输出一致
+# -----------------------------
+_MS_TS_THRESHOLD = 10**11
+_TS_NUMPY_MIN_ROWS = 128
+
+
+def _ts_seconds(ts: int) -> int:
+    return ts // 1000 if ts > _MS_TS_THRESHOLD else ts
+
+
+def _ts_seconds_list(ints: List[int]) -> List[int]:
+    """整数时间戳列（秒 / 毫秒混合）-> 秒级时间戳列；小列与超出 int64 的异常值逐条处理"""
+    if len(ints) < _TS_NUMPY_MIN_ROWS:
+        return [_ts_seconds(ts) for ts in ints]
+    try:
+        arr = np.asarray(ints, dtype=np.int64)
+    except OverflowError:
+        return [_ts_seconds(ts) for ts in ints]
+    return np.where(arr > _MS_TS_THRESHOLD, arr // 1000, arr).tolist()
+
+
+_EPOCH = datetime(1970, 1, 1)
+_MAX_TS_SECONDS = 253402300799  # 9999-12-31 23:59:59，datetime 可表示的上限
+
+
+@functools.lru_cache(maxsize=8192)
+def _local_utc_offset(ts: int) -> int:
+    """秒级时间戳处本地时区相对 UTC 的偏移（秒），与 datetime.fromtimestamp 的换算一致（含夏令时）"""
+    try:
+        delta = datetime.fromtimestamp(ts) - _EPOCH
+    except (OverflowError, OSError, ValueError):
+        return 0
+    return delta.days * 86400 + delta.seconds - ts
+
+
+def _ts_to_datetime64(ints: Any) -> Any:
+    """整数时间戳列 -> datetime64[s]，取本地时区的墙上时间（与 _format_ts_seconds 的文本一致）；
+    0、负数或超出范围视为缺失（NaT）"""
+    if len(ints) < _TS_NUMPY_MIN_ROWS:
+        secs = [_ts_seconds(ts) for ts in ints]
+        return np.array([s + _local_utc_offset(s) if 0 < s <= _MAX_TS_SECONDS else "NaT" for s in secs], dtype="datetime64[s]")
+    arr = np.asarray(ints, dtype=np.int64)
+    secs = np.where(arr > _MS_TS_THRESHOLD, arr // 1000, arr)
+    missing = (secs <= 0) | (secs > _MAX_TS_SECONDS)
+    secs = np.where(missing, 0, secs)
+    # 时区偏移按小时求一次：整小时首尾偏移相同时共用，跨夏令时切换的小时逐秒换算
+    hours, inverse = np.unique(secs // 3600, return_inverse=True)
+    start = np.array([_local_utc_offset(int(h) * 3600) for h in hours], dtype=np.int64)
+    end = np.array([_local_utc_offset(int(h) * 3600 + 3599) for h in hours], dtype=np.int64)
+    offsets = start[inverse]
+    for i in np.flatnonzero((start != end)[inverse]):
+        offsets[i] = _local_utc_offset(int(secs[i]))
+    out = (secs + offsets).astype("datetime64[s]")
+    out[missing] = np.datetime64("NaT")
+    return out
+
+
+@functools.lru_cache(maxsize=8192)
+def _format_ts_seconds(ts: int) -> str:
+    """秒级时间戳 -> “YYYY年MM月DD日 HH时MM分SS秒”（本地时区）；0、负数或超出范围返回空字符串"""
+    if ts <= 0:
+        return ""
+    try:
+        dt = datetime.fromtimestamp(ts)
+    except (OverflowError, OSError, ValueError):
+        return ""
+    return f"{dt.year}年{dt.month:02d}月{dt.day:02d}日 {dt.hour:02d}时{dt.minute:02d}分{dt.second:02d}秒"
+
+
+def _format_ts_column(ints: List[int]) -> List[str]:
+    """整数时间戳列整列格式化为中文时间文本"""
+    return [_format_ts_seconds(ts) for ts in _ts_seconds_list(ints)]
+
+
 class XHSUserNotesStructuredOutputComponent(Component):
     display_name = "小红书用户笔记结构化输出"
     description = "从小红书用户笔记原始 JSON 提取并输出结构化数据，避免依赖中文映射字段。"
@@ -52,12 +188,19 @@ class XHSUserNotesStructuredOutputComponent(Component):
     icon = "table"
 
     inputs = [
+        HandleInput(
+            name="input_data",
+            display_name="上游数据",
+            info="接收上游组件输出的 Data 或 Message（若存在则优先使用）。",
+            input_types=["Data", "Message"],
+            required=False,
+        ),
         MultilineInput(
             name="input_json",
-            display_name="输入JSON",
+            display_name="输入JSON（备用）",
             info="原始响应 JSON（字符串或对象），例如 user.filtered.json 的内容。",
             tool_mode=True,
-            required=True,
+            required=False,
         ),
     ]
 
@@ -74,11 +217,56 @@ class XHSUserNotesStructuredOutputComponent(Component):
         ),
     ]
 
+    # 输出字段与列类型（顺序即输出字段顺序，与 _map_note 产出的记录一致）
+    NOTE_FIELDS: ColumnTypes = (
+        ("用户昵称", str),
+        ("笔记ID", str),
+        ("笔记链接", str),
+        ("笔记标题", str),
+        ("笔记正文", str),
+        ("点赞数", int),
+        ("评论数", int),
+        ("收藏数", int),
+        ("好看数", int),
+        ("分享次数", int),
+        ("笔记图片链接", str),
+        ("浏览数", int),
+        ("发布时间", int),
+        ("是否是商品笔记", bool),
+        ("笔记类型", str),
+    )
+    # DataFrame 中按时间类型输出的字段（原始为秒 / 毫秒级时间戳）
+    DATETIME_FIELDS: Tuple[str, ...] = ("发布时间",)
+
     # -----------------------------
     # 公用：从输入解析为 Python 对象
     # -----------------------------
+    def _resolve_input_obj(self) -> Any:
+        # 优先使用上游句柄数据，其次使用备用字符串输入
+        obj: Any = None
+        payload = getattr(self, "input_data", None)
+        if payload is not None:
+            base = payload[0] if isinstance(payload, list) and payload else payload
+            if base is not None:
+                # Message 取其文本；Data 携带的字典/列表是上游的活对象，直接使用，不经过文本序列化与解析
+                text = getattr(base, "text", None)
+                live = getattr(base, "data", None)
+                if isinstance(text, str) and text.strip():
+                    obj = text
+                elif isinstance(live, (dict, list)) and live:
+                    obj = live
+                elif text is None and live is None:
+                    # 不是 Data / Message（如直接传入的字符串或字典）：原样使用；内容为空的 Data / Message 视为未连接
+                    obj = base
+        if obj is None:
+            obj = self.input_json
+        return obj
+
     def _parse_input(self) -> Dict[str, Any] | List[Any]:
-        obj = self.input_json
+        obj = self._resolve_input_obj()
+        if obj is None or (isinstance(obj, str) and not obj.strip()):
+            msg = "缺少输入：请连接上游数据，或在“输入JSON（备用）”中填写原始响应 JSON"
+            raise ValueError(msg)
         if isinstance(obj, (dict, list)):
             # 某些包装结构可能把真实 JSON 放在 results.text.data.text
             if isinstance(obj, dict):
@@ -100,6 +288,44 @@ class XHSUserNotesStructuredOutputComponent(Component):
         msg = "输入类型不支持：请提供 JSON 字符串或字典/列表"
         raise TypeError(msg)
 
+    # -----------------------------
+    # 公用：单次运行内缓存（两个输出共用同一份解析结果与映射记录，按输入内容判定是否命中）
+    # -----------------------------
+    def _input_key(self) -> Any:
+        """输入内容的比较键：文本输入即字符串本身；Data 携带的活对象取其序列化摘要，上游原地修改后不会命中旧结果"""
+        obj = self._resolve_input_obj()
+        if isinstance(obj, (str, bytes)):
+            return obj
+        try:
+            payload = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            payload = repr(obj).encode("utf-8", errors="replace")
+        return hashlib.blake2b(payload, digest_size=16).digest()
+
+    def _run_memo(self, slot: str, build: Callable[[], Any]) -> Any:
+        # 嵌套调用（记录 -> 列 -> 解析）沿用外层已算出的键，每次输出只计算一次
+        outer = getattr(self, "_memo_key", None)
+        key = outer if outer is not None else self._input_key()
+        cached = getattr(self, slot, None)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        self._memo_key = key
+        try:
+            value = build()
+        finally:
+            self._memo_key = outer
+        setattr(self, slot, (key, value))
+        return value
+
+    def _parsed_input(self) -> Dict[str, Any] | List[Any]:
+        return self._run_memo("_parsed_input_cache", self._parse_input)
+
+    def _structured_columns(self) -> Columns:
+        return self._run_memo("_columns_cache", self._build_columns)
+
+    def _structured_records(self) -> List[Dict[str, Any]]:
+        return self._run_memo("_records_cache", self.build_structured_output_base)
+
     # -----------------------------
     # 公用：安全取值与兜底
     # -----------------------------
@@ -164,50 +390,40 @@ class XHSUserNotesStructuredOutputComponent(Component):
     # -----------------------------
     def _map_note(self, note: Dict[str, Any]) -> Dict[str, Any]:
         user = note.get("user") or {}
-        nickname = self._as_str(user.get("nickname"))
-
-        # 文本与标题兜底
-        title = self._as_str(note.get("title")) or self._as_str(note.get("display_title"))
-        desc = self._as_str(note.get("desc"))
-
-        # 点赞/分享等计数兜底
-        like_count = self._as_int(note.get("liked_count")) or self._as_int(note.get("likes"))
-        comment_count = self._as_int(note.get("comments_count"))
-        collect_count = self._as_int(note.get("collected_count"))
-        nice_count = self._as_int(note.get("nice_count")) if self._as_str(note.get("type")) == "video" else 0
-        share_count = self._as_int(note.get("shared_count")) or self._as_int(note.get("share_count"))
-        view_count = self._as_int(note.get("view_count"))
+        note_type = self._as_str(note.get("type"))
 
         # 图片链接（列表 -> 分号连接）
         images = self._extract_image_urls(note.get("images_list"))
-        images_str = ";".join(images) if images else ""
-
-        # 发布时间兜底
-        publish_time = self._as_int(note.get("create_time")) or self._as_int(note.get("timestamp"))
 
         return {
-            "用户昵称": nickname,
+            "用户昵称": self._as_str(user.get("nickname")),
             "笔记ID": self._as_str(note.get("id")),
             "笔记链接": "https://www.xiaohongshu.com/exp",
-            "笔记标题": title,
-            "笔记正文": desc,
-            "点赞数": like_count,
-            "评论数": comment_count,
-            "收藏数": collect_count,
-            "好看数": nice_count,
-            "分享次数": share_count,
-            "笔记图片链接": images_str,
-            "浏览数": view_count,
-            "发布时间": publish_time,
+            # 文本与标题兜底
+            "笔记标题": self._as_str(note.get("title")) or self._as_str(note.get("display_title")),
+            "笔记正文": self._as_str(note.get("desc")),
+            # 点赞/分享等计数兜底；好看数仅视频笔记有意义，其余类型兜底为 0
+            "点赞数": self._as_int(note.get("liked_count")) or self._as_int(note.get("likes")),
+            "评论数": self._as_int(note.get("comments_count")),
+            "收藏数": self._as_int(note.get("collected_count")),
+            "好看数": self._as_int(note.get("nice_count")) if note_type == "video" else 0,
+            "分享次数": self._as_int(note.get("shared_count")) or self._as_int(note.get("share_count")),
+            "笔记图片链接": ";".join(images) if images else "",
+            "浏览数": self._as_int(note.get("view_count")),
+            # 发布时间兜底
+            "发布时间": self._as_int(note.get("create_time")) or self._as_int(note.get("timestamp")),
             "是否是商品笔记": self._as_bool(note.get("is_goods_note")),
-            "笔记类型": self._as_str(note.get("type")),
+            "笔记类型": note_type,
         }
 
     # -----------------------------
-    # 核心：构建结构化数据（列表）
+    # 核心：构建结构化数据（按列写入，记录列表与 DataFrame 都由列生成）
     # -----------------------------
     def build_structured_output_base(self) -> List[Dict[str, Any]]:
-        doc = self._parse_input()
+        return _rows_from_columns(self._structured_columns())
+
+    def _build_columns(self) -> Columns:
+        doc = self._parsed_input()
 
         # 顶层可能是 dict（含“数据”数组）或直接是列表/字典
         datasets: List[Dict[str, Any]] = []
@@ -220,7 +436,7 @@ class XHSUserNotesStructuredOutputComponent(Component):
         elif isinstance(doc, list):
             datasets = [d for d in doc if isinstance(d, dict)]
 
-        final_results: List[Dict[str, Any]] = []
+        columns = _empty_columns(self.NOTE_FIELDS)
 
         for ds in datasets:
             raw = ds.get("原始")
@@ -238,18 +454,15 @@ class XHSUserNotesStructuredOutputComponent(Component):
                 notes = data_node.get("notes") or []
                 if not isinstance(notes, list):
                     continue
-                for n in notes:
-                    if isinstance(n, dict):
-                        mapped = self._map_note(n)
-                        final_results.append(mapped)
+                _append_rows(columns, (self._map_note(n) for n in notes if isinstance(n, dict)))
 
-        return final_results
+        return columns
 
     # -----------------------------
     # 输出：Data（Structure Output 类型）
     # -----------------------------
     def build_structured_output(self) -> Data:
-        output = self.build_structured_output_base()
+        output = self._structured_records()
         if not isinstance(output, list) or not output:
             msg = "No structured output returned"
             raise ValueError(msg)
@@ -261,10 +474,9 @@ class XHSUserNotesStructuredOutputComponent(Component):
     # 输出：DataFrame（便于列表展示）
     # -----------------------------
     def build_structured_dataframe(self) -> DataFrame:
-        output = self.build_structured_output_base()
-        if not isinstance(output, list) or not output:
+        # 直接由列构建：计数为 int64、布尔为 bool、发布时间为 datetime64，不经过逐行字典
+        columns = self._structured_columns()
+        if not _column_length(columns):
             msg = "No structured output returned"
             raise ValueError(msg)
-        if len(output) == 1:
-            return DataFrame([output[0]])
-        return DataFrame(output)
\ No newline at end of file
+        return DataFrame(_typed_column_arrays(self.NOTE_FIELDS, columns, self.DATETIME_FIELDS))
\ No newline at end of file
@@ -6,17 +6,23 @@ RedNote（小红书）组件
 
 主要功能：
  - 按关键词采集笔记（仅用 search-note v2；不再调用笔记详情接口）
- - 按笔记采集评论（仅使用评论 v2；可选二级评论；不做分页；不做客户端点赞排序）
+ - 按笔记采集评论（仅使用评论 v2；可选二级评论；基于 cursor 链分页，可配置页数/条数，下一页预取与当前页处理重叠；不做客户端点赞排序）
  - 按用户信息采集笔记（v4→v2；不再调用笔记详情接口）
 
 输出：统一中文键 JSON，包含 meta（请求耗时、版本选择、统计），错误信息包含隐藏 Token 的请求路径。
 """
 
+import copy
 import json
+import os
 import re
+import sqlite3
+import threading
 import time
 import random
-from typing import Any, Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 
 
@@ -35,6 +41,60 @@ from langflow.io import (
 from langflow.schema.data import Data
 
 
+# -----------------------------
+# 话题标签提取（XHS 采集、结构化输出与爬虫组件共用同一份实现，修改时请逐字同步）
+# 各组件输出的标签格式保持原样，这里只把各自的正则预编译为模块级常量，按格式名选用：
+# - "正文"（结构化输出的正文兜底）：# 之后到下一个 # 或换行为止，"#名称[话题]#" 得到 "名称[话题]"
+# - "成对"（XHS 采集）：成对 # 之间的内容，同样保留 "[话题]" 后缀
+# - "名称"（爬虫组件）：文本开头或空白之后的 #名称（全角＃视同半角），只取名称并去重
+# -----------------------------
+_HASHTAG_PATTERNS: Dict[str, "re.Pattern[str]"] = {
+    "正文": re.compile(r"#([^#\n\r]+)"),
+    "成对": re.compile(r"#([^#]+)#"),
+    "名称": re.compile(r"(?:^|\s)#([\w\-\u4e00-\u9fa5]+)"),
+}
+
+
+def _extract_hashtags(text: Any, style: str) -> List[str]:
+    """单段文本 -> 标签列表（格式见上）；非字符串或不含 # 的文本不进入正则"""
+    if not isinstance(text, str) or ("#" not in text and "＃" not in text):
+        return []
+    if style == "名称":
+        text = text.replace("＃", "#")
+    tags = [t for t in map(str.strip, _HASHTAG_PATTERNS[style].findall(text)) if t]
+    return list(dict.fromkeys(tags)) if style == "名称" else tags
+
+
+# -----------------------------
+# 时间戳秒 / 毫秒判定：大于 _MS_TS_THRESHOLD 视为毫秒（与结构化输出组件的时间戳工具使用同一阈值）。
+# 采集组件每次只换算一页数据，逐条整数运算即可，不依赖 NumPy
+# -----------------------------
+_MS_TS_THRESHOLD = 10**11
+
+
+def _ts_seconds(ts: int) -> int:
+    return ts // 1000 if ts > _MS_TS_THRESHOLD else ts
+
+
+# ---------------- 进程级请求合并（singleflight）----------------
+# 同一 worker 内多个流程/组件实例同时请求相同接口与参数时，只发出一次真实请求，
+# 其余调用方等待并共享结果（各自拿到深拷贝，避免相互修改）。
+# 注意：登记表是本模块的全局变量，只在同一个模块实例内生效。LangFlow 每次构建会重新 exec 组件源码，
+# 得到各自独立的 _INFLIGHT_CALLS，因此只有共用同一次加载结果的调用方（同一组件实例的并发请求、
+# 以普通模块导入本文件的脚本）才会被合并，跨流程/跨构建的相同请求仍各自发出。
+
+@dataclass(slots=True)
+class _InflightCall:
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[BaseException] = None
+    followers: int = 0
+
+
+_INFLIGHT_LOCK = threading.Lock()
+_INFLIGHT_CALLS: Dict[Tuple[Any, ...], _InflightCall] = {}
+
+
 class XiaohongshuRedNote(Component):
     display_name = "RedNote（小红书）"
     description = "面向 Just One API 的小红书组件：关键词笔记、用户笔记、笔记评论统一采集，输出中文键 JSON。已移除笔记详情相关开关，所有模式仅使用列表/评论接口（不调用 v7/v3 详情）。"
@@ -54,6 +114,12 @@ class XiaohongshuRedNote(Component):
     REQUEST_RETRY_ATTEMPTS: int = 3  # 网络/5xx/429/无效JSON时最多重试 3 次
     REQUEST_RETRY_BACKOFF_BASE_MS: int = 600  # 退避基线 600ms（指数退避：600, 1200, 2400...）
     REQUEST_RETRY_BACKOFF_JITTER_MS: int = 400  # 退避抖动范围 0~400ms，避免踩同一时间窗
+    # 合并请求的等待上限（秒）：超过该时间首个调用方仍未返回时，等待方放弃共享、自行发出请求
+    INFLIGHT_WAIT_SECONDS: int = 240  # 约为 3 次 75s 超时加退避的总耗时
+    # 评论翻页选择“全部”（页数填 0）时的安全上限，防止 cursor 异常导致无限翻页
+    COMMENT_ALL_PAGES_LIMIT: int = 1000
+    # 本地增量状态库（SQLite）默认路径：记录已采集评论ID/时间与最新游标
+    LOCAL_STORE_PATH: str = "~/.xhs_rednote_state.sqlite3"
 
     ENV_BASE: Dict[str, str] = {
         "中国区": "http://47.117.133.51:30015",
@@ -380,7 +446,42 @@ class XiaohongshuRedNote(Component):
             value=False,
             tool_mode=True,
         ),
-        # 评论模式不分页：移除 comments_last_cursor 输入
+        IntInput(
+            name="comment_pages",
+            display_name="评论页数",
+            info="一级评论最多翻页数（基于 has_more/cursor 链）；0 表示全部",
+            value=2,
+            tool_mode=True,
+        ),
+        IntInput(
+            name="comment_max_count",
+            display_name="评论条数上限",
+            info="一级评论最多采集条数，达到后停止翻页；0 表示不限",
+            value=0,
+            tool_mode=True,
+        ),
+        IntInput(
+            name="sub_comment_pages",
+            display_name="二级评论页数",
+            info="每条一级评论的二级回复最多翻页数；0 表示全部",
+            value=2,
+            tool_mode=True,
+        ),
+        BoolInput(
+            name="incremental_sync",
+            display_name="增量同步",
+            info="开启后使用本地 SQLite 状态：评论模式记录已采集评论ID/时间与游标，“最新”排序下遇到已采集评论即停止翻页，仅输出新增评论与新增二级回复；用户笔记模式记录笔记更新时间与互动数，某页全部未变化即停止翻页，仅输出新增/变化的笔记",
+            value=False,
+            tool_mode=True,
+        ),
+        StrInput(
+            name="local_store_path",
+            display_name="本地状态库路径",
+            info="增量同步使用的 SQLite 文件路径；为空则使用组件常量 LOCAL_STORE_PATH",
+            value="",
+            advanced=True,
+        ),
+        # 评论分页由 cursor 链驱动：不提供 comments_last_cursor 输入
 
         StrInput(
             name="xhs_user_id",
@@ -416,6 +517,53 @@ class XiaohongshuRedNote(Component):
         return f"{t[:3]}***{t[-4:]}"
 
     def _http_get(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        请求入口：按 (环境, 路径, 规范化参数) 合并同时进行的相同请求。
+        首个调用方真正发出请求（_http_get_uncoalesced），其余调用方最多等待 INFLIGHT_WAIT_SECONDS 秒并共享其响应，
+        超时则自行请求。合并范围限于同一个模块实例（见 _INFLIGHT_CALLS 处说明），LangFlow 重新 exec 源码后不共享。
+        """
+        token = getattr(self, "token", None) or self.JOA_TOKEN
+        key = (
+            self._base_url(),
+            path,
+            str(token),
+            tuple(sorted((str(k), str(v)) for k, v in params.items() if v not in (None, ""))),
+        )
+        with _INFLIGHT_LOCK:
+            call = _INFLIGHT_CALLS.get(key)
+            leader = call is None
+            if leader:
+                call = _INFLIGHT_CALLS[key] = _InflightCall()
+            else:
+                call.followers += 1
+
+        if not leader:
+            wait_s = max(1, int(getattr(self, "INFLIGHT_WAIT_SECONDS", 240) or 240))
+            if not call.done.wait(wait_s):
+                timed_out = self._metrics.setdefault("coalesce_timeout", {})
+                timed_out[path] = timed_out.get(path, 0) + 1
+                return self._http_get_uncoalesced(path, params)
+            coalesced = self._metrics.setdefault("coalesced", {})
+            coalesced[path] = coalesced.get(path, 0) + 1
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = self._http_get_uncoalesced(path, params)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # 先摘除再唤醒：此后到达的相同请求会重新发起，不会拿到过期结果
+            with _INFLIGHT_LOCK:
+                _INFLIGHT_CALLS.pop(key, None)
+                shared = call.followers > 0
+            call.done.set()
+        # 有其他调用方共享时返回副本，保证共享的原始结果不被任何一方修改
+        return copy.deepcopy(call.result) if shared else call.result
+
+    def _http_get_uncoalesced(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
         url = f"{self._base_url()}{path}"
         token = getattr(self, "token", None) or self.JOA_TOKEN
         query = {"token": token, **{k: v for k, v in params.items() if v not in (None, "")}}
@@ -748,10 +896,7 @@ class XiaohongshuRedNote(Component):
 
     @staticmethod
     def _extract_tags_from_text(text: Optional[str]) -> List[str]:
-        if not isinstance(text, str) or not text:
-            return []
-        tags = re.findall(r"#([^#]+)#", text)
-        return [t.strip() for t in tags if t.strip()]
+        return _extract_hashtags(text, "成对")
 
     @staticmethod
     def _is_official_verified(user: Dict[str, Any]) -> bool:
@@ -865,23 +1010,28 @@ class XiaohongshuRedNote(Component):
         return int(time.time())
 
     @staticmethod
-    def _normalize_ts(ts: Any) -> Optional[int]:
-        try:
-            if ts is None:
+    def _ts_int_or_none(ts: Any) -> Optional[int]:
+        # 仅接受整数与纯数字字符串，其余（含浮点、空串）视为无法识别
+        if isinstance(ts, int):
+            return ts
+        if isinstance(ts, str) and ts.isdigit():
+            try:
+                return int(ts)
+            except ValueError:
                 return None
-            if isinstance(ts, int):
-                if ts > 10_000_000_000:
-                    return ts // 1000
-                return ts
-            if isinstance(ts, str) and ts.isdigit():
-                val = int(ts)
-                if val > 10_000_000_000:
-                    return val // 1000
-                return val
-        except Exception:
-            return None
         return None
 
+    @classmethod
+    def _normalize_ts(cls, ts: Any) -> Optional[int]:
+        val = cls._ts_int_or_none(ts)
+        return None if val is None else _ts_seconds(val)
+
+    @classmethod
+    def _normalize_ts_column(cls, values: Iterable[Any]) -> List[Optional[int]]:
+        """整列原始时间戳 -> 秒级时间戳；无法识别的值为 None，与逐条 _normalize_ts 一致"""
+        ints = [cls._ts_int_or_none(v) for v in values]
+        return [None if v is None else _ts_seconds(v) for v in ints]
+
     def _in_time_range(self, ts: Optional[int], days: int) -> bool:
         if ts is None:
             return True
@@ -1184,6 +1334,275 @@ class XiaohongshuRedNote(Component):
             # 若出现异常，返回原始 resp，避免影响功能
             return resp
 
+    # ---------------- 本地增量状态（SQLite）----------------
+    def _local_store_path(self) -> str:
+        return os.path.expanduser((getattr(self, "local_store_path", "") or "").strip() or self.LOCAL_STORE_PATH)
+
+    def _local_store_error(self, e: Exception) -> Dict[str, Any]:
+        return {"类型": "local_store_error", "消息": f"本地状态库无法打开：{e}", "调试": {"路径": self._local_store_path()}}
+
+    def _open_local_store(self) -> sqlite3.Connection:
+        """打开（必要时创建）本地状态库；目录不可写、文件损坏等失败抛出 OSError / sqlite3.Error，由调用方写入“错误”"""
+        path = self._local_store_path()
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        conn = sqlite3.connect(path)
+        try:
+            self._init_local_store(conn)
+        except Exception:
+            conn.close()
+            raise
+        return conn
+
+    @staticmethod
+    def _init_local_store(conn: sqlite3.Connection) -> None:
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS comment_seen (
+                note_id TEXT NOT NULL,
+                comment_id TEXT NOT NULL,
+                parent_id TEXT,
+                create_time INTEGER,
+                sub_comment_count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (note_id, comment_id)
+            );
+            CREATE TABLE IF NOT EXISTS comment_sync_state (
+                note_id TEXT PRIMARY KEY,
+                latest_time INTEGER,
+                last_cursor TEXT,
+                synced_at INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS user_note_store (
+                user_id TEXT NOT NULL,
+                note_id TEXT NOT NULL,
+                update_time INTEGER,
+                likes INTEGER,
+                comments_count INTEGER,
+                collected_count INTEGER,
+                share_count INTEGER,
+                view_count INTEGER,
+                synced_at INTEGER NOT NULL,
+                PRIMARY KEY (user_id, note_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_user_note_store_update ON user_note_store (user_id, update_time DESC);
+            """
+        )
+
+    @staticmethod
+    def _load_seen_comments(conn: sqlite3.Connection, note_id: str) -> Dict[str, int]:
+        """返回 {评论ID: 上次记录的二级评论数}（含根评论与二级回复）。"""
+        rows = conn.execute("SELECT comment_id, sub_comment_count FROM comment_seen WHERE note_id = ?", (note_id,))
+        return {str(cid): int(cnt or 0) for cid, cnt in rows}
+
+    @staticmethod
+    def _load_comment_sync_state(conn: sqlite3.Connection, note_id: str) -> Tuple[Optional[int], Optional[str]]:
+        """返回上次同步记录的 (最新根评论时间, 续采 cursor)；没有记录时为 (None, None)。"""
+        row = conn.execute("SELECT latest_time, last_cursor FROM comment_sync_state WHERE note_id = ?", (note_id,)).fetchone()
+        return (row[0] or None, row[1] or None) if row else (None, None)
+
+    def _save_comment_sync(
+        self,
+        conn: sqlite3.Connection,
+        note_id: str,
+        comments: List[Dict[str, Any]],
+        sub_counts: Dict[str, int],
+        last_cursor: Optional[str],
+    ) -> None:
+        """
+        sub_counts: 本次处理过的根评论 -> 要记录的二级评论数。只有回复已完整采集的根评论记为当前数，
+        其余保持上次记录的值，下次仍会因数量增长而补采；其中未出现在 comments 中的根评论（已采集、无新增回复）只更新该数。
+        """
+        rows: List[Tuple[Any, ...]] = []
+        raw_ts: List[Any] = []
+        for c in comments:
+            cid = str(c.get("评论ID"))
+            rows.append((note_id, cid, None, None, sub_counts.get(cid, 0)))
+            raw_ts.append(c.get("发布时间"))
+            for r in c.get("二级评论") or []:
+                rows.append((note_id, str(r.get("评论ID")), cid, None, 0))
+                raw_ts.append(r.get("发布时间"))
+        # 根评论与回复的时间戳整列归一化后回填；最新时间只统计根评论
+        ts_col = self._normalize_ts_column(raw_ts)
+        rows = [row[:3] + (ts,) + row[4:] for row, ts in zip(rows, ts_col)]
+        emitted = {row[1] for row in rows if row[2] is None}
+        rows += [(note_id, cid, None, None, cnt) for cid, cnt in sub_counts.items() if cid not in emitted]
+        root_ts = [ts for row, ts in zip(rows, ts_col) if row[2] is None and ts is not None]
+        latest: Optional[int] = max(root_ts) if root_ts else None
+        with conn:
+            conn.executemany(
+                """
+                INSERT INTO comment_seen (note_id, comment_id, parent_id, create_time, sub_comment_count)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (note_id, comment_id) DO UPDATE SET sub_comment_count = excluded.sub_comment_count
+                """,
+                rows,
+            )
+            conn.execute(
+                """
+                INSERT INTO comment_sync_state (note_id, latest_time, last_cursor, synced_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT (note_id) DO UPDATE SET
+                    latest_time = MAX(COALESCE(comment_sync_state.latest_time, 0), COALESCE(excluded.latest_time, 0)),
+                    last_cursor = COALESCE(excluded.last_cursor, comment_sync_state.last_cursor),
+                    synced_at = excluded.synced_at
+                """,
+                (note_id, latest, last_cursor, self._now_seconds()),
+            )
+
+    @staticmethod
+    def _as_count(value: Any) -> Optional[int]:
+        try:
+            return None if value is None or value == "" else int(value)
+        except (TypeError, ValueError):
+            return None
+
+    def _upsert_user_notes(
+        self,
+        conn: sqlite3.Connection,
+        user_id: str,
+        rows: List[Tuple[str, Optional[int], Optional[int], Optional[int], Optional[int], Optional[int], Optional[int]]],
+    ) -> Dict[str, str]:
+        """
+        rows: (笔记ID, 更新时间, 点赞, 评论, 收藏, 分享, 浏览)。
+        与本地库比较后仅写入新增或变化的行，返回 {笔记ID: "新增" | "更新"}（未变化的不在其中）。
+        """
+        ids = [r[0] for r in rows if r[0]]
+        if not ids:
+            return {}
+        stored: Dict[str, Tuple[Any, ...]] = {}
+        placeholders = ",".join("?" for _ in ids)
+        for row in conn.execute(
+            f"""
+            SELECT note_id, update_time, likes, comments_count, collected_count, share_count, view_count
+            FROM user_note_store WHERE user_id = ? AND note_id IN ({placeholders})
+            """,
+            (user_id, *ids),
+        ):
+            stored[row[0]] = tuple(row[1:])
+        changes: Dict[str, str] = {}
+        upserts: List[Tuple[Any, ...]] = []
+        now = self._now_seconds()
+        for note_id, *values in rows:
+            if not note_id:
+                continue
+            prev = stored.get(note_id)
+            if prev is not None and tuple(values) == prev:
+                continue
+            changes[note_id] = "新增" if prev is None else "更新"
+            upserts.append((user_id, note_id, *values, now))
+        if upserts:
+            with conn:
+                conn.executemany(
+                    """
+                    INSERT INTO user_note_store
+                        (user_id, note_id, update_time, likes, comments_count, collected_count, share_count, view_count, synced_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (user_id, note_id) DO UPDATE SET
+                        update_time = excluded.update_time,
+                        likes = excluded.likes,
+                        comments_count = excluded.comments_count,
+                        collected_count = excluded.collected_count,
+                        share_count = excluded.share_count,
+                        view_count = excluded.view_count,
+                        synced_at = excluded.synced_at
+                    """,
+                    upserts,
+                )
+        return changes
+
+    def _iter_cursor_pages(
+        self,
+        fetch: Callable[[Optional[str]], Dict[str, Any]],
+        max_pages: int,
+        stop: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        pool: Optional[ThreadPoolExecutor] = None,
+    ) -> Iterator[Tuple[Dict[str, Any], Optional[str]]]:
+        """
+        沿 cursor 链逐页产出 (响应, 本页请求所用 cursor)：
+        - max_pages <= 0 表示“全部”，受 COMMENT_ALL_PAGES_LIMIT 兜底；
+        - 当前页返回后立即在后台线程预取下一页，调用方处理本页的同时网络请求已在进行；
+        - 接口失败、has_more 为假、cursor 不再前进或 stop(本页响应) 为真时停止（不再预取）；
+        - pool 为调用方持有的线程池（同一次运行内多条 cursor 链共用）；未提供时本次遍历自建单线程池。
+        """
+        limit = max_pages if max_pages > 0 else max(1, int(self.COMMENT_ALL_PAGES_LIMIT))
+        executor = pool or ThreadPoolExecutor(max_workers=1)
+        cursor: Optional[str] = None
+        pending: Optional[Future] = executor.submit(fetch, cursor)
+        try:
+            page = 0
+            while pending is not None:
+                resp = pending.result()
+                pending = None
+                page += 1
+                data = resp.get("data") if resp.get("code") == 0 else None
+                if isinstance(data, dict) and data.get("has_more") and page < limit and not (stop and stop(resp)):
+                    next_cursor = data.get("cursor")
+                    if next_cursor and next_cursor != cursor:
+                        pending = executor.submit(fetch, next_cursor)
+                used_cursor, cursor = cursor, (data.get("cursor") if isinstance(data, dict) else cursor)
+                yield resp, used_cursor
+        finally:
+            # 调用方提前结束遍历时，尚未开始的预取不再发出
+            if pending is not None:
+                pending.cancel()
+            if pool is None:
+                executor.shutdown(wait=True)
+
+    def iter_note_comment_pages(
+        self,
+        note_id: str,
+        sort: str,
+        max_pages: int = 2,
+        max_count: int = 0,
+        stop: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        pool: Optional[ThreadPoolExecutor] = None,
+    ) -> Iterator[Tuple[Dict[str, Any], List[Dict[str, Any]], Optional[str]]]:
+        """
+        一级评论流式采集：每翻一页产出 (原始响应, 本页评论, 续采 cursor)，调用方可边采集边消费，
+        无需等全部页完成。max_count > 0 时达到条数即停止（末页按需截断），且不会再预取下一页；
+        stop(本页响应) 为真时本页之后不再翻页。
+        续采 cursor 为从本页之后继续采集应使用的 cursor：通常是本页响应中的 cursor；
+        末页被 max_count 截断时接口 cursor 已越过被丢弃的评论，此时返回请求本页所用的 cursor，
+        续采会重新请求该页（增量同步模式下其中已输出的评论按“已采集”跳过）。
+        """
+        note_author_id: Optional[str] = None
+        collected = 0
+        fetched = 0
+
+        def should_stop(resp: Dict[str, Any]) -> bool:
+            # 在预取下一页之前判断：条数已够或调用方要求停止时不再发起请求
+            nonlocal fetched
+            items = (resp.get("data") or {}).get("comments") or []
+            fetched += len(items) if isinstance(items, list) else 0
+            if max_count > 0 and fetched >= max_count:
+                return True
+            return bool(stop and stop(resp))
+
+        pages = self._iter_cursor_pages(
+            lambda cur: self._get_note_comments_v2(note_id, sort, cur), max_pages, should_stop, pool
+        )
+        try:
+            for resp, used_cursor in pages:
+                page_comments: List[Dict[str, Any]] = []
+                resume_cursor = used_cursor
+                data = resp.get("data")
+                if resp.get("code") == 0 and isinstance(data, dict):
+                    if note_author_id is None:
+                        note_author_id = data.get("user_id")
+                    items = data.get("comments") or data.get("list") or data.get("items") or []
+                    truncated = max_count > 0 and len(items) > max_count - collected
+                    if truncated:
+                        items = items[: max(0, max_count - collected)]
+                    else:
+                        resume_cursor = data.get("cursor")
+                    page_comments = [self._format_comment_item(c, note_author_id, "根评论") for c in items]
+                collected += len(page_comments)
+                yield resp, page_comments, resume_cursor
+                if max_count > 0 and collected >= max_count:
+                    break
+        finally:
+            pages.close()
+
     def _format_comment_item(self, c: Dict[str, Any], note_author_id: Optional[str] = None, level: str = "根评论") -> Dict[str, Any]:
         # 过滤评论中的用户字段，减小输出体积
         user_obj = self._filter_user_basic(c.get("user") or {})
@@ -1217,6 +1636,46 @@ class XiaohongshuRedNote(Component):
             pass
         return cm
 
+    def _collect_sub_comments(
+        self,
+        note_id: str,
+        comment: Dict[str, Any],
+        note_author_id: Optional[str],
+        max_pages: int,
+        seen: Dict[str, int],
+        sync_stat: Dict[str, int],
+        pool: Optional[ThreadPoolExecutor] = None,
+    ) -> bool:
+        """
+        沿 cursor 链采集一条根评论的二级回复，写入其“二级评论”与“二级评论原始响应”；已采集的回复计入跳过数。
+        返回回复是否已完整采集（没有回复，或翻到了最后一页）；接口失败或受页数上限截断时为 False。
+        """
+        cid = comment.get("评论ID")
+        if not (cid and (comment.get("二级评论数") or 0) > 0):
+            return True
+        comment["二级评论"] = []
+        complete = False
+        sub_pages = self._iter_cursor_pages(
+            lambda cur: self._get_note_sub_comments(note_id, cid, cur), max_pages, pool=pool
+        )
+        try:
+            for sub_resp, _ in sub_pages:
+                # 二级评论原始响应过滤
+                comment.setdefault("二级评论原始响应", []).append(self._filter_keys_recursive(sub_resp, self.COMMENT_FILTER_KEYS))
+                data = sub_resp.get("data")
+                if sub_resp.get("code") != 0 or not isinstance(data, dict):
+                    complete = False
+                    break # API 失败则中止
+                complete = not data.get("has_more")
+                for sc in data.get("comments", []):
+                    if seen and str((sc or {}).get("id")) in seen:
+                        sync_stat["跳过已采集"] += 1
+                        continue
+                    comment["二级评论"].append(self._format_comment_item(sc, note_author_id, "二级评论"))
+        finally:
+            sub_pages.close()
+        return complete
+
     def build_output(self) -> Data:
         self._metrics = {"request_durations": {}, "version_choice": []}
 
@@ -1289,86 +1748,114 @@ class XiaohongshuRedNote(Component):
 
             sort_internal = self.COMMENT_SORT_MAP.get(comment_mode, "normal")
             
-            # ---一级评论分页采集 (最多2页)---
-            comments: List[Dict[str, Any]] = []
-            note_author_id = None
-            l1_last_cursor = None
-            l1_has_more = True
-            l1_raw_responses = []
-
-            for _ in range(2):
-                if not l1_has_more and _ > 0:
-                    break
-                
-                resp = self._get_note_comments_v2(note_id, sort_internal, l1_last_cursor)
-                # 一级评论原始响应进行过滤
-                l1_raw_responses.append(self._filter_keys_recursive(resp, self.COMMENT_FILTER_KEYS))
-
-                if resp.get("code") == 0 and isinstance(resp.get("data"), dict):
-                    data = resp["data"]
-                    items = data.get("comments") or data.get("list") or data.get("items") or []
-                    if note_author_id is None:
-                        note_author_id = data.get("user_id")
-
-                    for c in items:
-                        comments.append(self._format_comment_item(c, note_author_id, "根评论"))
+            comment_pages: int = max(0, int(getattr(self, "comment_pages", 2) or 0))
+            comment_max_count: int = max(0, int(getattr(self, "comment_max_count", 0) or 0))
+            sub_comment_pages: int = max(0, int(getattr(self, "sub_comment_pages", 2) or 0))
+            incremental: bool = bool(getattr(self, "incremental_sync", False))
 
-                    l1_has_more = data.get("has_more", False)
-                    l1_last_cursor = data.get("cursor")
-                else:
-                    break # API 失败则中止
+            # 增量同步：载入该笔记已采集的评论与上次同步位置；“最新”排序下某页出现已采集评论、
+            # 不晚于上次最新时间的评论或到达上次的续采 cursor 即不再翻页（其他排序不按时间排列，只按评论ID去重）
+            try:
+                store: Optional[sqlite3.Connection] = self._open_local_store() if incremental else None
+            except (OSError, sqlite3.Error) as e:
+                result["错误"] = self._local_store_error(e)
+                return Data(data=result)
+            # 本地状态库在本次采集结束（含异常）时关闭
+            try:
+                seen: Dict[str, int] = self._load_seen_comments(store, note_id) if store is not None else {}
+                synced_time, synced_cursor = self._load_comment_sync_state(store, note_id) if store is not None else (None, None)
+                stop_at_seen = None
+                if (seen or synced_time or synced_cursor) and sort_internal == "latest":
+                    def stop_at_seen(page_resp: Dict[str, Any]) -> bool:
+                        page_data = page_resp.get("data") or {}
+                        page_items = page_data.get("comments") or []
+                        if synced_cursor and page_data.get("cursor") == synced_cursor:
+                            return True
+                        if any(str((it or {}).get("id")) in seen for it in page_items):
+                            return True
+                        if synced_time:
+                            page_ts = self._normalize_ts_column((it or {}).get("time") for it in page_items)
+                            return any(ts is not None and ts <= synced_time for ts in page_ts)
+                        return False
+                sync_stat = {"新增评论": 0, "新增回复": 0, "跳过已采集": 0}
+                # 本次处理过的根评论 -> 写回的二级评论数（回复未完整采集时保持上次记录的值）
+                sub_counts: Dict[str, int] = {}
+
+                # ---一级评论分页采集（cursor 链；页数/条数可配置，0 表示全部）---
+                # 逐页消费：每页到达后立即转换、采集其二级回复并并入输出，原始页随即释放；
+                # 根评论下一页的预取与二级回复翻页共用同一个线程池
+                comments: List[Dict[str, Any]] = []
+                note_author_id = None
+                l1_last_cursor = None
+                l1_raw_responses = []
+
+                with ThreadPoolExecutor(max_workers=2) as pool:
+                    for resp, page_comments, resume_cursor in self.iter_note_comment_pages(
+                        note_id, sort_internal, comment_pages, comment_max_count, stop_at_seen, pool
+                    ):
+                        # 一级评论原始响应进行过滤
+                        l1_raw_responses.append(self._filter_keys_recursive(resp, self.COMMENT_FILTER_KEYS))
+                        data = resp.get("data")
+                        if resp.get("code") != 0 or not isinstance(data, dict):
+                            break # API 失败则中止
+                        if note_author_id is None:
+                            note_author_id = data.get("user_id")
+                        if seen:
+                            # 已采集的根评论仅在二级评论数增长时保留，用于承载新增回复
+                            fresh = []
+                            for r in page_comments:
+                                prev_sub = seen.get(str(r.get("评论ID")))
+                                if prev_sub is None:
+                                    fresh.append(r)
+                                elif include_sub_comments and (r.get("二级评论数") or 0) > prev_sub:
+                                    fresh.append(r)
+                                else:
+                                    sync_stat["跳过已采集"] += 1
+                            page_comments = fresh
+
+                        # ---二级评论分页采集（对本页每个一级评论，页数可配置，0 表示全部）---
+                        for c in page_comments:
+                            cid = str(c.get("评论ID"))
+                            complete = include_sub_comments and self._collect_sub_comments(
+                                note_id, c, note_author_id, sub_comment_pages, seen, sync_stat, pool
+                            )
+                            sub_counts[cid] = int(c.get("二级评论数") or 0) if complete else seen.get(cid, 0)
+                        if store is not None:
+                            # 已采集根评论若没有带来新增回复则不输出
+                            page_comments = [c for c in page_comments if str(c.get("评论ID")) not in seen or c.get("二级评论")]
+                        comments.extend(page_comments)
+                        l1_last_cursor = resume_cursor
 
-            block: Dict[str, Any] = {
-                "笔记ID": note_id,
-                "原始": l1_raw_responses, # 存储所有一级评论的原始响应
-                "评论": [],
-                "请求信息": {
-                    "环境": getattr(self, "environment", "中国区"),
-                    "评论": {
-                        "path_v2": self.PATHS["note_comment_v2"],
-                        "url_v2": f"{base_url}{self.PATHS['note_comment_v2']}",
-                        "params_v2": {
-                            **self._build_params(
-                                required={"noteId": note_id},
-                                optional={"sort": sort_internal, "lastCursor": l1_last_cursor},
-                            ),
-                            "token": self._mask_token(token_val),
-                        },
+                block: Dict[str, Any] = {
+                    "笔记ID": note_id,
+                    "原始": l1_raw_responses, # 存储所有一级评论的原始响应
+                    "评论": comments,
+                    "请求信息": {
+                        "环境": getattr(self, "environment", "中国区"),
+                        "评论": {
+                            "path_v2": self.PATHS["note_comment_v2"],
+                            "url_v2": f"{base_url}{self.PATHS['note_comment_v2']}",
+                            "params_v2": {
+                                **self._build_params(
+                                    required={"noteId": note_id},
+                                    optional={"sort": sort_internal, "lastCursor": l1_last_cursor},
+                                ),
+                                "token": self._mask_token(token_val),
+                            },
+                        }
                     }
                 }
-            }
 
-            # ---二级评论分页采集 (对每个一级评论，最多采集2页)---
-            if include_sub_comments and comments:
-                for c in comments:
-                    cid = c.get("评论ID")
-                    if not (cid and c.get("二级评论数", 0) > 0):
-                        continue
-                    
-                    c["二级评论"] = []
-                    l2_last_cursor = None
-                    l2_has_more = True
-
-                    for _ in range(2):
-                        if not l2_has_more and _ > 0:
-                            break
-                        
-                        sub_resp = self._get_note_sub_comments(note_id, cid, l2_last_cursor)
-                        # 二级评论原始响应过滤
-                        c.setdefault("二级评论原始响应", []).append(self._filter_keys_recursive(sub_resp, self.COMMENT_FILTER_KEYS))
-                        
-                        if sub_resp.get("code") == 0 and isinstance(sub_resp.get("data"), dict):
-                            data = sub_resp["data"]
-                            sub_items = data.get("comments", [])
-                            for sc in sub_items:
-                                c["二级评论"].append(self._format_comment_item(sc, note_author_id, "二级评论"))
-                            
-                            l2_has_more = data.get("has_more", False)
-                            l2_last_cursor = data.get("cursor")
-                        else:
-                            break # API 失败则中止
+                if store is not None:
+                    # 写回本地状态
+                    sync_stat["新增评论"] = sum(1 for c in comments if str(c.get("评论ID")) not in seen)
+                    sync_stat["新增回复"] = sum(len(c.get("二级评论") or []) for c in comments)
+                    self._save_comment_sync(store, note_id, comments, sub_counts, l1_last_cursor)
+                    result["meta"]["增量同步"] = sync_stat
+            finally:
+                if store is not None:
+                    store.close()
 
-            block["评论"] = comments
             result["数据"].append(block)
 
         elif mode_internal == "user_notes":
@@ -1395,135 +1882,177 @@ class XiaohongshuRedNote(Component):
 
             total_notes_cnt = 0
 
-            for page_idx in range(max_pages):
-                resp = self._get_user_notes(user_id, last_cursor)
+            # 增量模式：按 (用户, 笔记) 比对本地库，遇到整页未变化即停止翻页；本地库在输入校验通过后才打开，翻页结束（含异常）时关闭
+            try:
+                note_store: Optional[sqlite3.Connection] = (
+                    self._open_local_store() if bool(getattr(self, "incremental_sync", False)) else None
+                )
+            except (OSError, sqlite3.Error) as e:
+                result["错误"] = self._local_store_error(e)
+                return Data(data=result)
+            store_stat = {"新增笔记": 0, "更新笔记": 0, "未变化": 0}
+            store_caught_up = False
 
-                if resp.get("code") != 0:
-                    result.setdefault("错误列表", []).append(
-                        {"步骤": f"用户笔记 第{page_idx+1}页", "错误": resp.get("error") or {"类型": "unknown", "消息": resp.get("message", "未知错误")}}
-                    )
+            try:
+                for page_idx in range(max_pages):
+                    resp = self._get_user_notes(user_id, last_cursor)
 
-                # 构建页面块并按需过滤用户信息与原始响应
-                block: Dict[str, Any] = {
-                    "页码": page_idx + 1,
-                    "用户ID": user_id,
-                    # 顶层用户信息过滤：在原有基础上进一步移除非核心字段
-                    "用户信息": self._filter_keys_recursive(
-                        user_info,
-                        self.USER_INFO_FILTER_KEYS.union(self.USER_INFO_FILTER_KEYS_FOR_USER_NOTES),
-                    ),
-                    # 原始响应过滤（每页用户笔记列表）：移除 UI/内部用途字段与不必要的子键
-                    "原始": self._filter_keys_recursive(
-                        resp,
-                        self.SEARCH_FILTER_KEYS.union(self.USER_NOTES_ITEM_FILTER_KEYS),
-                        self.USER_NOTES_ITEM_CHILD_FILTER_MAP,
-                    ),
-                    "笔记": [],
-                    "请求信息": {
-                        "环境": getattr(self, "environment", "中国区"),
-                        "用户": {
-                            "path_v4": self.PATHS["user_info_v4"],
-                            "url_v4": f"{base_url}{self.PATHS['user_info_v4']}",
-                            "params_v4": {**self._build_params(required={"userId": user_id}), "token": self._mask_token(token_val)},
-                            "path_v3": self.PATHS["user_info_v3"],
-                            "url_v3": f"{base_url}{self.PATHS['user_info_v3']}",
-                            "params_v3": {**self._build_params(required={"userId": user_id}), "token": self._mask_token(token_val)},
-                        },
-                        "用户笔记": {
-                            "path_v4": self.PATHS["user_note_list_v4"],
-                            "url_v4": f"{base_url}{self.PATHS['user_note_list_v4']}",
-                            "params_v4": {
-                                **self._build_params(required={"userId": user_id}, optional={"lastCursor": last_cursor}),
-                                "token": self._mask_token(token_val),
+                    if resp.get("code") != 0:
+                        result.setdefault("错误列表", []).append(
+                            {"步骤": f"用户笔记 第{page_idx+1}页", "错误": resp.get("error") or {"类型": "unknown", "消息": resp.get("message", "未知错误")}}
+                        )
+
+                    # 构建页面块并按需过滤用户信息与原始响应
+                    block: Dict[str, Any] = {
+                        "页码": page_idx + 1,
+                        "用户ID": user_id,
+                        # 顶层用户信息过滤：在原有基础上进一步移除非核心字段
+                        "用户信息": self._filter_keys_recursive(
+                            user_info,
+                            self.USER_INFO_FILTER_KEYS.union(self.USER_INFO_FILTER_KEYS_FOR_USER_NOTES),
+                        ),
+                        # 原始响应过滤（每页用户笔记列表）：移除 UI/内部用途字段与不必要的子键
+                        "原始": self._filter_keys_recursive(
+                            resp,
+                            self.SEARCH_FILTER_KEYS.union(self.USER_NOTES_ITEM_FILTER_KEYS),
+                            self.USER_NOTES_ITEM_CHILD_FILTER_MAP,
+                        ),
+                        "笔记": [],
+                        "请求信息": {
+                            "环境": getattr(self, "environment", "中国区"),
+                            "用户": {
+                                "path_v4": self.PATHS["user_info_v4"],
+                                "url_v4": f"{base_url}{self.PATHS['user_info_v4']}",
+                                "params_v4": {**self._build_params(required={"userId": user_id}), "token": self._mask_token(token_val)},
+                                "path_v3": self.PATHS["user_info_v3"],
+                                "url_v3": f"{base_url}{self.PATHS['user_info_v3']}",
+                                "params_v3": {**self._build_params(required={"userId": user_id}), "token": self._mask_token(token_val)},
                             },
-                            "path_v2": self.PATHS["user_note_list_v2"],
-                            "url_v2": f"{base_url}{self.PATHS['user_note_list_v2']}",
-                            "params_v2": {
-                                **self._build_params(required={"userId": user_id}, optional={"lastCursor": last_cursor}),
-                                "token": self._mask_token(token_val),
+                            "用户笔记": {
+                                "path_v4": self.PATHS["user_note_list_v4"],
+                                "url_v4": f"{base_url}{self.PATHS['user_note_list_v4']}",
+                                "params_v4": {
+                                    **self._build_params(required={"userId": user_id}, optional={"lastCursor": last_cursor}),
+                                    "token": self._mask_token(token_val),
+                                },
+                                "path_v2": self.PATHS["user_note_list_v2"],
+                                "url_v2": f"{base_url}{self.PATHS['user_note_list_v2']}",
+                                "params_v2": {
+                                    **self._build_params(required={"userId": user_id}, optional={"lastCursor": last_cursor}),
+                                    "token": self._mask_token(token_val),
+                                },
                             },
                         },
-                    },
-                }
+                    }
 
-                if resp.get("code") == 0 and isinstance(resp.get("data"), dict):
-                    d = resp["data"]
-                    # 进一步清理 interactions 中的 follows 项（不需要关注列表详细信息）
-                    try:
-                        interactions = (((block.get("用户信息") or {}).get("data") or {}).get("interactions") or [])
-                        if isinstance(interactions, list):
-                            cleaned = [
-                                it for it in interactions
-                                if str(it.get("ppType") or it.get("type") or "").lower() != "follows"
-                            ]
-                            if "data" in (block.get("用户信息") or {}):
-                                block["用户信息"]["data"]["interactions"] = cleaned
-                    except Exception:
-                        pass
-                    items = d.get("notes") or d.get("list") or d.get("items") or []
-                    for n in items:
-                        note_id = (n.get("noteId") or n.get("id") or "")
-                        ts = self._normalize_ts(
+                    if resp.get("code") == 0 and isinstance(resp.get("data"), dict):
+                        d = resp["data"]
+                        # 进一步清理 interactions 中的 follows 项（不需要关注列表详细信息）
+                        try:
+                            interactions = (((block.get("用户信息") or {}).get("data") or {}).get("interactions") or [])
+                            if isinstance(interactions, list):
+                                cleaned = [
+                                    it for it in interactions
+                                    if str(it.get("ppType") or it.get("type") or "").lower() != "follows"
+                                ]
+                                if "data" in (block.get("用户信息") or {}):
+                                    block["用户信息"]["data"]["interactions"] = cleaned
+                        except Exception:
+                            pass
+                        items = d.get("notes") or d.get("list") or d.get("items") or []
+                        notes: List[Dict[str, Any]] = []
+                        store_rows: List[Tuple[Any, ...]] = []
+                        # 本页发布时间与更新时间整列归一化
+                        ts_col = self._normalize_ts_column(
                             n.get("timestamp")
                             or n.get("update_time")
                             or n.get("publishTime")
                             or n.get("time")
                             or n.get("create_time")
+                            for n in items
                         )
-                        cover_val = self._extract_cover(n)
-                        video_master = self._extract_video_master(n)
-                        # 过滤作者对象
-                        user = self._filter_user_basic(n.get("user") or {})
-
-                        obj: Dict[str, Any] = {
-                            "笔记ID": note_id,
-                            "笔记链接": self._note_url(note_id) if note_id else "",
-                            "摘要": {
-                                "用户昵称": user.get("nickname"),
-                                "标题": n.get("display_title") or n.get("title"),
-                                "正文": None,
-                                "点赞数": n.get("likes") or n.get("liked_count"),
-                                "评论数": n.get("comments_count"),
-                                "收藏数": n.get("collected_count"),
-                                "好看数": n.get("nice_count"),
-                                "分享数": n.get("share_count"),
-                                "图片链接": cover_val,
-                                "浏览数": n.get("view_count"),
-                                "发布时间": ts,
-                                "是否商品笔记": n.get("is_goods_note"),
-                                "类型": n.get("type"),
-                            },
-                            "作者": user,
-                        }
-
-                        if video_master:
-                            obj["摘要"]["视频链接"] = video_master
-
-                        list_desc = n.get("desc")
-                        # 不再调用笔记详情接口：仅使用列表中的 desc 作为正文；缺失时置为 None
-                        if isinstance(list_desc, str) and list_desc.strip():
-                            obj["摘要"]["正文"] = list_desc
-                            obj["摘要"]["标签"] = self._extract_tags_from_text(list_desc)
-                        else:
-                            obj["摘要"]["正文"] = None
-                            obj["摘要"]["标签"] = []
-
-                        block["笔记"].append(obj)
-                    total_notes_cnt += len(block["笔记"])
+                        update_ts_col = (
+                            self._normalize_ts_column(n.get("last_update_time") or n.get("update_time") for n in items)
+                            if note_store is not None else []
+                        )
+                        for i, n in enumerate(items):
+                            note_id = (n.get("noteId") or n.get("id") or "")
+                            ts = ts_col[i]
+                            list_desc = n.get("desc")
+                            # 不再调用笔记详情接口：仅使用列表中的 desc 作为正文；缺失时置为 None
+                            has_desc = isinstance(list_desc, str) and bool(list_desc.strip())
+
+                            # 过滤作者对象
+                            user = self._filter_user_basic(n.get("user") or {})
+                            obj: Dict[str, Any] = {
+                                "笔记ID": note_id,
+                                "笔记链接": self._note_url(note_id) if note_id else "",
+                                "摘要": {
+                                    "用户昵称": user.get("nickname"),
+                                    "标题": n.get("display_title") or n.get("title"),
+                                    "正文": list_desc if has_desc else None,
+                                    "点赞数": n.get("likes") or n.get("liked_count"),
+                                    "评论数": n.get("comments_count"),
+                                    "收藏数": n.get("collected_count"),
+                                    "好看数": n.get("nice_count"),
+                                    "分享数": n.get("share_count"),
+                                    "图片链接": self._extract_cover(n),
+                                    "浏览数": n.get("view_count"),
+                                    "发布时间": ts,
+                                    "是否商品笔记": n.get("is_goods_note"),
+                                    "类型": n.get("type"),
+                                },
+                                "作者": user,
+                            }
+                            video_master = self._extract_video_master(n)
+                            if video_master:
+                                obj["摘要"]["视频链接"] = video_master
+                            obj["摘要"]["标签"] = self._extract_tags_from_text(list_desc) if has_desc else []
+                            notes.append(obj)
+                            if note_store is not None:
+                                store_rows.append((
+                                    note_id,
+                                    update_ts_col[i] or ts,
+                                    self._as_count(n.get("likes") or n.get("liked_count")),
+                                    self._as_count(n.get("comments_count")),
+                                    self._as_count(n.get("collected_count")),
+                                    self._as_count(n.get("share_count")),
+                                    self._as_count(n.get("view_count")),
+                                ))
+
+                        if note_store is not None:
+                            # 仅保留新增/变化的笔记；整页均未变化说明已追上上次采集位置。
+                            # 缺少笔记ID的无法与本地库比对：原样输出，也不参与“整页未变化”的判断
+                            changes = self._upsert_user_notes(note_store, user_id, store_rows)
+                            keyed = sum(1 for obj in notes if obj["笔记ID"])
+                            store_stat["新增笔记"] += sum(1 for v in changes.values() if v == "新增")
+                            store_stat["更新笔记"] += sum(1 for v in changes.values() if v == "更新")
+                            store_stat["未变化"] += keyed - len(changes)
+                            notes = [obj for obj in notes if not obj["笔记ID"] or obj["笔记ID"] in changes]
+                            store_caught_up = keyed > 0 and not changes
+
+                        block["笔记"] = notes
+                        total_notes_cnt += len(block["笔记"])
+
+                        block["还有更多"] = d.get("has_more")
+                        block["下一页游标"] = d.get("cursor")
+                        # 更新下一页游标：无更多或缺失游标则提前结束
+                        last_cursor = d.get("cursor") if d.get("has_more") else None
+                    else:
+                        # API 错误页也放入数据，便于前端查看原始响应
+                        block.setdefault("还有更多", False)
+                        block.setdefault("下一页游标", None)
 
-                    block["还有更多"] = d.get("has_more")
-                    block["下一页游标"] = d.get("cursor")
-                    # 更新下一页游标：无更多或缺失游标则提前结束
-                    last_cursor = d.get("cursor") if d.get("has_more") else None
-                else:
-                    # API 错误页也放入数据，便于前端查看原始响应
-                    block.setdefault("还有更多", False)
-                    block.setdefault("下一页游标", None)
+                    result["数据"].append(block)
 
-                result["数据"].append(block)
+                    if store_caught_up or not (last_cursor and block.get("还有更多")):
+                        break
+            finally:
+                if note_store is not None:
+                    note_store.close()
 
-                if not (last_cursor and block.get("还有更多")):
-                    break
+            if note_store is not None:
+                result["meta"]["增量同步"] = store_stat
 
         durations = {}
         for path, arr in self._metrics.get("request_durations", {}).items():
@@ -1532,6 +2061,12 @@ class XiaohongshuRedNote(Component):
             durations[path] = {"次数": len(arr), "最短耗时ms": min(arr), "最长耗时ms": max(arr), "平均耗时ms": int(sum(arr) / len(arr))}
         result["meta"]["请求耗时"] = durations
         result["meta"]["版本选择"] = self._metrics.get("version_choice", [])
+        coalesced = self._metrics.get("coalesced") or {}
+        if coalesced:
+            result["meta"]["合并请求"] = {"次数": sum(coalesced.values()), "按路径": coalesced}
+        coalesce_timeout = self._metrics.get("coalesce_timeout") or {}
+        if coalesce_timeout:
+            result["meta"]["合并等待超时"] = {"次数": sum(coalesce_timeout.values()), "按路径": coalesce_timeout}
 
         try:
             total_notes = 0
@@ -1588,7 +2123,8 @@ class XiaohongshuRedNote(Component):
 
         for name in [
             "input_value", "note_type", "sort", "start_page", "end_page", "time_range", "include_author_detail",
-            "note_input", "comment_mode", "include_sub_comments", "comments_last_cursor",
+            "note_input", "comment_mode", "include_sub_comments", "comment_pages", "comment_max_count", "sub_comment_pages",
+            "incremental_sync", "local_store_path",
             "xhs_user_id", "user_notes_pages",
         ]:
             set_show(name, False)
@@ -1601,13 +2137,16 @@ class XiaohongshuRedNote(Component):
             # 仅在该模式下将搜索词标记为必填
             set_required("input_value", True)
         elif current_mode_label == "按笔记采集评论":
-            # 评论请求只用 v2 且不分页：隐藏 comments_last_cursor 输入
-            for name in ["note_input", "comment_mode", "include_sub_comments"]:
+            # 评论请求只用 v2，按 cursor 链分页：显示页数/条数配置
+            for name in [
+                "note_input", "comment_mode", "include_sub_comments", "comment_pages", "comment_max_count", "sub_comment_pages",
+                "incremental_sync", "local_store_path",
+            ]:
                 set_show(name, True)
             # 仅在该模式下将笔记链接/ID标记为必填
             set_required("note_input", True)
         elif current_mode_label == "按用户信息采集笔记":
-            for name in ["xhs_user_id", "user_notes_pages"]:
+            for name in ["xhs_user_id", "user_notes_pages", "incremental_sync", "local_store_path"]:
                 set_show(name, True)
             # 仅在该模式下将用户 UID 标记为必填
             set_required("xhs_user_id", True)